@@ -1,19 +1,40 @@
 #!/usr/bin/env python3
 
+import os
+import sys
 import argparse
 import logging
 import unittest
 import importlib
+import multiprocessing
+import multiprocessing.connection
+import resource
 import time
 from tests.test_general import GeneralGraphTestCase
 # from dipper.utils.TestUtils import TestUtils
-from dipper.utils.GraphUtils import GraphUtils
+from dipper.utils.GraphUtils import GraphUtils, PROPERTY_INDEX_DIR
+from dipper.graph.TripleFilter import TripleFilter
+from dipper.sources.Source import Source
 
 logging.basicConfig()
 LOG = logging.getLogger(__name__)
 
 TEST_SUITE = unittest.TestLoader().loadTestsFromTestCase(GeneralGraphTestCase)
 
+# sources which instantiate another source, reading (or fetching) its raw files,
+# or which read what another writes (e.g. the index of HGNC gene symbols);
+# with --jobs they wait for those sources to finish when both are in the run
+SOURCE_DEPENDENCIES = {
+    'GeneOntology': ('ZFIN', 'WormBase'),
+    'Decipher': ('HGNC',),
+    'GWASCatalog': ('HGNC',),
+    'UDP': ('HGNC',),
+    'StringDB': ('Ensembl',),
+    'OMIA': ('NCBIGene',),
+    'UCSCBands': ('Monochrom',),
+    'ZFINSlim': ('ZFIN',),
+}
+
 
 def main():
     # TODO this should be generated by looking in the dipper/sources directory
@@ -65,7 +86,37 @@ def main():
         formatter_class=argparse.RawTextHelpFormatter)
     parser.add_argument(
         '-g', '--graph', type=str, default="rdf_graph",
-        help='graph type: rdf_graph, streamed_graph')
+        help='graph type: rdf_graph, streamed_graph, compact_graph, sqlite_graph')
+    parser.add_argument(
+        '--dedup', action='store_true',
+        help='streamed_graph: drop repeated triples before they are written')
+    parser.add_argument(
+        '--dedup_exact', type=int, default=2**22,
+        help='streamed_graph: distinct triples remembered exactly when deduplicating')
+    parser.add_argument(
+        '--dedup_bloom_mb', type=int, default=256,
+        help='''streamed_graph: MiB of Bloom filter used past --dedup_exact triples
+            (0 stops deduplicating there, rather than risk false positives)''')
+    parser.add_argument(
+        '--cache', type=str, default=Source.CACHE,
+        help='''where to look for raw files before their origin: a DipperCache url,
+            a directory mirroring it (e.g. for builds off line), or none''')
+    parser.add_argument(
+        '--compress', choices=['gzip', 'zstd'], default=None,
+        help='streamed_graph: compress the .nt output as it is written')
+    parser.add_argument(
+        '--ontology_index', type=str, default=PROPERTY_INDEX_DIR,
+        help='directory of cached ontology property indexes, for property axioms')
+    parser.add_argument(
+        '-j', '--jobs', type=int, default=None,
+        help='''run up to this many sources at once, each in its own process
+            (logging to --log_dir) and print a time & memory table at the end''')
+    parser.add_argument(
+        '--log_dir', type=str, default='logs',
+        help='with --jobs: directory of per source log files')
+    parser.add_argument(
+        '--offline', action='store_true',
+        help='use cached ontology property indexes without checking for new versions')
     parser.add_argument(
         '-s', '--sources', type=str, default='?',
         help='comma separated list of sources')
@@ -192,94 +243,237 @@ def main():
         args.dest_fmt = 'turtle'
 
     # Provide feedback if we can't proceed
-    if args.sources is None or args.sources.split(',')[0] not in source_to_class_map:
-        LOG.info('Unknown Source %s', args.sources.split(',')[0])
+    unknown = [
+        source for source in args.sources.lower().split(',')
+        if source not in source_to_class_map]
+    if unknown:
+        LOG.info('Unknown Source %s', ', '.join(unknown))
         LOG.info('Sources Known are limited to:')
         for key in sorted(source_to_class_map):
             LOG.info('\t%s\t%s', key, source_to_class_map[key])
         exit(0)
 
+    # sources need some args (e.g. --compress) while they are constructed
+    Source.ARGV = vars(args)
+
     # iterate through all the sources
-    for source in args.sources.split(','):
-        LOG.info("\n******* %s *******", source)
-        source = source.lower()
-        src = source_to_class_map[source]
+    sources = [source.lower() for source in args.sources.split(',')]
+    if args.jobs is not None:
+        all_ok = run_parallel(
+            sources, source_to_class_map, args, tax_ids, species_specific)
+        if not all_ok:
+            LOG.error("Not all sources ran ok")
+            sys.exit(1)
+    else:
+        for source in sources:
+            LOG.info("\n******* %s *******", source)
+            run_source(
+                source, source_to_class_map[source], args, tax_ids, species_specific)
+            LOG.info('***** Finished with %s *****', source)
 
-        # import source lib
-        module = "dipper.sources.{0}".format(src)
-        imported_module = importlib.import_module(module)
-        source_class = getattr(imported_module, src)
-        mysource = None
+    LOG.info("All done.")
 
-        LOG.info(
-            'Command line arguments available to dipper-etl:\n%s',
-            "\n".join(['\t{}: {}'.format(k, v) for k, v in vars(args).items()]))
-
-        source_args = dict(graph_type=args.graph)
-        source_args['are_bnodes_skolemized'] = not args.use_bnodes
-        if src in species_specific:
-            source_args['tax_ids'] = tax_ids
-        if args.version:
-            source_args['version'] = args.version
-        if args.data_release_version:
-            source_args['data_release_version'] = args.data_release_version
-
-        mysource = source_class(**source_args)
-
-        # WIP cli args should be available to source
-        if hasattr(mysource, 'ARGV'):
-            mysource.ARGV = vars(args)
-        else:
-            LOG.error('no where to to put args in %s', mysource.__class__)
+def run_source(source, src, args, tax_ids, species_specific):
+    """
+    fetch, parse & write one source (and run its tests)
+    :param source: str source name as given on the command line
+    :param src: str source class name
+    """
+    # import source lib
+    module = "dipper.sources.{0}".format(src)
+    imported_module = importlib.import_module(module)
+    source_class = getattr(imported_module, src)
+    mysource = None
+
+    LOG.info(
+        'Command line arguments available to dipper-etl:\n%s',
+        "\n".join(['\t{}: {}'.format(k, v) for k, v in vars(args).items()]))
+
+    source_args = dict(graph_type=args.graph)
+    source_args['are_bnodes_skolemized'] = not args.use_bnodes
+    if src in species_specific:
+        source_args['tax_ids'] = tax_ids
+    if args.version:
+        source_args['version'] = args.version
+    if args.data_release_version:
+        source_args['data_release_version'] = args.data_release_version
+
+    mysource = source_class(**source_args)
+
+    # WIP cli args should be available to source
+    if hasattr(mysource, 'ARGV'):
+        mysource.ARGV = vars(args)
+    else:
+        LOG.error('no where to to put args in %s', mysource.__class__)
+
+    if args.graph == 'streamed_graph' and args.dedup:
+        mysource.graph.dedup = TripleFilter(
+            args.dedup_exact, args.dedup_bloom_mb * 2**23)
 
-        if args.parse_only is False:
-            start_fetch = time.perf_counter()
-            mysource.fetch(args.force)
+    if args.parse_only is False:
+        start_fetch = time.perf_counter()
+        mysource.fetch(args.force)
 
-            end_fetch = time.perf_counter()
-            LOG.info("Fetching time: %d sec", end_fetch - start_fetch)
+        end_fetch = time.perf_counter()
+        LOG.info("Fetching time: %d sec", end_fetch - start_fetch)
 
-        mysource.settestonly(args.test_only)
+    mysource.settestonly(args.test_only)
 
-        # create source ingest graph first (with pristine arguments)
-        if args.test_only is False and args.fetch_only is False:
-            start_parse = time.perf_counter()
-            mysource.parse(args.limit)
+    # create source ingest graph first (with pristine arguments)
+    if args.test_only is False and args.fetch_only is False:
+        start_parse = time.perf_counter()
+        mysource.parse(args.limit)
 
-            end_parse = time.perf_counter()
-            LOG.info("Parsing time: %d sec", end_parse - start_parse)
+        end_parse = time.perf_counter()
+        LOG.info("Parsing time: %d sec", end_parse - start_parse)
+        mysource.graph.node_cache.report()
 
-            if args.graph == 'rdf_graph':
-                LOG.info("Found %d nodes", len(mysource.graph))
+        if args.graph != 'streamed_graph':
+            LOG.info("Found %d nodes", len(mysource.graph))
 
-                # Add property axioms
-                start_axiom_exp = time.perf_counter()
-                LOG.info("Adding property axioms")
+        # Add property axioms
+        # (every graph keeps count of its predicates, no need to scan it)
+        start_axiom_exp = time.perf_counter()
+        LOG.info("Adding property axioms")
 
-                properties = GraphUtils.get_properties_from_graph(mysource.graph)
-                GraphUtils.add_property_axioms(mysource.graph, properties)
+        properties = GraphUtils.get_properties_from_graph(mysource.graph)
+        GraphUtils.add_property_axioms(
+            mysource.graph, properties, args.ontology_index, args.offline)
+        LOG.info(
+            "Property axioms added: %d sec",
+            time.perf_counter() - start_axiom_exp)
+
+        if args.graph == 'streamed_graph':
+            # the output only appears under its final name once closed
+            mysource.graph.close()
+            if mysource.graph.dedup is not None:
+                mysource.graph.dedup.report()
+        else:
+            start_write = time.perf_counter()
+            triple_count = mysource.write(fmt=args.dest_fmt)
+            write_time = time.perf_counter() - start_write
+            LOG.info("Writing time: %d sec", write_time)
+            if triple_count is not None and write_time > 0:
                 LOG.info(
-                    "Property axioms added: %d sec",
-                    time.perf_counter() - start_axiom_exp)
-
-                start_write = time.perf_counter()
-                mysource.write(fmt=args.dest_fmt)
-                LOG.info("Writing time: %d sec", time.perf_counter() - start_write)
-            # elif args.graph == 'streamed_graph': ...
-
-        # '*_test.ttl' graphs if requested
-        if (args.no_verify or args.skip_tests) is False:
-            suite = mysource.getTestSuite()
-            if suite is None:
-                LOG.warning("No tests configured for this source: %s", source)
-            else:
-                unittest.TextTestRunner(verbosity=2).run(suite)
+                    "Wrote %d triples (%d triples/sec)",
+                    triple_count, triple_count / write_time)
+
+    # '*_test.ttl' graphs if requested
+    if (args.no_verify or args.skip_tests) is False:
+        suite = mysource.getTestSuite()
+        if suite is None:
+            LOG.warning("No tests configured for this source: %s", source)
         else:
-            LOG.info("Skipping Tests for source: %s", source)
-
-        LOG.info('***** Finished with %s *****', source)
+            unittest.TextTestRunner(verbosity=2).run(suite)
+    else:
+        LOG.info("Skipping Tests for source: %s", source)
+
+    if args.graph == 'sqlite_graph':
+        # its database is removed once closed
+        mysource.graph.close()
+
+
+def run_source_process(source, src, args, tax_ids, species_specific, log_file, conn):
+    """
+    run_source() in a process of its own (see --jobs), logging to log_file
+    and sending (finished ok, wall clock seconds, peak RSS kB) back through conn
+    """
+    log_handle = open(log_file, 'w', buffering=1)
+    sys.stdout = sys.stderr = log_handle     # e.g. test results & tracebacks
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    handler = logging.StreamHandler(log_handle)
+    handler.setFormatter(logging.Formatter(
+        '%(asctime)s %(levelname)s %(name)s: %(message)s'))
+    root.addHandler(handler)
+    Source.ARGV = vars(args)
+
+    start = time.perf_counter()
+    finished = False
+    try:
+        run_source(source, src, args, tax_ids, species_specific)
+        finished = True
+    except (Exception, SystemExit):  # some sources exit() when they give up
+        LOG.exception('%s failed', source)
+    # ru_maxrss is in kilobytes on linux
+    conn.send((
+        finished, time.perf_counter() - start,
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss))
+    conn.close()
+    log_handle.flush()
+
+
+def run_parallel(sources, source_to_class_map, args, tax_ids, species_specific):
+    """
+    Run up to args.jobs sources at once, each in its own process.
+    A source waits for any source it depends on (SOURCE_DEPENDENCIES)
+    which is also in this run, so they are never fetching the same files at once,
+    and is skipped if one of those fails.
+    Prints a table of wall clock time & peak memory per source at the end.
+    :return: bool, True if every source ran ok
+    """
+    os.makedirs(args.log_dir, exist_ok=True)
+    in_run = {source_to_class_map[source] for source in sources}
+    pending = list(sources)
+    running = {}    # process sentinel -> (source, process, connection)
+    results = {}    # source -> (status, wall clock seconds, peak RSS kB)
+    while pending or running:
+        for source in list(pending):
+            if len(running) >= args.jobs:
+                break
+            src = source_to_class_map[source]
+            failed = [
+                dependency for dependency in SOURCE_DEPENDENCIES.get(src, ())
+                if dependency in {
+                    source_to_class_map[done] for done, result in results.items()
+                    if result[0] != 'ok'}]
+            if failed:
+                pending.remove(source)
+                results[source] = ('skipped, {} failed'.format(', '.join(failed)), 0, 0)
+                LOG.error("Skipping %s: %s failed", source, ', '.join(failed))
+                continue
+            waiting_on = [
+                dependency for dependency in SOURCE_DEPENDENCIES.get(src, ())
+                if dependency in in_run and dependency not in {
+                    source_to_class_map[done] for done in results}]
+            if waiting_on:
+                continue
+            pending.remove(source)
+            log_file = os.path.join(args.log_dir, source + '.log')
+            receiver, sender = multiprocessing.Pipe(duplex=False)
+            process = multiprocessing.Process(
+                target=run_source_process, name=source,
+                args=(source, src, args, tax_ids, species_specific, log_file, sender))
+            process.start()
+            sender.close()
+            running[process.sentinel] = (source, process, receiver)
+            LOG.info("Started %s (pid %i), logging to %s", source, process.pid, log_file)
+
+        if not running:
+            if pending:     # only sources waiting on something which can not run
+                LOG.error("Can not schedule %s", ', '.join(pending))
+            break
+        for sentinel in multiprocessing.connection.wait(list(running)):
+            source, process, receiver = running.pop(sentinel)
+            process.join()
+            try:
+                finished, wall_time, max_rss = receiver.recv()
+                status = 'ok' if finished else 'failed'
+            except EOFError:  # died without a word, e.g. killed for using too much memory
+                status, wall_time, max_rss = 'exit {}'.format(process.exitcode), 0, 0
+            receiver.close()
+            results[source] = (status, wall_time, max_rss)
+            LOG.info("Finished %s: %s", source, status)
+
+    print('\t'.join(('source', 'status', 'wall sec', 'peak MB', 'log')))
+    for source in sources:
+        status, wall_time, max_rss = results.get(source, ('not run', 0, 0))
+        print('\t'.join((
+            source, status, '{:.0f}'.format(wall_time), '{:.0f}'.format(max_rss / 1024),
+            os.path.join(args.log_dir, source + '.log'))))
+    return all(results.get(source, ('not run',))[0] == 'ok' for source in sources)
 
-    LOG.info("All done.")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,463 @@
+import re
+import io
+import sys
+import os
+import logging
+from array import array
+
+import yaml
+import numpy
+from rdflib import Literal, URIRef, BNode
+from rdflib.plugins.serializers.nt import _quoteLiteral
+
+from dipper.graph.Graph import Graph as DipperGraph
+from dipper.graph.NodeCache import NodeCache
+from dipper.graph.RDFGraph import RDFGraph
+from dipper.utils.CurieUtil import CurieUtil
+from dipper.utils.GraphUtils import GraphUtils
+from dipper import curie_map as curie_map_class
+from dipper.models.BiolinkVocabulary import BioLinkVocabulary as blv
+
+LOG = logging.getLogger(__name__)
+
+TERM_ID = 'I'  # array typecode of (unsigned 32 bit) term ids
+# escapes made by rdflib's ntriples _quote_encode()
+LITERAL_UNESCAPE = {'\\': '\\', 'n': '\n', '"': '"', 'r': '\r'}
+
+
+class CompactGraph(DipperGraph):
+    """
+    A memory frugal, in process, alternative to RDFGraph.
+
+    Every distinct IRI, blank node and literal is interned once
+    in a term dictionary (kept in its ntriples form) and triples
+    are stored as three parallel columns of integer term ids.
+    A set of packed (subject, predicate, object) ids keeps triples unique.
+
+    rdflib terms are only made on the way out, when the graph is queried
+    with triples(), subjects(), predicates() ... which accept and return
+    rdflib terms, as GraphUtils and the tests expect from an RDFGraph.
+
+    ntriples & nquads serialization is streamed straight from the columns,
+    other formats are handed to rdflib via a temporary RDFGraph.
+    """
+
+    curie_map = curie_map_class.get()
+    curie_util = CurieUtil(curie_map)
+
+    # make global translation table available outside the ingest
+    with open(
+        os.path.join(
+            os.path.dirname(__file__),
+            '../../translationtable/GLOBAL_TERMS.yaml')) as fhandle:
+        globaltt = yaml.safe_load(fhandle)
+        globaltcid = {v: k for k, v in globaltt.items()}
+
+    def __init__(self, are_bnodes_skized=True, identifier=None):
+        self.are_bnodes_skized = are_bnodes_skized
+        if identifier is None:
+            self.identifier = BNode()
+        elif isinstance(identifier, (URIRef, BNode)):
+            self.identifier = identifier
+        else:  # as rdflib does for ConjunctiveGraph
+            self.identifier = URIRef(identifier)
+        self.prefixes = set()
+        self.node_cache = NodeCache(resident=self.globaltt.values())
+
+        self._term_ids = {}     # ntriples term -> term id
+        self._terms = []        # term id -> ntriples term
+        self._subjects = array(TERM_ID)
+        self._predicates = array(TERM_ID)
+        self._objects = array(TERM_ID)
+        self._keys = set()      # packed ids of triples in the graph
+        self._removed = set()   # packed ids of triples still in the columns
+        self._predicate_counts = {}     # predicate term id -> triples using it
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __iter__(self):
+        return self.triples((None, None, None))
+
+    def __contains__(self, triple):
+        if None in triple:  # a pattern
+            return any(True for _ in self.triples(triple))
+        key = self._pack(*(self._term_id(term) for term in triple))
+        return key is not None and key in self._keys
+
+    def _make_category_triple(
+            self, subject, category, predicate=blv.terms['category']
+    ):
+        """
+        add a triple to capture subject or object category (in CURIE form) that was
+        passed to addTriple()
+        """
+        try:
+            self._add_keys(
+                self._getnode(subject),
+                self._getnode(predicate),
+                self._getnode(category))
+        except:
+            LOG.warning(
+                "Problem adding triple in _makeCategoryTriple for " + \
+                "subj: %s pred: %s obj(category): %s",
+                subject, predicate, category)
+
+    def _is_literal(self, thing):
+        """
+        make inference on type (literal or CURIE)
+
+        return: logical
+        """
+        if self.curie_regexp.match(thing) is not None or\
+           thing.split(':')[0].lower() in ('http', 'https', 'ftp'):
+            object_is_literal = False
+        else:
+            object_is_literal = True
+
+        return object_is_literal
+
+    def addTriple(
+            self,
+            subject_id,
+            predicate_id,
+            obj,
+            object_is_literal=None,
+            literal_type=None,
+            subject_category=None,
+            object_category=None
+    ):
+
+        if object_is_literal is None:
+            object_is_literal = self._is_literal(obj)
+
+        # add triples for subject category info
+        if subject_category is not None:
+            self._make_category_triple(subject_id, subject_category)
+
+        # add triples for obj category info, if obj is not a literal
+        if not object_is_literal:
+            if object_category is not None:
+                self._make_category_triple(obj, object_category)
+        else:  # emit warning if object category is given for a literal
+            if object_category is not None:
+                LOG.warning("I was given a category %s for obj: %s, " +
+                            "which seems to be a literal!",
+                            object_category, obj)
+
+        if object_is_literal is True:
+            if literal_type is not None and obj is not None and obj not in ("", " "):
+                # a plain literal if the type can not be expanded, as RDFGraph
+                literal_type_node = self._getnode(literal_type)
+                literal_type_iri = None if literal_type_node is None else \
+                    self._term(literal_type_node)
+                self._add_keys(
+                    self._getnode(subject_id), self._getnode(predicate_id),
+                    _quoteLiteral(Literal(obj, datatype=literal_type_iri)))
+            elif obj is not None:
+                # could attempt to infer a type here but there is no use case
+                self._add_keys(
+                    self._getnode(subject_id), self._getnode(predicate_id),
+                    _quoteLiteral(Literal(obj)))
+            else:
+                LOG.warning(
+                    "None as literal object for subj: %s and pred: %s",
+                    subject_id, predicate_id)
+                # get a sense of where the None is comming from
+                # magic number here is "steps up the call stack"
+                for call in range(2, 0, -1):
+                    LOG.warning(
+                        '\t%sfrom: %s', '\t' * call, sys._getframe(call).f_code.co_name)
+
+        elif obj is not None and obj != '':  # object is a resource
+            self._add_keys(
+                self._getnode(subject_id),
+                self._getnode(predicate_id),
+                self._getnode(obj))
+        else:
+            LOG.warning(
+                "None/empty object IRI for subj: %s and pred: %s",
+                subject_id, predicate_id)
+
+    def skolemizeBlankNode(self, curie):
+        stripped_id = re.sub(r'^_:|^_', '', curie, 1)
+        return URIRef(self.curie_map['BNODE'] + stripped_id)
+
+    def _getnode(self, curie):
+        """
+        The ntriples term for a curie or iri,
+        memoized per graph (see NodeCache)
+
+        :param curie: str identifier formatted as curie or iri
+        :return: str ntriples term, or None
+        """
+        return self.node_cache.get(curie, self._makenode)
+
+    def _makenode(self, curie):
+        """
+        Expand a curie or iri to the ntriples form the term is interned as.
+        Blank nodes are skolemized or kept as '_:' nodes
+        depending on self.are_bnodes_skized
+
+        :param curie: str identifier formatted as curie or iri
+        :return: str ntriples term, or None if the curie can not be expanded
+        """
+        node = None
+        if curie[0] == '_':
+            if self.are_bnodes_skized:
+                node = '<%s>' % self.skolemizeBlankNode(curie)
+            else:  # delete the leading underscore to make it cleaner
+                node = '_:' + re.sub(r'^_:|^_', '', curie, 1)
+
+        # Check if curie string is actually an IRI
+        elif curie[:4] == 'http' or curie[:3] == 'ftp' or curie[:4] == 'jdbc':
+            node = '<%s>' % curie
+        else:
+            iri = CompactGraph.curie_util.get_uri(curie)
+            if iri is not None:
+                node = '<%s>' % iri
+                # Bind prefix map to graph
+                prefix = curie.split(':')[0]
+                self.prefixes.add(prefix)
+            else:
+                LOG.error("couldn't make URI for %s", curie)
+                # get a sense of where the CURIE-ish? thing is comming from
+                # magic number here is "steps up the call stack"
+                for call in range(5, 2, -1):  # past NodeCache.get & _getnode
+                    LOG.warning(
+                        '\t%sfrom: %s', '\t' * call, sys._getframe(call).f_code.co_name)
+        return node
+
+    # interning
+
+    def _intern(self, term):
+        """
+        :param term: str ntriples term
+        :return: int term id, new ids are handed out in order of first sight
+        """
+        term_id = self._term_ids.get(term)
+        if term_id is None:
+            term_id = len(self._terms)
+            self._term_ids[term] = term_id
+            self._terms.append(term)
+        return term_id
+
+    def _term_id(self, term):
+        """
+        :param term: rdflib term (or None for a wildcard)
+        :return: int term id, None for wildcards, -1 for terms never interned
+        """
+        if term is None:
+            return None
+        return self._term_ids.get(self._ntriples(term), -1)
+
+    @staticmethod
+    def _ntriples(term):
+        """
+        :param term: rdflib URIRef, BNode or Literal
+        :return: str ntriples form of the term
+        """
+        if isinstance(term, Literal):
+            return _quoteLiteral(term)
+        if isinstance(term, BNode):
+            return '_:%s' % term
+        return '<%s>' % term
+
+    @staticmethod
+    def _term(ntriple):
+        """
+        Inverse of _ntriples()
+        :param ntriple: str ntriples term
+        :return: rdflib URIRef, BNode or Literal
+        """
+        if ntriple[0] == '<':
+            return URIRef(ntriple[1:-1])
+        if ntriple[0] == '_':
+            return BNode(ntriple[2:])
+        end = ntriple.rindex('"')
+        lexical = re.sub(
+            r'\\(.)', lambda esc: LITERAL_UNESCAPE[esc.group(1)], ntriple[1:end])
+        suffix = ntriple[end + 1:]
+        if suffix[:1] == '@':
+            return Literal(lexical, lang=suffix[1:])
+        if suffix[:2] == '^^':
+            return Literal(lexical, datatype=URIRef(suffix[3:-1]))
+        return Literal(lexical)
+
+    @staticmethod
+    def _pack(sid, pid, oid):
+        if -1 in (sid, pid, oid):
+            return None
+        return (sid << 64) | (pid << 32) | oid
+
+    # storage
+
+    def _add_keys(self, subj, pred, obj):
+        """
+        Add a triple of ntriples terms to the graph, ignoring duplicates
+        """
+        sid = self._intern(subj)
+        pid = self._intern(pred)
+        oid = self._intern(obj)
+        key = (sid << 64) | (pid << 32) | oid
+        if key in self._keys:
+            return
+        if key in self._removed:
+            self._compact()
+        self._keys.add(key)
+        self._predicate_counts[pid] = self._predicate_counts.get(pid, 0) + 1
+        self._subjects.append(sid)
+        self._predicates.append(pid)
+        self._objects.append(oid)
+
+    def _compact(self):
+        """
+        Drop removed triples from the columns
+        """
+        if not self._removed:
+            return
+        removed = self._removed
+        subjects = array(TERM_ID)
+        predicates = array(TERM_ID)
+        objects = array(TERM_ID)
+        for sid, pid, oid in zip(self._subjects, self._predicates, self._objects):
+            if (sid << 64) | (pid << 32) | oid not in removed:
+                subjects.append(sid)
+                predicates.append(pid)
+                objects.append(oid)
+        self._subjects = subjects
+        self._predicates = predicates
+        self._objects = objects
+        self._removed = set()
+
+    def _match(self, sid, pid, oid):
+        """
+        :params: int term ids, None as a wildcard
+        :return: iterable of (sid, pid, oid) matching the pattern
+        """
+        self._compact()
+        if sid is None and pid is None and oid is None:
+            return zip(self._subjects, self._predicates, self._objects)
+        mask = None
+        for column, term_id in (
+                (self._subjects, sid),
+                (self._predicates, pid),
+                (self._objects, oid)):
+            if term_id is not None:
+                hits = numpy.frombuffer(column, dtype=numpy.uint32) == term_id
+                mask = hits if mask is None else mask & hits
+        return [
+            (self._subjects[i], self._predicates[i], self._objects[i])
+            for i in numpy.flatnonzero(mask).tolist()]
+
+    # rdflib style api (as used by GraphUtils & TestUtils)
+
+    @property
+    def predicate_counts(self):
+        """
+        :return: dict of predicate URIRef -> count of triples using it
+        """
+        return {
+            self._term(self._terms[pid]): count
+            for pid, count in self._predicate_counts.items()}
+
+    def add(self, triple):
+        """
+        :param triple: tuple of rdflib terms
+        """
+        self._add_keys(*(self._ntriples(term) for term in triple))
+
+    def remove(self, triple):
+        """
+        :param triple: tuple of rdflib terms, None as a wildcard
+        """
+        ids = [self._term_id(term) for term in triple]
+        if -1 in ids:
+            return
+        for sid, pid, oid in list(self._match(*ids)):
+            key = (sid << 64) | (pid << 32) | oid
+            self._keys.discard(key)
+            self._removed.add(key)
+            self._predicate_counts[pid] -= 1
+            if self._predicate_counts[pid] == 0:
+                del self._predicate_counts[pid]
+
+    def triples(self, triple):
+        """
+        :param triple: tuple of rdflib terms, None as a wildcard
+        :return: generator of rdflib term triples
+        """
+        ids = [self._term_id(term) for term in triple]
+        if -1 in ids:
+            return
+        terms = self._terms
+        for sid, pid, oid in self._match(*ids):
+            yield (
+                self._term(terms[sid]), self._term(terms[pid]), self._term(terms[oid]))
+
+    def subjects(self, predicate=None, obj=None):
+        for subj, _, _ in self.triples((None, predicate, obj)):
+            yield subj
+
+    def predicates(self, subject=None, obj=None):
+        for _, pred, _ in self.triples((subject, None, obj)):
+            yield pred
+
+    def objects(self, subject=None, predicate=None):
+        for _, _, obj in self.triples((subject, predicate, None)):
+            yield obj
+
+    def predicate_objects(self, subject=None):
+        for _, pred, obj in self.triples((subject, None, None)):
+            yield pred, obj
+
+    def nt_lines(self, fileformat='nt'):
+        """
+        Generate ntriples (or nquads) lines in order of insertion.
+        (see GraphUtils.write_ntriples)
+        :param fileformat: 'nt' or 'nquads'
+        :return: generator of str lines
+        """
+        self._compact()
+        terms = self._terms
+        if fileformat == 'nquads':
+            end = ' '.join((self._ntriples(self.identifier), '.\n'))
+        else:
+            end = '.\n'
+        for sid, pid, oid in zip(self._subjects, self._predicates, self._objects):
+            yield ' '.join((terms[sid], terms[pid], terms[oid], end))
+
+    def to_rdf_graph(self):
+        """
+        Copy the triples into an (rdflib) RDFGraph
+        :return: RDFGraph
+        """
+        graph = RDFGraph(self.are_bnodes_skized, self.identifier)
+        for triple in self:
+            graph.add(triple)
+        graph.prefixes = set(self.prefixes)
+        return graph
+
+    def serialize(
+            self, destination=None, format='turtle', base=None, encoding=None
+    ):
+        """
+        ntriples and nquads are written straight from the term columns,
+        anything else is delegated to rdflib by way of a transient RDFGraph
+        (expect memory to double while that happens)
+
+        :param destination: binary file-like object or None
+        :param format: rdflib serialization format
+        :return: bytes when destination is None
+        """
+        if format in ('nt', 'nquads'):
+            if destination is None:
+                stream = io.BytesIO()
+                GraphUtils.write_ntriples(self, stream, format)
+                return stream.getvalue()
+            GraphUtils.write_ntriples(self, destination, format)
+            return None
+
+        LOG.warning(
+            "%s is not streamed from a CompactGraph, copying to rdflib first", format)
+        return self.to_rdf_graph().serialize(destination, format, base, encoding)
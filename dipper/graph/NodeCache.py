@@ -0,0 +1,80 @@
+import logging
+from collections import OrderedDict
+
+LOG = logging.getLogger(__name__)
+
+CACHE_SIZE = 2**18  # curies remembered per graph, besides the resident ones
+
+
+class NodeCache:
+    """
+    Memo of curie (or iri) -> node for a graph's _getnode().
+
+    The same predicates, categories and a few hundred thousand
+    subject ids are expanded over and over during an ingest;
+    each expansion splits the curie, looks up the prefix and builds a node.
+
+    Curies in `resident` (the values of the global translation table)
+    are kept for the life of the graph, anything else in a
+    least recently used cache of `maxsize` entries.
+    Curies which fail to expand are not cached, so they are reported every time.
+
+    The cache belongs to one graph, because making a node may have side effects
+    on it (e.g. RDFGraph noting the prefixes in use).
+    """
+
+    def __init__(self, maxsize=CACHE_SIZE, resident=()):
+        self.maxsize = maxsize
+        self.resident_curies = frozenset(resident)
+        self.resident = {}
+        self.recent = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.resident) + len(self.recent)
+
+    def get(self, curie, make_node):
+        """
+        :param curie: str identifier formatted as curie or iri
+        :param make_node: function to expand the curie when it is not cached
+        :return: node as made by make_node
+        """
+        node = self.resident.get(curie)
+        if node is not None:
+            self.hits += 1
+            return node
+        recent = self.recent
+        node = recent.get(curie)
+        if node is not None:
+            self.hits += 1
+            recent.move_to_end(curie)
+            return node
+
+        self.misses += 1
+        node = make_node(curie)
+        if node is None:
+            return None
+        if curie in self.resident_curies:
+            self.resident[curie] = node
+        else:
+            recent[curie] = node
+            if len(recent) > self.maxsize:
+                recent.popitem(last=False)
+        return node
+
+    def hit_rate(self):
+        """
+        :return: float fraction of lookups answered from the cache
+        """
+        lookups = self.hits + self.misses
+        if lookups == 0:
+            return 0.0
+        return self.hits / lookups
+
+    def report(self):
+        LOG.info(
+            "Node cache answered %i of %i lookups (%.1f%%); "
+            "%i resident, %i recent of at most %i",
+            self.hits, self.hits + self.misses, 100 * self.hit_rate(),
+            len(self.resident), len(self.recent), self.maxsize)
@@ -0,0 +1,177 @@
+import os
+import gzip
+import queue
+import logging
+import tempfile
+import threading
+import weakref
+
+try:
+    import zstandard    # optional, for --compress zstd (pip install dipper[zstd])
+except ImportError:
+    zstandard = None
+
+LOG = logging.getLogger(__name__)
+
+WRITE_BUFFER = 2**22    # characters collected before they are encoded & written
+QUEUE_DEPTH = 8         # encoded chunks waiting on the compressor thread
+SUFFIX = {None: '', 'gzip': '.gz', 'zstd': '.zst'}
+
+# read once, while importing; os.umask() can only be read by setting it,
+# which is not safe once other threads are creating files
+UMASK = os.umask(0)
+os.umask(UMASK)
+
+
+def _compress(chunks, out, errors):
+    """
+    Compressor thread; writes chunks to out until it gets a None
+    """
+    while True:
+        chunk = chunks.get()
+        if chunk is None:
+            break
+        if not errors:  # after a failure just drain the queue
+            try:
+                out.write(chunk)
+            except Exception as err:  # reported back on close()
+                errors.append(err)
+
+
+def _discard(temp_path, chunks, thread):
+    """
+    Clean up after a sink which was never closed
+    """
+    if thread is not None and thread.is_alive():
+        chunks.put(None)
+        thread.join()
+    if os.path.exists(temp_path):
+        LOG.warning("Discarding unfinished output %s", temp_path)
+        os.remove(temp_path)
+
+
+class OutputSink:
+    """
+    A write-only text file for streamed output.
+
+    Text is collected in a large buffer and written in big encoded chunks.
+    With compression ('gzip' or 'zstd') the compressing happens
+    on a background thread while the caller carries on producing lines.
+
+    Output goes to a temporary file next to `path`, which is only renamed
+    to `path` when the sink is closed; a half written file never
+    appears under its final name. A sink that is never closed
+    (e.g. the ingest died) has its temporary file removed.
+    """
+
+    def __init__(self, path, compression=None, buffer_size=WRITE_BUFFER):
+        if compression not in SUFFIX:
+            raise ValueError("Unknown compression {}".format(compression))
+        if compression == 'zstd' and zstandard is None:
+            raise ImportError(
+                "zstd compression needs the zstandard package "
+                "(pip install zstandard, or dipper[zstd])")
+        self.path = path
+        self.compression = compression
+        self.buffer_size = buffer_size
+        self.closed = False
+
+        directory, filename = os.path.split(os.path.abspath(path))
+        handle, self.temp_path = tempfile.mkstemp(
+            dir=directory, prefix='.' + filename + '.', suffix='.part')
+        # mkstemp() files are private; give it the permissions open() would
+        os.fchmod(handle, 0o666 & ~UMASK)
+        self._raw = os.fdopen(handle, 'wb')
+        if compression == 'gzip':
+            self._out = gzip.GzipFile(fileobj=self._raw, mode='wb', compresslevel=6)
+        elif compression == 'zstd':
+            self._out = zstandard.ZstdCompressor().stream_writer(
+                self._raw, closefd=False)
+        else:
+            self._out = self._raw
+
+        self._parts = []
+        self._size = 0
+        self._errors = []
+        self._chunks = queue.Queue(maxsize=QUEUE_DEPTH)
+        self._thread = None
+        if compression is not None:
+            self._thread = threading.Thread(
+                target=_compress, args=(self._chunks, self._out, self._errors),
+                name='OutputSink ' + filename, daemon=True)
+            self._thread.start()
+        self._finalizer = weakref.finalize(
+            self, _discard, self.temp_path, self._chunks, self._thread)
+        LOG.info("Writing %s by way of %s", path, self.temp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def write(self, text):
+        """
+        :param text: str
+        :return: int count of characters buffered
+        """
+        self._parts.append(text)
+        self._size += len(text)
+        if self._size >= self.buffer_size:
+            self.flush()
+        return len(text)
+
+    def flush(self):
+        """
+        Hand buffered text on to the file (or compressor)
+        """
+        if not self._parts:
+            return
+        chunk = ''.join(self._parts).encode('utf-8')
+        self._parts = []
+        self._size = 0
+        if self._thread is None:
+            self._out.write(chunk)
+        else:
+            if self._errors:
+                raise self._errors[0]
+            self._chunks.put(chunk)
+
+    def close(self):
+        """
+        Flush everything, close the file and move it into place
+        """
+        if self.closed:
+            return
+        try:
+            self.flush()
+            if self._thread is not None:
+                self._chunks.put(None)
+                self._thread.join()
+                if self._errors:
+                    raise self._errors[0]
+            if self._out is not self._raw:
+                self._out.close()
+            self._raw.close()
+        except Exception:
+            self.abort()
+            raise
+        os.replace(self.temp_path, self.path)
+        self._finalizer.detach()
+        self.closed = True
+        LOG.info("Finished writing %s", self.path)
+
+    def abort(self):
+        """
+        Stop writing and remove the temporary file
+        """
+        if self.closed:
+            return
+        self.closed = True
+        self._parts = []
+        self._finalizer()
+        if not self._raw.closed:
+            self._raw.close()
@@ -4,9 +4,12 @@ import sys
 import os
 
 import yaml
+from collections import Counter
 from rdflib import ConjunctiveGraph, Literal, URIRef, BNode, Namespace
+from rdflib.plugins.memory import IOMemory
 
 from dipper.graph.Graph import Graph as DipperGraph
+from dipper.graph.NodeCache import NodeCache
 from dipper.utils.CurieUtil import CurieUtil
 from dipper import curie_map as curie_map_class
 from dipper.models.BiolinkVocabulary import BioLinkVocabulary as blv
@@ -14,6 +17,33 @@ from dipper.models.BiolinkVocabulary import BioLinkVocabulary as blv
 LOG = logging.getLogger(__name__)
 
 
+class PredicateCountingMemory(IOMemory):
+    """
+    rdflib's IOMemory store, also keeping a count of (distinct) triples per predicate
+    as they are added & removed, so nobody needs to scan the graph for them.
+    """
+
+    def __init__(self, configuration=None, identifier=None):
+        super().__init__(configuration, identifier)
+        self.predicate_counts = Counter()
+
+    def add(self, triple, context, quoted=False):
+        size = len(self)    # triples in the default (union) context
+        super().add(triple, context, quoted)
+        if len(self) > size:
+            self.predicate_counts[triple[1]] += 1
+
+    def remove(self, triplepat, context=None):
+        matched = [triple for triple, _ in self.triples(triplepat, context)]
+        super().remove(triplepat, context)
+        counts = self.predicate_counts
+        for triple in matched:
+            if next(self.triples(triple, None), None) is None:  # gone entirely
+                counts[triple[1]] -= 1
+                if counts[triple[1]] == 0:
+                    del counts[triple[1]]
+
+
 class RDFGraph(DipperGraph, ConjunctiveGraph):
     """
     Extends RDFLibs ConjunctiveGraph
@@ -35,9 +65,10 @@ class RDFGraph(DipperGraph, ConjunctiveGraph):
 
     def __init__(self, are_bnodes_skized=True, identifier=None):
         # print("in RDFGraph  with id: ", identifier)
-        super().__init__('IOMemory', identifier)
+        super().__init__(PredicateCountingMemory(), identifier)
         self.are_bnodes_skized = are_bnodes_skized
         self.prefixes = set()
+        self.node_cache = NodeCache(resident=self.globaltt.values())
 
         # Can be removed when this is resolved
         # https://github.com/RDFLib/rdflib/issues/632
@@ -46,6 +77,13 @@ class RDFGraph(DipperGraph, ConjunctiveGraph):
         #    self.bind(pfx, Namespace(self.curie_map[pfx]))
 
 
+    @property
+    def predicate_counts(self):
+        """
+        :return: dict of predicate URIRef -> count of triples using it
+        """
+        return dict(self.store.predicate_counts)
+
     def _make_category_triple(
             self, subject, category, predicate=blv.terms['category']
     ):
@@ -146,6 +184,16 @@ class RDFGraph(DipperGraph, ConjunctiveGraph):
         return URIRef(self.curie_map['BNODE'] + stripped_id)
 
     def _getnode(self, curie):
+        """
+        The URIRef or BNode for a curie or iri,
+        memoized per graph (see NodeCache)
+
+        :param curie: str identifier formatted as curie or iri
+        :return: node: RDFLib URIRef or BNode object
+        """
+        return self.node_cache.get(curie, self._makenode)
+
+    def _makenode(self, curie):
         """
         This is a wrapper for creating a URIRef or Bnode object
         with a given a curie or iri as a string.
@@ -179,7 +227,7 @@ class RDFGraph(DipperGraph, ConjunctiveGraph):
                 LOG.error("couldn't make URI for %s", curie)
                 # get a sense of where the CURIE-ish? thing is comming from
                 # magic number here is "steps up the call stack"
-                for call in range(3, 0, -1):
+                for call in range(5, 2, -1):  # past NodeCache.get & _getnode
                     LOG.warning(
                         '\t%sfrom: %s', '\t' * call, sys._getframe(call).f_code.co_name)
         return node
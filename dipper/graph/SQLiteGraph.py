@@ -0,0 +1,219 @@
+import os
+import logging
+import sqlite3
+import tempfile
+import weakref
+
+from dipper.graph.CompactGraph import CompactGraph
+
+LOG = logging.getLogger(__name__)
+
+WRITE_BATCH = 50000     # triples buffered in memory between inserts
+FETCH_BATCH = 10000     # rows fetched per round trip when streaming
+CACHE_KIB = 64 * 1024   # bound on sqlite's page cache
+
+
+class SQLiteGraph(CompactGraph):
+    """
+    A disk backed graph for ingests which do not fit in memory.
+
+    Triples are kept (in ntriples form) in a local SQLite file,
+    added in batches through a bounded write buffer
+    and made unique by a unique index on (subject, predicate, object).
+    Memory use stays flat however many triples are added.
+
+    Terms are handled exactly as by CompactGraph, so queries
+    accept and return rdflib terms, and nt/nquads serialization is
+    streamed straight out of the database.
+
+    Unless a dbfile is given the database is a temporary file
+    (under $TMPDIR) which is removed once the graph is closed or collected.
+    """
+
+    def __init__(self, are_bnodes_skized=True, identifier=None, dbfile=None):
+        super().__init__(are_bnodes_skized, identifier)
+        if dbfile is None:
+            handle, dbfile = tempfile.mkstemp(prefix='dipper_', suffix='.sqlite')
+            os.close(handle)
+            self._finalizer = weakref.finalize(self, os.remove, dbfile)
+        else:
+            self._finalizer = None
+        self.dbfile = dbfile
+        LOG.info("Storing graph %s in %s", self.identifier, dbfile)
+
+        self.conn = sqlite3.connect(dbfile)
+        # a scratch store; durability is not worth the syscalls
+        self.conn.execute('PRAGMA journal_mode = OFF')
+        self.conn.execute('PRAGMA synchronous = OFF')
+        self.conn.execute('PRAGMA cache_size = -{}'.format(CACHE_KIB))
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS triple (s TEXT, p TEXT, o TEXT)')
+        self.conn.execute(
+            'CREATE UNIQUE INDEX IF NOT EXISTS triple_spo ON triple (s, p, o)')
+        self._count_predicates()
+        self._count = self.conn.execute('SELECT COUNT(*) FROM triple').fetchone()[0]
+        self._buffer = []
+        self._indexes = set()   # secondary indexes made so far
+
+    def __len__(self):
+        self.flush()
+        return self._count
+
+    def __contains__(self, triple):
+        self.flush()
+        where, params = self._where(triple)
+        return self.conn.execute(
+            'SELECT 1 FROM triple' + where + ' LIMIT 1', params).fetchone() is not None
+
+    def _count_predicates(self):
+        """
+        Keep a count of triples per predicate up to date with triggers
+        (INSERT OR IGNORE only fires them for rows actually inserted)
+        """
+        if self.conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'predicate'").fetchone():
+            return
+        self.conn.executescript('''
+            CREATE TABLE predicate (p TEXT PRIMARY KEY, n INTEGER) WITHOUT ROWID;
+            INSERT INTO predicate SELECT p, COUNT(*) FROM triple GROUP BY p;
+            CREATE TRIGGER predicate_add AFTER INSERT ON triple BEGIN
+                INSERT INTO predicate VALUES (new.p, 1)
+                ON CONFLICT (p) DO UPDATE SET n = n + 1;
+            END;
+            CREATE TRIGGER predicate_remove AFTER DELETE ON triple BEGIN
+                UPDATE predicate SET n = n - 1 WHERE p = old.p;
+            END;
+        ''')
+
+    @property
+    def predicate_counts(self):
+        """
+        :return: dict of predicate URIRef -> count of triples using it
+        """
+        self.flush()
+        return {
+            self._term(pred): count for pred, count in self.conn.execute(
+                'SELECT p, n FROM predicate WHERE n > 0')}
+
+    def _add_keys(self, subj, pred, obj):
+        """
+        Buffer a triple of ntriples terms, writing the buffer out when full
+        """
+        self._buffer.append((subj, pred, obj))
+        if len(self._buffer) >= WRITE_BATCH:
+            self.flush()
+
+    def flush(self):
+        """
+        Insert buffered triples (duplicates are ignored by the unique index)
+        """
+        if not self._buffer:
+            return
+        # rowcount leaves out rows written by triggers (unlike total_changes)
+        cursor = self.conn.executemany(
+            'INSERT OR IGNORE INTO triple (s, p, o) VALUES (?, ?, ?)', self._buffer)
+        self.conn.commit()
+        self._count += cursor.rowcount
+        self._buffer = []
+
+    def close(self):
+        """
+        Flush and close the database, removing it if it was a temporary file
+        """
+        self.flush()
+        self.conn.close()
+        if self._finalizer is not None:
+            self._finalizer()
+
+    def _where(self, triple):
+        """
+        :param triple: tuple of rdflib terms, None as a wildcard
+        :return: (str where clause, list of params)
+        """
+        clauses = []
+        params = []
+        for column, term in zip(('s', 'p', 'o'), triple):
+            if term is not None:
+                clauses.append(column + ' = ?')
+                params.append(self._ntriples(term))
+        if triple[0] is None and clauses:
+            # only pay for more indexes once something needs them
+            self._index('po' if triple[1] is not None else 'o')
+        if clauses:
+            return ' WHERE ' + ' AND '.join(clauses), params
+        return '', params
+
+    def _index(self, columns):
+        """
+        Make sure there is an index on columns, 'po' (predicate & object) or 'o'
+        """
+        if columns not in self._indexes:
+            LOG.info("Indexing %s by %s", self.dbfile, ', '.join(columns))
+            self.conn.execute(
+                'CREATE INDEX IF NOT EXISTS triple_{} ON triple ({})'.format(
+                    columns, ', '.join(columns)))
+            self._indexes.add(columns)
+
+    def _rows(self, query, params=()):
+        cursor = self.conn.execute(query, params)
+        while True:
+            rows = cursor.fetchmany(FETCH_BATCH)
+            if not rows:
+                break
+            yield from rows
+
+    def remove(self, triple):
+        """
+        :param triple: tuple of rdflib terms, None as a wildcard
+        """
+        self.flush()
+        where, params = self._where(triple)
+        cursor = self.conn.execute('DELETE FROM triple' + where, params)
+        self.conn.commit()
+        self._count -= cursor.rowcount
+
+    def triples(self, triple):
+        """
+        :param triple: tuple of rdflib terms, None as a wildcard
+        :return: generator of rdflib term triples, streamed from the database
+         (take a list() of them first to change the graph while going through them)
+        """
+        self.flush()
+        where, params = self._where(triple)
+        query = 'SELECT s, p, o FROM triple' + where + ' ORDER BY rowid'
+        for subj, pred, obj in self._rows(query, params):
+            yield self._term(subj), self._term(pred), self._term(obj)
+
+    def _column(self, column, triple):
+        """
+        Like triples() but select & decode just one column
+        """
+        self.flush()
+        where, params = self._where(triple)
+        query = 'SELECT ' + column + ' FROM triple' + where + ' ORDER BY rowid'
+        for (term,) in self._rows(query, params):
+            yield self._term(term)
+
+    def subjects(self, predicate=None, obj=None):
+        return self._column('s', (None, predicate, obj))
+
+    def predicates(self, subject=None, obj=None):
+        return self._column('p', (subject, None, obj))
+
+    def objects(self, subject=None, predicate=None):
+        return self._column('o', (subject, predicate, None))
+
+    def nt_lines(self, fileformat='nt'):
+        """
+        Generate ntriples (or nquads) lines in order of insertion.
+        (see GraphUtils.write_ntriples)
+        :param fileformat: 'nt' or 'nquads'
+        :return: generator of str lines
+        """
+        self.flush()
+        if fileformat == 'nquads':
+            end = ' '.join((self._ntriples(self.identifier), '.\n'))
+        else:
+            end = '.\n'
+        for subj, pred, obj in self._rows('SELECT s, p, o FROM triple ORDER BY rowid'):
+            yield ' '.join((subj, pred, obj, end))
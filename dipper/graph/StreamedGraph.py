@@ -1,11 +1,14 @@
 import logging
-import re
 import yaml
 import os
+from rdflib import BNode, Literal, URIRef
+from rdflib.plugins.serializers.nt import _quoteLiteral
 
 from dipper.graph.Graph import Graph as DipperGraph
+from dipper.graph.NodeCache import NodeCache
 from dipper.utils.CurieUtil import CurieUtil
 from dipper import curie_map as curimap
+from dipper.models.BiolinkVocabulary import BioLinkVocabulary as blv
 
 LOG = logging.getLogger(__name__)
 
@@ -13,10 +16,14 @@ LOG = logging.getLogger(__name__)
 class StreamedGraph(DipperGraph):
     """
     Stream rdf triples to file or stdout
-    Assumes a downstream process will sort then uniquify triples
+    Assumes a downstream process will sort then uniquify triples,
+    unless given a TripleFilter (dedup) to drop most repeated lines as they come
 
     Theoretically could support both ntriple, rdfxml formats, for now
     just support nt
+
+    file_handle may be any object with write(str), typically an OutputSink,
+    which must be close()d when the ingest is done
     """
 
     curie_map = curimap.get()
@@ -30,11 +37,53 @@ class StreamedGraph(DipperGraph):
         globaltcid = {v: k for k, v in globaltt.items()}
 
     def __init__(
-            self, are_bnodes_skized=True, identifier=None, file_handle=None, fmt='nt'):
+            self, are_bnodes_skized=True, identifier=None, file_handle=None, fmt='nt',
+            dedup=None):
         self.are_bnodes_skized = are_bnodes_skized
         self.fmt = fmt
         self.file_handle = file_handle
         self.identifier = identifier
+        self.dedup = dedup  # TripleFilter or None
+        self.node_cache = NodeCache(resident=self.globaltt.values())
+        self._predicate_counts = {}     # predicate iri -> lines written with it
+
+    def close(self):
+        """
+        Flush and close the output (moving it into place if it is an OutputSink)
+        """
+        if self.file_handle is not None:
+            self.file_handle.close()
+
+    @property
+    def predicate_counts(self):
+        """
+        :return: dict of predicate URIRef -> count of triples written using it
+        """
+        return {
+            URIRef(pred): count for pred, count in self._predicate_counts.items()}
+
+    def add(self, triple):
+        """
+        Write a triple of rdflib terms, as GraphUtils.add_property_axioms() does
+
+        :param triple: tuple of rdflib URIRefs or BNodes (the object may be a Literal)
+        """
+        subj, pred, obj = (self._ntriples(term) for term in triple)
+        self._write([(str(triple[1]), ' '.join((subj, pred, obj, '.\n')))])
+
+    @staticmethod
+    def _ntriples(term):
+        """
+        :param term: rdflib URIRef, BNode or Literal (language tag and datatype kept)
+        :return: str ntriples form of the term
+        """
+        if isinstance(term, Literal):
+            return _quoteLiteral(term)
+        if isinstance(term, BNode):
+            return '_:%s' % term
+        if isinstance(term, URIRef):
+            return '<%s>' % term
+        raise TypeError("Cannot write {!r} as an rdf term".format(term))
 
     def addTriple(
             self,
@@ -51,8 +100,8 @@ class StreamedGraph(DipperGraph):
             if self.curie_regexp.match(obj) or\
                     obj.split(':')[0].lower() in ('http', 'https', 'ftp'):
                 object_is_literal = False
-        else:
-            object_is_literal = True
+            else:
+                object_is_literal = True
 
         subject_iri = self._getnode(subject_id)
         predicate_iri = self._getnode(predicate_id)
@@ -84,7 +133,7 @@ class StreamedGraph(DipperGraph):
         return
 
     def skolemizeBlankNode(self, curie):
-        base_iri = StreamedGraph.curie_map.get_base()
+        base_iri = StreamedGraph.curie_util.get_base()
         curie_id = curie.split(':')[1]
         skolem_iri = "{0}.wellknown/genid/{1}".format(base_iri, curie_id)
         return skolem_iri
@@ -92,46 +141,70 @@ class StreamedGraph(DipperGraph):
     def serialize(self, subject_iri, predicate_iri, obj,
                   object_is_literal=False, literal_type=None,
                   subject_category_iri=None,
-                  predicate_category_iri="biolink:category",
+                  predicate_category_iri=None,
                   object_category_iri=None):
+        if predicate_category_iri is None:
+            predicate_category_iri = self._getnode(blv.terms['category'])
+
         if not object_is_literal:
-            triple = "<{}> <{}> <{}> .".format(subject_iri, predicate_iri, obj)
+            triple = "<{}> <{}> <{}> .\n".format(subject_iri, predicate_iri, obj)
         elif literal_type is not None:
-            triple = '<{}> <{}> {}^^<{}> .'.format(
+            triple = '<{}> <{}> {}^^<{}> .\n'.format(
                 subject_iri, predicate_iri,
                 self._quote_encode(str(obj)), literal_type)
         else:
             if isinstance(obj, str):
-                triple = '<{}> <{}> {} .'.format(
+                triple = '<{}> <{}> {} .\n'.format(
                     subject_iri, predicate_iri, self._quote_encode(obj))
             else:
                 lit_type = self._getLiteralXSDType(obj)
-                if type is not None:
-                    triple = '<{}> <{}> "{}"^^<{}> .'.format(
+                if lit_type is not None:
+                    triple = '<{}> <{}> "{}"^^<{}> .\n'.format(
                         subject_iri, predicate_iri, obj, lit_type)
                 else:
                     raise TypeError("Cannot determine type of {}".format(obj))
 
-        biolink_category_triples = []
+        lines = [(predicate_iri, triple)]
         if subject_category_iri is not None:
-            biolink_category_triples += \
-                "<{}> <{}> <{}> .".format(subject_iri, predicate_category_iri,
-                                          subject_category_iri)
+            lines.append((
+                predicate_category_iri,
+                "<{}> <{}> <{}> .\n".format(
+                    subject_iri, predicate_category_iri, subject_category_iri)))
         if object_category_iri is not None:
             if object_is_literal or literal_type is not None:
                 LOG.warning("can't write biolink category triple for literal!")
             else:
-                biolink_category_triples += \
-                    "<{}> <{}> <{}> .".format(obj, predicate_category_iri,
-                                              object_category_iri)
-        all_triples = "\n".join([triple, biolink_category_triples])
+                lines.append((
+                    predicate_category_iri,
+                    "<{}> <{}> <{}> .\n".format(
+                        obj, predicate_category_iri, object_category_iri)))
+        self._write(lines)
 
-        if self.file_handle is None:
-            print(all_triples)
-        else:
-            self.file_handle.write("{}\n".format(all_triples))
+    def _write(self, lines):
+        """
+        :param lines: list of (str predicate iri, str ntriples line)
+        """
+        # one write per line; the file handle does the buffering
+        counts = self._predicate_counts
+        for predicate, line in lines:
+            if self.dedup is None or self.dedup.add(line):
+                counts[predicate] = counts.get(predicate, 0) + 1
+                if self.file_handle is None:
+                    print(line, end='')
+                else:
+                    self.file_handle.write(line)
 
     def _getnode(self, curie):
+        """
+        The iri (or blank node) for a curie or iri,
+        memoized per graph (see NodeCache)
+
+        :param curie: str identifier formatted as curie or iri
+        :return: str
+        """
+        return self.node_cache.get(curie, self._makenode)
+
+    def _makenode(self, curie):
         """
         Returns IRI, or blank node curie/iri depending on
         self.skolemize_blank_node setting
@@ -144,7 +217,7 @@ class StreamedGraph(DipperGraph):
                 node = self.skolemizeBlankNode(curie)
             else:
                 node = curie
-        elif re.match(r'^http|^ftp', curie):
+        elif curie.startswith(('http', 'ftp')):
             node = curie
         elif len(curie.split(':')) == 2:
             node = StreamedGraph.curie_util.get_uri(curie)
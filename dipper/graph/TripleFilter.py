@@ -0,0 +1,87 @@
+import logging
+import hashlib
+
+LOG = logging.getLogger(__name__)
+
+
+class TripleFilter:
+    """
+    Memory bounded "have I emitted this line before?" test for StreamedGraph
+
+    Each line is reduced to a fixed width (128 bit) blake2b digest.
+    Until `exact_budget` distinct lines have been seen, 64 bits of the digest
+    are kept in a set, so repeats are recognized exactly
+    (barring a 64 bit collision, ~1e-7 at a few million lines).
+
+    Past the budget, new digests go into a Bloom filter of `bloom_bits` bits
+    probed `hash_count` times. A Bloom filter never misses a repeat but may
+    (rarely) mistake a new line for one; that false positive rate is the
+    price of bounded memory, choose bloom_bits accordingly.
+    With bloom_bits=0 lines past the budget are not filtered at all
+    and the output may still hold some duplicates.
+
+    Roughly: the exact set costs ~70 bytes per line,
+    the Bloom filter bloom_bits / 8 bytes in total. With k=7 probes
+    a false positive rate of 1e-4 needs ~19 bits per line it holds.
+    """
+
+    def __init__(self, exact_budget=2**22, bloom_bits=2**31, hash_count=7):
+        self.exact_budget = exact_budget
+        self.bloom_bits = bloom_bits
+        self.hash_count = hash_count
+        self.exact = set()
+        self.bloom = None
+        self.bloom_count = 0
+        self.lines = 0  # lines offered
+        self.hits = 0   # lines recognized as already emitted
+
+    def add(self, line):
+        """
+        :param line: str
+        :return: True if the line is new (and should be emitted)
+        """
+        self.lines += 1
+        digest = hashlib.blake2b(line.encode('utf-8'), digest_size=16).digest()
+        key = int.from_bytes(digest[:8], 'little')
+        if key in self.exact:
+            self.hits += 1
+            return False
+        if len(self.exact) < self.exact_budget:
+            self.exact.add(key)
+            return True
+        if not self.bloom_bits:
+            return True
+        if self.bloom is None:
+            LOG.info(
+                "Exact dedup budget of %i lines spent, "
+                "continuing with a %i MiB Bloom filter",
+                self.exact_budget, self.bloom_bits // 2**23)
+            self.bloom = bytearray(self.bloom_bits // 8 + 1)
+
+        # double hashing; probe i is at key + i * step
+        step = int.from_bytes(digest[8:], 'little') | 1
+        bloom = self.bloom
+        probes = [
+            (key + i * step) % self.bloom_bits for i in range(self.hash_count)]
+        if all(bloom[bit >> 3] & (1 << (bit & 7)) for bit in probes):
+            self.hits += 1
+            return False
+        for bit in probes:
+            bloom[bit >> 3] |= 1 << (bit & 7)
+        self.bloom_count += 1
+        return True
+
+    def hit_rate(self):
+        """
+        :return: float fraction of lines offered which were dropped as repeats
+        """
+        if self.lines == 0:
+            return 0.0
+        return self.hits / self.lines
+
+    def report(self):
+        LOG.info(
+            "Dedup dropped %i of %i lines (%.1f%%); "
+            "%i held exactly, %i in Bloom filter",
+            self.hits, self.lines, 100 * self.hit_rate(),
+            len(self.exact), self.bloom_count)
@@ -174,7 +174,7 @@ class Dataset:
             ingest_description=None,
             license_url=None,
             data_rights=None,
-            graph_type='rdf_graph',     # rdf_graph, streamed_graph
+            graph_type='rdf_graph',     # rdf_graph, streamed_graph, compact_graph ...
             file_handle=None,
             distribution_type='ttl',
             dataset_curie_prefix='MonarchArchive'
@@ -187,7 +187,8 @@ class Dataset:
             self.graph = StreamedGraph(True,
                                        ":".join([dataset_curie_prefix, identifier]),
                                        file_handle=file_handle)
-        elif graph_type == 'rdf_graph':
+        elif graph_type in ('rdf_graph', 'compact_graph', 'sqlite_graph'):
+            # the dataset description is always small enough for rdflib
             self.graph = RDFGraph(True,
                                   ':'.join([dataset_curie_prefix, identifier]))
 
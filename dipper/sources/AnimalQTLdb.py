@@ -323,7 +323,7 @@ class AnimalQTLdb(Source):
                 reader = csv.reader(gi_gz, delimiter='\t')
                 # skipping header checking, b/c not all of these gene_info files have
                 # headers
-                col = self.files[src_key]['columns']
+                col = self.row_schema(self.files[src_key]['columns'])
                 col_len = len(col)
                 for row in reader:
                     if row[0][0] == '#':
@@ -403,7 +403,7 @@ class AnimalQTLdb(Source):
         with open(raw, 'r', encoding="iso-8859-1") as csvfile:
             reader = csv.reader(csvfile, delimiter='\t', quotechar='\"')
             # no header in these files, so no header checking
-            col = self.files[src_key]['columns']
+            col = self.row_schema(self.files[src_key]['columns'])
             col_len = len(col)
             for row in reader:
                 if len(row) != col_len and ''.join(row[col_len:]) != '':
@@ -654,7 +654,7 @@ class AnimalQTLdb(Source):
         with gzip.open(raw, 'rt', encoding='ISO-8859-1') as tsvfile:
             reader = csv.reader(tsvfile, delimiter="\t")
             # no header in GFF, so no header checking
-            col = self.files[src_key]['columns']
+            col = self.row_schema(self.files[src_key]['columns'])
             col_len = len(col)
             for row in reader:
                 if row[0][0] == '#':
@@ -796,7 +796,7 @@ Variance="2.94";Dominance_Effect="-0.002";Additive_Effect="0.01
         else:
             graph = self.graph
         model = Model(graph)
-        col = self.files[src_key]['columns']
+        col = self.row_schema(self.files[src_key]['columns'])
         col_len = len(col)
         with open(raw, 'r') as csvfile:
             reader = csv.reader(csvfile, delimiter=',', quotechar='\"')
@@ -189,7 +189,7 @@ class Bgee(Source):
         :return: None
         """
         dataframe = pd.read_csv(fh, sep='\t')
-        col = self.files['anat_entity']['columns']
+        col = self.row_schema(self.files['anat_entity']['columns'])
         if not self.check_fileheader(col, list(dataframe)):
             pass
 
@@ -1,6 +1,5 @@
 import csv
 import re
-import gzip
 import os
 import logging
 import urllib
@@ -14,6 +13,7 @@ from dipper.models.Pathway import Pathway
 from dipper.models.assoc.G2PAssoc import G2PAssoc
 from dipper.models.Reference import Reference
 from dipper.models.BiolinkVocabulary import BioLinkVocabulary as blv
+from dipper.utils.GzipReader import GzipReader
 
 LOG = logging.getLogger(__name__)
 
@@ -200,7 +200,7 @@ class CTD(Source):
         version_pattern = re.compile(r'^# Report created: (.+)$')
         is_versioned = False
         file_path = '/'.join((self.rawdir, self.files[src_key]['file']))
-        with gzip.open(file_path, 'rt') as tsvfile:
+        with GzipReader(file_path, 'rt') as tsvfile:
             reader = csv.reader(tsvfile, delimiter="\t")
             for row in reader:
                 # Scan the header lines until we get the version
@@ -303,7 +303,7 @@ class Coriell(Source):
         model = Model(graph)
         geno = Genotype(graph)
         diputil = DipperUtil()
-        col = self.files[src_key]['columns']
+        col = self.row_schema(self.files[src_key]['columns'])
         # affords access with
         # x = row[col.index('x')].strip()
 
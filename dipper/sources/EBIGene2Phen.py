@@ -159,7 +159,7 @@ class EBIGene2Phen(Source):
         :param row {List}: single row from DDG2P.csv
         :return: None
         """
-        col = self.files['developmental_disorders']['columns']
+        col = self.row_schema(self.files['developmental_disorders']['columns'])
         if len(row) != len(col):
             raise ValueError("Unexpected number of fields for row {}".format(row))
 
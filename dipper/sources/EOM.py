@@ -114,7 +114,7 @@ class EOM(PostgreSQLSource):
 
         # process the tables
         # self.fetch_from_pgdb(self.tables,cxn,100)  #for testing
-        self.fetch_from_pgdb(self.tables, cxn)
+        self.fetch_from_pgdb(self.tables, cxn, is_dl_forced=is_dl_forced)
 
         self.get_files(is_dl_forced)
 
@@ -175,7 +175,7 @@ class EOM(PostgreSQLSource):
 
         src_key = 'tables'
         model = Model(self.graph)
-        col = self.resources[src_key]['columns']
+        col = self.row_schema(self.resources[src_key]['columns'])
         with open(raw, 'r') as rawread:
             reader = csv.reader(rawread, delimiter='\t', quotechar='\"')
             row = next(reader)
@@ -293,7 +293,7 @@ class EOM(PostgreSQLSource):
 
         model = Model(self.graph)
         line_counter = 0
-        col = self.files['map']['columns']
+        col = self.row_schema(self.files['map']['columns'])
         with open(raw, 'r') as reader:
             line = reader.readline().strip()
             line = line.strip('/n')
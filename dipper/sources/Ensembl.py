@@ -303,29 +303,40 @@ class Ensembl(Source):
         col = list(self.columns['bmq_attributes'])
         if taxid != '9606' and 'hgnc_id' in col:
             col.remove('hgnc_id')
-        col_exp = [
-            self.columns['bmq_headers'][self.columns['bmq_attributes'].index(x)]
-            for x in col]
+        # attribute sent -> header received
+        header = {
+            x: self.columns['bmq_headers'][self.columns['bmq_attributes'].index(x)]
+            for x in col}
 
         LOG.info("Processing Ensembl genes for NCBITaxon:%s", taxid)
         with open(raw, 'r', encoding="utf8") as csvfile:
             reader = csv.reader(csvfile, delimiter='\t')
             row = next(reader)
-            if not self.check_fileheader(col_exp, row):
-                pass
+            col_exp = self.row_schema([header[x] for x in col], row, taxid)
+            fields = col_exp.getter(*(header[x] for x in (
+                'ensembl_gene_id', 'external_gene_name', 'description',
+                'gene_biotype', 'entrezgene_id', 'ensembl_peptide_id',
+                'uniprotswissprot')))
+            # in the case of human genes, we also get the hgnc id,
+            hgnc_id = None
+            if taxid == '9606' and 'hgnc_id' in col:
+                hgnc_id = col_exp.index(header['hgnc_id'])
             for row in reader:
-                ensembl_gene_id = row[col.index('ensembl_gene_id')]
-                external_gene_name = row[col.index('external_gene_name')]
-                description = row[col.index('description')].strip()
-                gene_biotype = row[col.index('gene_biotype')].strip()
-                entrezgene = row[col.index('entrezgene_id')].strip()
-                ensembl_peptide_id = row[col.index('ensembl_peptide_id')].strip()
-                uniprotswissprot = row[col.index('uniprotswissprot')].strip()
+                (ensembl_gene_id,
+                 external_gene_name,
+                 description,
+                 gene_biotype,
+                 entrezgene,
+                 ensembl_peptide_id,
+                 uniprotswissprot) = fields(row)
+                description = description.strip()
+                gene_biotype = gene_biotype.strip()
+                entrezgene = entrezgene.strip()
+                ensembl_peptide_id = ensembl_peptide_id.strip()
+                uniprotswissprot = uniprotswissprot.strip()
                 hgnc_curie = None
-
-                # in the case of human genes, we also get the hgnc id,
-                if taxid == '9606' and 'hgnc_id' in col:
-                    hgnc_curie = row[col.index('hgnc_id')].strip()
+                if hgnc_id is not None:
+                    hgnc_curie = row[hgnc_id].strip()
 
                 if self.test_mode and entrezgene != '' and \
                         entrezgene not in self.gene_ids:
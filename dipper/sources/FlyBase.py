@@ -1,7 +1,6 @@
 import logging
 import re
 import csv
-import gzip
 import os
 from ftplib import FTP
 from typing import Dict, Tuple, List
@@ -12,6 +11,7 @@ from dipper.models.Genotype import Genotype
 from dipper.models.Model import Model
 from dipper.models.Reference import Reference
 from dipper.models.BiolinkVocabulary import BioLinkVocabulary as blv
+from dipper.utils.GzipReader import GzipReader
 
 LOG = logging.getLogger(__name__)
 
@@ -165,13 +165,13 @@ class FlyBase(PostgreSQLSource):
                      '/', cxn['database'])), is_object_literal=True)
 
         # Get data from remote db
-        # Each query takes 2 minutes or so
+        # Each query takes 2 minutes or so, a few run at once
+        queries = {}
         for query_map in self.queries.values():
-            query_fh = open(os.path.join(
-                os.path.dirname(__file__), query_map['query']), 'r')
-            query = query_fh.read()
-            self.fetch_query_from_pgdb(
-                query_map['file'], query, None, cxn)
+            with open(os.path.join(
+                    os.path.dirname(__file__), query_map['query']), 'r') as query_fh:
+                queries[query_map['file']] = query_fh.read()
+        self.fetch_queries_from_pgdb(queries, cxn, is_dl_forced=is_dl_forced)
 
         # Get flat file's current name on the remote server
         ftp = FTP(FlyBase.FLYFTP)
@@ -244,7 +244,7 @@ class FlyBase(PostgreSQLSource):
         src_key = 'allele_phenotype'
         raw = '/'.join((self.rawdir, self.queries[src_key]['file']))
         LOG.info("processing allele phenotype associations")
-        col = self.queries[src_key]['columns']
+        col = self.row_schema(self.queries[src_key]['columns'])
 
         transgenic_alleles = self._get_foreign_transgenic_alleles()
 
@@ -378,9 +378,9 @@ class FlyBase(PostgreSQLSource):
             'Drer': ("non-drosophilid eukaryote", self.globaltt['Danio rerio'])
         }
 
-        col = self.files[src_key]['columns']
+        col = self.row_schema(self.files[src_key]['columns'])
 
-        with gzip.open(raw, 'rt') as tsvfile:
+        with GzipReader(raw, 'rt') as tsvfile:
             # Delimiter is ' | ' but csv requires 1 char
             reader = csv.reader(tsvfile, delimiter='|')
             # skip first lines
@@ -425,13 +425,13 @@ class FlyBase(PostgreSQLSource):
         raw = '/'.join((self.rawdir, self.files[src_key]['file']))
         LOG.info("creating map of flybase ref ids and pmids")
 
-        col = self.files[src_key]['columns']
+        col = self.row_schema(self.files[src_key]['columns'])
 
         # JR - I've set encoding to latin-1 to fix the UnicodeDecodeError that happens
         # when the default encoding (utf-8) is used. This possibly will break if/when
         # the encoding of this file upstream at Flybase is changed to utf-8. If so,
         # trying setting encoding='utf-8' below
-        with gzip.open(raw, 'rt', encoding='latin-1') as tsvfile:
+        with GzipReader(raw, 'rt', encoding='latin-1') as tsvfile:
             reader = csv.reader(tsvfile, delimiter='\t')
             # skip first four lines
             for _ in range(0, 2):
@@ -467,9 +467,9 @@ class FlyBase(PostgreSQLSource):
         raw = '/'.join((self.rawdir, self.files[src_key]['file']))
         LOG.info("Getting list of transgenic alleles from %s", raw)
 
-        col = self.files[src_key]['columns']
+        col = self.row_schema(self.files[src_key]['columns'])
 
-        with gzip.open(raw, 'rt') as tsvfile:
+        with GzipReader(raw, 'rt') as tsvfile:
             reader = csv.reader(tsvfile, delimiter='\t')
             # skip first line, version info
             next(reader)
@@ -517,7 +517,7 @@ class FlyBase(PostgreSQLSource):
         raw = '/'.join((self.rawdir, self.queries[src_key]['file']))
         LOG.info("processing gene xrefs")
 
-        col = self.queries[src_key]['columns']
+        col = self.row_schema(self.queries[src_key]['columns'])
 
         with open(raw, 'r') as tsvfile:
             reader = csv.reader(tsvfile, delimiter='\t')
@@ -563,9 +563,9 @@ class FlyBase(PostgreSQLSource):
         raw = '/'.join((self.rawdir, self.files[src_key]['file']))
         LOG.info("processing allele to gene")
 
-        col = self.files[src_key]['columns']
+        col = self.row_schema(self.files[src_key]['columns'])
 
-        with gzip.open(raw, 'rt') as tsvfile:
+        with GzipReader(raw, 'rt') as tsvfile:
             reader = csv.reader(tsvfile, delimiter='\t')
             # skip first line, version info
             next(reader)
@@ -699,11 +699,11 @@ class FlyBase(PostgreSQLSource):
         src_key = 'disease_model'
         raw = '/'.join((self.rawdir, self.files[src_key]['file']))
         LOG.info("processing disease models")
-        col = self.files[src_key]['columns']
+        col = self.row_schema(self.files[src_key]['columns'])
 
         transgenic_alleles = self._get_foreign_transgenic_alleles()
 
-        with gzip.open(raw, 'rt') as tsvfile:
+        with GzipReader(raw, 'rt') as tsvfile:
             reader = csv.reader(tsvfile, delimiter='\t')
             # skip first four lines
             for _ in range(0, 4):
@@ -1,10 +1,10 @@
 import logging
 import csv
 import re
-import json
 
 from dipper.sources.Source import Source
 from dipper.utils.DipperUtil import DipperUtil
+from dipper.utils.MondoIndex import MondoIndex
 from dipper.models.Model import Model
 from dipper.models.Genotype import Genotype
 from dipper.models.assoc.G2PAssoc import G2PAssoc
@@ -162,65 +162,32 @@ class GWASCatalog(Source):
         LOG.info("Finished loading SO ontology")
 
         mondo_file = '/'.join((self.rawdir, self.files['mondo']['file']))
-        with open(mondo_file, 'r') as mondo_fh:
-            mondo_data = json.load(mondo_fh)
-
-        col = self.files[src_key]['columns']
+        mondo_index = MondoIndex.load(mondo_file)
 
         with open(raw, 'r', encoding="iso-8859-1") as csvfile:
             reader = csv.reader(csvfile, delimiter='\t')
             row = next(reader)
-            if self.check_fileheader(col, row):
-                pass
+            col = self.row_schema(self.files[src_key]['columns'], row, src_key)
+            # the columns used (the files entry lists them all)
+            fields = col.getter(
+                'PUBMEDID', 'DISEASE/TRAIT', 'INITIAL SAMPLE SIZE',
+                'REPLICATION SAMPLE SIZE', 'CHR_ID', 'CHR_POS', 'MAPPED_GENE',
+                'UPSTREAM_GENE_ID', 'DOWNSTREAM_GENE_ID', 'SNP_GENE_IDS',
+                'STRONGEST SNP-RISK ALLELE', 'MERGED', 'SNP_ID_CURRENT', 'CONTEXT',
+                'RISK ALLELE FREQUENCY', 'P-VALUE', 'PLATFORM [SNPS PASSING QC]',
+                'MAPPED_TRAIT', 'MAPPED_TRAIT_URI')
             for row in reader:
                 if len(col) != len(row):
                     LOG.error('BadRow: %i has %i columns', reader.line_num, row)
                     continue
-                # head -1 gwas-catalog-associations_ontology-annotated.tsv |
-                # tr '\t' '\n'  | sed "s|\(.*\)|# = row[col.index('\1')]|g"
-
-                # = row[col.index('DATE ADDED TO CATALOG')]
-                pubmed_num = row[col.index('PUBMEDID')].strip()
-                # = row[col.index('FIRST AUTHOR')]
-                # = row[col.index('DATE')]
-                # = row[col.index('JOURNAL')]
-                # = row[col.index('LINK')]
-                # = row[col.index('STUDY')]
-                disease_or_trait = row[col.index('DISEASE/TRAIT')].strip()
-                initial_sample_description = row[
-                    col.index('INITIAL SAMPLE SIZE')].strip()
-                replicate_sample_description = row[
-                    col.index('REPLICATION SAMPLE SIZE')].strip()
-                # = row[col.index('REGION')]
-                chrom_num = row[col.index('CHR_ID')].strip()
-                chrom_pos = row[col.index('CHR_POS')].strip()
-                # = row[col.index('REPORTED GENE(S)')]
-                mapped_gene = row[col.index('MAPPED_GENE')].strip()
-                upstream_gene_num = row[col.index('UPSTREAM_GENE_ID')].strip()
-                downstream_gene_num = row[col.index('DOWNSTREAM_GENE_ID')].strip()
-                snp_gene_nums = row[col.index('SNP_GENE_IDS')].strip()
-                # = row[col.index('UPSTREAM_GENE_DISTANCE')]
-                # = row[col.index('DOWNSTREAM_GENE_DISTANCE')]
-                strongest_snp_risk_allele = row[
-                    col.index('STRONGEST SNP-RISK ALLELE')].strip()
-                # = row[col.index('SNPS')]
-                merged = row[col.index('MERGED')].strip()
-                snp_id_current = row[col.index('SNP_ID_CURRENT')].strip()
-                context = row[col.index('CONTEXT')].strip()
-                # = row[col.index('INTERGENIC')]
-                risk_allele_frequency = row[col.index('RISK ALLELE FREQUENCY')].strip()
-                pvalue = row[col.index('P-VALUE')].strip()
-                # = row[col.index('PVALUE_MLOG')]
-                # = row[col.index('P-VALUE (TEXT)')]
-                # = row[col.index('OR or BETA')]
-                # = row[col.index('95% CI (TEXT)')]
-                platform_with_snps_passing_qc = row[
-                    col.index('PLATFORM [SNPS PASSING QC]')].strip()
-                # = row[col.index('CNV')]
-                mapped_trait = row[col.index('MAPPED_TRAIT')].strip()
-                mapped_trait_uri = row[col.index('MAPPED_TRAIT_URI')].strip()
-                # = row[col.index('STUDY ACCESSION')]
-                # = row[col.index('GENOTYPING TECHNOLOGY')]
+
+                (pubmed_num, disease_or_trait, initial_sample_description,
+                 replicate_sample_description, chrom_num, chrom_pos, mapped_gene,
+                 upstream_gene_num, downstream_gene_num, snp_gene_nums,
+                 strongest_snp_risk_allele, merged, snp_id_current, context,
+                 risk_allele_frequency, pvalue, platform_with_snps_passing_qc,
+                 mapped_trait, mapped_trait_uri) = [
+                     field.strip() for field in fields(row)]
 
                 if self.test_mode:
                     continue
@@ -283,7 +250,7 @@ class GWASCatalog(Source):
                     platform_with_snps_passing_qc, pvalue)
 
                 self._add_variant_trait_association(
-                    variant_curie, mapped_trait_uri, mapped_trait, mondo_data,
+                    variant_curie, mapped_trait_uri, mapped_trait, mondo_index,
                     pubmed_num, description)
 
                 if not self.test_mode and (
@@ -506,7 +473,7 @@ class GWASCatalog(Source):
             )
 
     def _add_variant_trait_association(
-            self, variant_id, mapped_trait_uri, mapped_trait, mondo_data, pubmed_id,
+            self, variant_id, mapped_trait_uri, mapped_trait, mondo_index, pubmed_id,
             description=None):
         if self.test_mode:
             graph = self.testgraph
@@ -522,7 +489,7 @@ class GWASCatalog(Source):
             for index, trait in enumerate(mapped_trait_uris):
                 trait_curie = trait.replace("http://www.ebi.ac.uk/efo/EFO_", "EFO:")
 
-                if not DipperUtil.is_id_in_mondo(trait_curie, mondo_data):
+                if trait_curie not in mondo_index:
                     if re.match(r'^EFO', trait_curie):
                         model.addClassToGraph(
                             trait_curie, mapped_traits[index],
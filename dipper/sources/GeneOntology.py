@@ -1,8 +1,7 @@
 import csv
 import re
+import glob
 import logging
-import gzip
-import io
 import sys
 import os
 
@@ -17,6 +16,9 @@ from dipper.models.Genotype import Genotype
 from dipper.models.Reference import Reference
 from dipper.models.Model import Model
 from dipper.utils.GraphUtils import GraphUtils
+from dipper.utils.FileManifest import FileManifest
+from dipper.utils.IdMap import IdMap
+from dipper.utils.GzipReader import GzipReader
 
 
 LOG = logging.getLogger(__name__)
@@ -284,11 +286,10 @@ class GeneOntology(Source):
         LOG.info("Processing Gene Associations from %s", gaffile)
         uniprot_hit = 0
         uniprot_miss = 0
-        col = self.gaf_columns
+        col = self.row_schema(self.gaf_columns)
 
-        with gzip.open(gaffile, 'rb') as csvfile:
-            reader = csv.reader(
-                io.TextIOWrapper(csvfile, newline=""), delimiter='\t', quotechar='\"')
+        with GzipReader(gaffile, 'rt', newline='') as csvfile:
+            reader = csv.reader(csvfile, delimiter='\t', quotechar='\"')
             for row in reader:
                 # comments start with exclamation
                 if row[0][0] == '!':
@@ -501,71 +502,84 @@ class GeneOntology(Source):
                 uniprot_per, uniprot_tot)
 
     def get_uniprot_entrez_id_map(self):
+        """
+        Map UniProt accessions (of our taxa) to 1:1 Entrez, else ENSEMBL, gene ids.
+
+        The map is made once per set of taxa and version of the (10GB+)
+        idmapping file, as raw/go/id_map_<taxa digest>_<file digest>.idx,
+        an IdMap, which is looked up in place rather than loaded.
+        The idmapping file on hand is used as it is (fetch() keeps it current),
+        it is only fetched here if there is none.
+        Making a new map removes those made from earlier idmapping files.
+        :return: IdMap
+        """
         src_key = 'idmapping_selected'
         taxon_digest = GraphUtils.digest_id(str(self.tax_ids))
-        id_map = {}
-        smallfile = '/'.join((self.rawdir, 'id_map_' + taxon_digest + '.yaml'))
         bigfile = '/'.join((self.rawdir, self.files[src_key]['file']))
+        if not os.path.isfile(bigfile):
+            self.fetch_from_url(self.files[src_key]['url'], bigfile)
+
+        entry = FileManifest(self.rawdir).get(self.files[src_key]['file'])
+        if entry is not None and entry.get('sha256') is not None and \
+                entry['size'] == os.path.getsize(bigfile):
+            file_digest = entry['sha256'][:16]
+        else:
+            stat = os.stat(bigfile)
+            file_digest = GraphUtils.digest_id(
+                '{}-{}'.format(stat.st_size, stat.st_mtime_ns))
+        smallfile = '/'.join((
+            self.rawdir, 'id_map_' + taxon_digest + '_' + file_digest + '.idx'))
 
-        # if processed smallfile exists and is newer than bigfile then use it instead
-        if os.path.isfile(smallfile) and \
-                os.path.getctime(smallfile) > os.path.getctime(bigfile):
+        if os.path.isfile(smallfile):
             LOG.info("Using the cheap mapping file %s", smallfile)
-            with open(smallfile, 'r') as yamlreader:
-                id_map = yaml.safe_load(yamlreader)
         else:
             LOG.info(
                 "Expensive Mapping from Uniprot IDs to Entrez/ENSEMBL gene ids for %s",
                 self.tax_ids)
-            self.fetch_from_url(self.files[src_key]['url'], bigfile)
-            col = self.files[src_key]['columns']
+            col = self.row_schema(self.files[src_key]['columns'])
+            uniprotkb_ac = col.index('UniProtKB-AC')
+            geneid_col = col.index('GeneID (EntrezGene)')
+            ncbitaxon = col.index('NCBI-taxon')
+            ensembl_col = col.index('Ensembl')
+            tax_ids = set(tax_id.encode() for tax_id in self.tax_ids)
+            # rows of other taxa are passed over before they are split (or decoded)
+            taxon_pattern = re.compile(
+                b'\t(?:' + b'|'.join(re.escape(tax) for tax in tax_ids) + b')\t')
+
+            id_map = {}
             ummapped_uniprot = 0
-            with gzip.open(bigfile, 'rb') as csvfile:
-                csv.field_size_limit(sys.maxsize)
-                reader = csv.reader(  # warning this file is over 10GB unzipped
-                    io.TextIOWrapper(csvfile, newline=""),
-                    delimiter='\t', quotechar='\"')
-                for row in reader:
-                    uniprotkb_ac = row[col.index('UniProtKB-AC')].strip()
-                    # uniprotkb_id = row[col.index('UniProtKB-ID')]
-                    geneid = row[col.index('GeneID (EntrezGene)')].strip()
-                    # refseq = row[col.index('RefSeq')]
-                    # gi = row[col.index('GI')]
-                    # pdb = row[col.index('PDB')]
-                    # go = row[col.index('GO')]
-                    # uniref100 = row[col.index('UniRef100')]
-                    # unifref90 = row[col.index('UniRef90')]
-                    # uniref50 = row[col.index('UniRef50')]
-                    # uniparc = row[col.index('UniParc')]
-                    # pir = row[col.index('PIR')]
-                    ncbitaxon = row[col.index('NCBI-taxon')].strip()
-                    # mim = row[col.index('MIM')]
-                    # unigene = row[col.index('UniGene')]
-                    # pubmed = row[col.index('PubMed')]
-                    # embl = row[col.index('EMBL')]
-                    # embl_cds = row[col.index('EMBL-CDS')]
-                    ensembl = row[col.index('Ensembl')].strip()
-                    # ensembl_trs = row[col.index('Ensembl_TRS')]
-                    # ensembl_pro = row[col.index('Ensembl_PRO')]
-                    # other_pubmed = row[col.index('Additional PubMed')]
-
-                    if ncbitaxon not in self.tax_ids:
+            with GzipReader(bigfile, 'rb') as tabfile:  # this file is over 10GB unzipped
+                for line in tabfile:
+                    if taxon_pattern.search(line) is None:
+                        continue
+                    row = line.rstrip(b'\r\n').split(b'\t')
+                    if row[ncbitaxon].strip() not in tax_ids:
                         continue
 
+                    geneid = row[geneid_col].strip()
+                    ensembl = row[ensembl_col].strip()
                     # neither empty nor a list
-                    if geneid != '' and ';' not in geneid:
-                        id_map[uniprotkb_ac] = 'NCBIGene:' + geneid
-                    elif ensembl != '' and ';' not in ensembl:
-                        id_map[uniprotkb_ac] = 'ENSEMBL:' + ensembl
+                    if geneid != b'' and b';' not in geneid:
+                        gene_id = 'NCBIGene:' + geneid.decode()
+                    elif ensembl != b'' and b';' not in ensembl:
+                        gene_id = 'ENSEMBL:' + ensembl.decode()
                     else:
                         ummapped_uniprot += 1
+                        continue
+                    id_map[row[uniprotkb_ac].strip().decode()] = gene_id
 
             LOG.info("Writing id_map out as %s", smallfile)
-            with open(smallfile, 'w') as yamlwriter:
-                yaml.dump(id_map, yamlwriter)
+            IdMap.write(smallfile, id_map)
             LOG.warning('Did not find 1:1 gene IDs for %i uniprots', ummapped_uniprot)
-        LOG.info(
-            "Acquired %i 1:1 uniprot to [entrez|ensembl] mappings", len(id_map.keys()))
+            # those made from earlier idmapping files (for these taxa) are of no more use
+            for stale in glob.glob(
+                    '/'.join((self.rawdir, 'id_map_' + taxon_digest + '_*.idx'))):
+                if stale != smallfile:
+                    LOG.info("Removing %s", stale)
+                    os.remove(stale)
+
+        id_map = IdMap(smallfile)
+        LOG.info("Acquired %i 1:1 uniprot to [entrez|ensembl] mappings", len(id_map))
 
         return id_map
 
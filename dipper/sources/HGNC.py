@@ -7,6 +7,7 @@ from dipper.models.Genotype import Genotype
 from dipper.models.Model import Model
 from dipper.models.GenomicFeature import Feature, makeChromID
 from dipper.models.BiolinkVocabulary import BioLinkVocabulary as blv
+from dipper.utils.HGNCSymbols import HGNCSymbols, INDEX_FILE
 
 LOG = logging.getLogger(__name__)
 
@@ -148,9 +149,12 @@ class HGNC(OMIMSource):
         model = Model(graph)
 
         raw = '/'.join((self.rawdir, self.files[src_key]['file']))
-        col = self.files[src_key]['columns']
+        col = self.row_schema(self.files[src_key]['columns'])
         LOG.info("Processing HGNC genes")
 
+        # gene symbols for other ingests to resolve (see DipperUtil)
+        symbols = HGNCSymbols()
+
         chr_pattern = re.compile(r'(\d+|X|Y|Z|W|MT)[pq$]')
         band_pattern = re.compile(r'([pq][A-H\d]?\d?(?:\.\d+)?)')
 
@@ -175,9 +179,9 @@ class HGNC(OMIMSource):
                 # 41622 Approved  & 1752 Entry Withdrawn
                 location = row[col.index('location')].strip()
                 # location_sortable = row[col.index('location_sortable')]
-                # alias_symbol = row[col.index('alias_symbol')]
+                alias_symbol = row[col.index('alias_symbol')].strip('"')
                 # alias_name = row[col.index('alias_name')]
-                # prev_symbol = row[col.index('prev_symbol')]
+                prev_symbol = row[col.index('prev_symbol')].strip('"')
                 # prev_name = row[col.index('prev_name')]
                 # gene_family = row[col.index('gene_family')]
                 # gene_family_id = row[col.index('gene_family_id')]
@@ -223,6 +227,8 @@ class HGNC(OMIMSource):
                 if status != 'Approved':
                     self.withdrawn[hgnc_id] = symbol
                     continue
+                symbols.add(
+                    hgnc_id, symbol, prev_symbol.split('|'), alias_symbol.split('|'))
 
                 if (self.test_mode and entrez_id != '' and
                         entrez_id not in self.gene_ids):
@@ -303,6 +309,9 @@ class HGNC(OMIMSource):
                 if not self.test_mode and limit is not None and \
                         reader.line_num > limit:
                     break
+            else:
+                if not self.test_mode:
+                    symbols.write('/'.join((self.rawdir, INDEX_FILE)))
 
     def getTestSuite(self):
         import unittest
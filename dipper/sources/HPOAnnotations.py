@@ -184,7 +184,7 @@ class HPOAnnotations(Source):
         # TODO when #112 is implemented,
         # this will result in only the whole dataset being versioned
 
-        col = self.files[src_key]['columns']
+        col = self.row_schema(self.files[src_key]['columns'])
         with open(raw, 'r', encoding="utf8") as tsvfile:
             reader = csv.reader(tsvfile, delimiter='\t', quotechar='\"')
             row = next(reader)  # drop Description
@@ -448,7 +448,7 @@ class HPOAnnotations(Source):
 
         assoc_count = 0
         replace_id_flag = False
-        col = self.small_files['columns']
+        col = self.row_schema(self.small_files['columns'])
 
         with open(raw, 'r', encoding="utf8") as tsvfile:
             reader = csv.reader(tsvfile, delimiter='\t', quotechar='\"')
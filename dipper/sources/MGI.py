@@ -364,15 +364,15 @@ class MGI(PostgreSQLSource):
         # self.fetch_from_pgdb(self.tables, cxn, 100)  # for testing only
         # self.fetch_from_pgdb(self.tables, cxn, None, is_dl_forced)
 
+        queries = {}
         for query_map in self.resources['query_map']:
-            query_fh = open(os.path.join(
-                os.path.dirname(__file__), query_map['query']), 'r')
-            query = query_fh.read()
+            with open(os.path.join(
+                    os.path.dirname(__file__), query_map['query']), 'r') as query_fh:
+                queries[query_map['outfile']] = query_fh.read()
             # force = False
             # if 'Force' in query_map:   # unused
             #     force = query_map['Force']
-            self.fetch_query_from_pgdb(
-                query_map['outfile'], query, None, cxn)
+        self.fetch_queries_from_pgdb(queries, cxn, is_dl_forced=is_dl_forced)
         # always get this - it has the verion info
         self.fetch_transgene_genes_from_db(cxn)
 
@@ -512,7 +512,7 @@ SELECT  r._relationship_key as rel_key,
         geno = Genotype(graph)
         model = Model(graph)
 
-        col = self.tables[src_key]['columns']
+        col = self.row_schema(self.tables[src_key]['columns'])
         raw = '/'.join((self.rawdir, src_key))
         LOG.info("getting genotypes and their backgrounds")
         with open(raw, 'r') as reader:
@@ -612,7 +612,7 @@ SELECT  r._relationship_key as rel_key,
         geno_hash = {}
         raw = '/'.join((self.rawdir, src_key))
         LOG.info("building labels for genotypes")
-        col = self.tables[src_key]['columns']
+        col = self.row_schema(self.tables[src_key]['columns'])
         with open(raw, 'r') as reader:
             row = reader.readline().rstrip("\n").split('\t')
             if not self.check_fileheader(col, row, src_key):
@@ -686,7 +686,7 @@ SELECT  r._relationship_key as rel_key,
         model = Model(graph)
         line_num = 0
         raw = '/'.join((self.rawdir, src_key))
-        col = self.tables[src_key]['columns']
+        col = self.row_schema(self.tables[src_key]['columns'])
         col_len = len(col)
         LOG.info(
             "alleles with labels and descriptions from all_summary_view")
@@ -784,7 +784,7 @@ SELECT  r._relationship_key as rel_key,
             "adding alleles, mapping to markers, extracting their "
             "sequence alterations from all_allele_view")
         raw = '/'.join((self.rawdir, src_key))
-        col = self.tables[src_key]['columns']
+        col = self.row_schema(self.tables[src_key]['columns'])
         col_len = len(col)
         with open(raw, 'r') as reader:
             row = reader.readline().rstrip("\n").split('\t')
@@ -937,7 +937,7 @@ SELECT  r._relationship_key as rel_key,
         geno = Genotype(graph)
         line_num = 0
         raw = '/'.join((self.rawdir, src_key))
-        col = self.tables[src_key]['columns']
+        col = self.row_schema(self.tables[src_key]['columns'])
         LOG.info("processing allele pairs (VSLCs) for genotypes")
         geno_hash = {}
         with open(raw, 'r') as reader:
@@ -1106,7 +1106,7 @@ SELECT  r._relationship_key as rel_key,
         model = Model(graph)
         line_num = 0
         raw = '/'.join((self.rawdir, src_key))
-        col = self.tables[src_key]['columns']
+        col = self.row_schema(self.tables[src_key]['columns'])
         LOG.info("getting mutation types for sequence alterations")
         with open(raw, 'r') as reader:
             row = reader.readline().rstrip("\n").split('\t')
@@ -1180,7 +1180,7 @@ SELECT  r._relationship_key as rel_key,
         line_num = 0
         LOG.info("getting G2P associations")
         raw = '/'.join((self.rawdir, src_key))
-        col = self.tables[src_key]['columns']
+        col = self.row_schema(self.tables[src_key]['columns'])
         with open(raw, 'r') as reader:
             row = reader.readline().rstrip('\n').split('\t')
             if not self.check_fileheader(col, row, src_key):
@@ -1312,7 +1312,7 @@ SELECT  r._relationship_key as rel_key,
         line_num = 0
         LOG.info("getting evidence and pubs for annotations")
         raw = '/'.join((self.rawdir, src_key))
-        col = self.tables[src_key]['columns']
+        col = self.row_schema(self.tables[src_key]['columns'])
 
         with open(raw, 'r') as reader:
             line = reader.readline()
@@ -1388,7 +1388,7 @@ SELECT  r._relationship_key as rel_key,
 
         LOG.info('populating pub id hash')
         raw = '/'.join((self.rawdir, src_key))
-        col = self.tables[src_key]['columns']
+        col = self.row_schema(self.tables[src_key]['columns'])
 
         with open(raw, 'r', encoding="utf8") as csvfile:
             filereader = csv.reader(csvfile, delimiter='\t', quotechar='\"')
@@ -1503,7 +1503,7 @@ SELECT  r._relationship_key as rel_key,
         model = Model(graph)
         geno = Genotype(graph)
         raw = '/'.join((self.rawdir, src_key))
-        col = self.tables[src_key]['columns']
+        col = self.row_schema(self.tables[src_key]['columns'])
         LOG.info("getting strains and adding their taxa")
         with open(raw, 'r', encoding="utf8") as csvfile:
             reader = csv.reader(csvfile, delimiter='\t', quotechar='\"')
@@ -1573,7 +1573,7 @@ SELECT  r._relationship_key as rel_key,
         geno = Genotype(graph)
         line_num = 0
         raw = '/'.join((self.rawdir, src_key))
-        col = self.tables[src_key]['columns']
+        col = self.row_schema(self.tables[src_key]['columns'])
         LOG.info("getting markers and assigning types")
         with open(raw, 'r') as reader:
             row = reader.readline().rstrip("\n").split('\t')
@@ -1671,7 +1671,7 @@ SELECT  r._relationship_key as rel_key,
         LOG.info("getting markers and equivalent ids from mrk_summary_view")
         line_num = 0
         raw = '/'.join((self.rawdir, src_key))
-        col = self.tables[src_key]['columns']
+        col = self.row_schema(self.tables[src_key]['columns'])
         with open(raw, 'r') as reader:
             row = reader.readline().rstrip("\n").split('\t')
             if not self.check_fileheader(col, row, src_key):
@@ -1744,7 +1744,7 @@ SELECT  r._relationship_key as rel_key,
         line_num = 0
         LOG.info("mapping markers to internal identifiers")
         raw = '/'.join((self.rawdir, src_key))
-        col = self.tables[src_key]['columns']
+        col = self.row_schema(self.tables[src_key]['columns'])
         with open(raw, 'r') as reader:
             row = reader.readline().rstrip("\n").split('\t')
             if not self.check_fileheader(col, row, src_key):
@@ -1791,7 +1791,7 @@ SELECT  r._relationship_key as rel_key,
         # if nothing, then we should remove one or the other.
         LOG.info("mapping marker equivalent identifiers in mrk_acc_view")
         line_num = 0
-        col = self.tables[src_key]['columns']
+        col = self.row_schema(self.tables[src_key]['columns'])
         with open('/'.join((self.rawdir, src_key)), 'r') as reader:
             row = reader.readline().rstrip("\n").split('\t')
             if not self.check_fileheader(col, row, src_key):
@@ -1871,7 +1871,7 @@ SELECT  r._relationship_key as rel_key,
         model = Model(graph)
         LOG.info("mapping strains to internal identifiers")
         raw = '/'.join((self.rawdir, src_key))
-        col = self.tables[src_key]['columns']
+        col = self.row_schema(self.tables[src_key]['columns'])
         tax_id = self.globaltt["Mus musculus"]
 
         with open(raw, 'r') as reader:
@@ -2039,7 +2039,7 @@ SELECT  r._relationship_key as rel_key,
         model = Model(graph)
         LOG.info("getting free text descriptions for annotations")
         raw = '/'.join((self.rawdir, src_key))
-        col = self.tables[src_key]['columns']
+        col = self.row_schema(self.tables[src_key]['columns'])
         with open(raw, 'r', encoding="utf8") as csvfile:
             reader = csv.reader(csvfile, delimiter='\t', quotechar='\"')
             row = next(reader)
@@ -2073,7 +2073,7 @@ SELECT  r._relationship_key as rel_key,
         LOG.info("getting marker locations")
         raw = '/'.join((self.rawdir, src_key))
         geno = Genotype(graph)
-        col = self.tables[src_key]['columns']
+        col = self.row_schema(self.tables[src_key]['columns'])
         with open(raw, 'r', encoding="utf8") as csvfile:
             reader = csv.reader(csvfile, delimiter='\t', quotechar='\"')
             row = next(reader)
@@ -2157,7 +2157,7 @@ SELECT  r._relationship_key as rel_key,
         LOG.info("getting transgene genes")
         raw = '/'.join((self.rawdir, src_key))
         geno = Genotype(graph)
-        col = self.tables[src_key]['columns']
+        col = self.row_schema(self.tables[src_key]['columns'])
 
         with open(raw, 'r', encoding="utf8") as csvfile:
             reader = csv.reader(csvfile, delimiter='\t', quotechar='\"')
@@ -2209,7 +2209,7 @@ SELECT  r._relationship_key as rel_key,
         model = Model(graph)
         LOG.info("Assembling notes on alleles")
         raw = '/'.join((self.rawdir, src_key))
-        col = self.tables[src_key]['columns']
+        col = self.row_schema(self.tables[src_key]['columns'])
         notehash = {}
         with open(raw, 'r', encoding="utf8") as csvfile:
             reader = csv.reader(csvfile, delimiter='\t', quotechar='\"')
@@ -2274,7 +2274,7 @@ SELECT  r._relationship_key as rel_key,
             graph = self.graph
         LOG.info("Getting genotypes for strains")
         raw = '/'.join((self.rawdir, src_key))
-        col = self.tables[src_key]['columns']
+        col = self.row_schema(self.tables[src_key]['columns'])
         with open(raw, 'r', encoding="utf8") as csvfile:
             reader = csv.reader(csvfile, delimiter='\t', quotechar='\"')
             row = next(reader)
@@ -146,7 +146,7 @@ class MMRRC(Source):
             # First line is header not date/version info. This changed recently,
             # apparently as of Sep 2019. Also, 3rd line is no longer blank.
             row = [x.strip() for x in next(reader)]  # messy messy
-            col = self.files['catalog']['columns']
+            col = self.row_schema(self.files['catalog']['columns'])
             strain_missing_allele = []  # to count the ones w/insufficent info
             if not self.check_fileheader(col, row):
                 pass
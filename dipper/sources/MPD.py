@@ -188,7 +188,7 @@ class MPD(Source):
         src_key = 'ontology_mappings'
         raw = '/'.join((self.rawdir, self.files[src_key]['file']))
         LOG.info("Processing ontology mappings from file %s", raw)
-        col = self.files[src_key]['columns']
+        col = self.row_schema(self.files[src_key]['columns'])
 
         with open(raw, 'r') as csvfile:
             reader = csv.reader(csvfile)
@@ -221,7 +221,7 @@ class MPD(Source):
             graph = self.graph
         model = Model(graph)
         tax_id = self.globaltt['Mus musculus']
-        col = self.files[src_key]['columns']
+        col = self.row_schema(self.files[src_key]['columns'])
 
         with open(raw, 'r') as csvfile:
             reader = csv.reader(csvfile, delimiter=',', quotechar='\"')
@@ -282,7 +282,7 @@ class MPD(Source):
         src_key = 'assay_metadata'
         raw = '/'.join((self.rawdir, self.files[src_key]['file']))
         LOG.info("Processing measurements from file: %s", raw)
-        col = self.files[src_key]['columns']
+        col = self.row_schema(self.files[src_key]['columns'])
 
         with open(raw, 'r') as csvfile:
             reader = csv.reader(csvfile)
@@ -337,7 +337,7 @@ class MPD(Source):
         src_key = 'strainmeans'
         raw = '/'.join((self.rawdir, self.files[src_key]['file']))
         LOG.info("Processing strain means from file: %s", raw)
-        col = self.files[src_key]['columns']
+        col = self.row_schema(self.files[src_key]['columns'])
 
         with gzip.open(raw, 'rb') as gzfile:
             csvfile = io.TextIOWrapper(gzfile)
@@ -111,7 +111,7 @@ class Monarch(Source):
             f for f in listdir(mypath)
             if isfile(join(mypath, f)) and re.search(r'.txt$', f)]
 
-        col = self.files[src_key]['columns']
+        col = self.row_schema(self.files[src_key]['columns'])
         # reusable initial code generator
         # for c in col:
         #   print(
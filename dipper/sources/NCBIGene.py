@@ -1,5 +1,4 @@
 import re
-import gzip
 import logging
 
 from dipper.sources.OMIMSource import OMIMSource
@@ -9,6 +8,7 @@ from dipper.models.Genotype import Genotype
 from dipper.models.GenomicFeature import Feature, makeChromID, makeChromLabel
 from dipper.models.Reference import Reference
 from dipper.models.BiolinkVocabulary import BioLinkVocabulary as blv
+from dipper.utils.GzipReader import GzipReader
 
 LOG = logging.getLogger(__name__)
 
@@ -217,14 +217,18 @@ class NCBIGene(OMIMSource):
             # label added elsewhere
             model.addClassToGraph(tax_curie, None)
 
-        col = self.files[src_key]['columns']
         LOG.info('Begin reading & parsing')
 
-        with gzip.open(gene_info, 'rb') as tsv:
+        with GzipReader(gene_info, 'rb') as tsv:
             row = tsv.readline().decode().strip().split('\t')
             row[0] = row[0][1:]  # strip comment char
-            if not self.check_fileheader(col, row):
-                pass
+            col = self.row_schema(self.files[src_key]['columns'], row, src_key)
+            # not wanted: LocusTag, Symbol_from_nomenclature_authority,
+            # Nomenclature_status, Modification_date, Feature_type
+            fields = col.getter(
+                'tax_id', 'GeneID', 'Symbol', 'Synonyms', 'dbXrefs', 'chromosome',
+                'map_location', 'description', 'type_of_gene',
+                'Full_name_from_nomenclature_authority', 'Other_designations')
 
             for line in tsv:
                 line = line.strip()
@@ -242,22 +246,14 @@ class NCBIGene(OMIMSource):
                 #         continue
                 # #### end filter
 
-                tax_num = row[col.index('tax_id')]
-                gene_num = row[col.index('GeneID')]
-                symbol = row[col.index('Symbol')]
-                # = row[col.index('LocusTag')]
-                synonyms = row[col.index('Synonyms')].strip()
-                dbxrefs = row[col.index('dbXrefs')].strip()
-                chrom = row[col.index('chromosome')].strip()
-                map_loc = row[col.index('map_location')].strip()
-                desc = row[col.index('description')]
-                gtype = row[col.index('type_of_gene')].strip()
-                # = row[col.index('Symbol_from_nomenclature_authority')]
-                name = row[col.index('Full_name_from_nomenclature_authority')]
-                # = row[col.index('Nomenclature_status')]
-                other_designations = row[col.index('Other_designations')].strip()
-                # = row[col.index('Modification_date')}
-                # = row[col.index('Feature_type')]
+                (tax_num, gene_num, symbol, synonyms, dbxrefs, chrom, map_loc, desc,
+                 gtype, name, other_designations) = fields(row)
+                synonyms = synonyms.strip()
+                dbxrefs = dbxrefs.strip()
+                chrom = chrom.strip()
+                map_loc = map_loc.strip()
+                gtype = gtype.strip()
+                other_designations = other_designations.strip()
 
                 if self.test_mode and int(gene_num) not in self.gene_ids:
                     continue
@@ -511,12 +507,12 @@ class NCBIGene(OMIMSource):
         line_counter = 0
         myfile = '/'.join((self.rawdir, self.files[src_key]['file']))
         LOG.info("FILE: %s", myfile)
-        col = self.files[src_key]['columns']
-        with gzip.open(myfile, 'rb') as tsv:
+        with GzipReader(myfile, 'rb') as tsv:
             row = tsv.readline().decode().strip().split('\t')
             row[0] = row[0][1:]  # strip comment
-            if not self.check_fileheader(col, row):
-                pass
+            col = self.row_schema(self.files[src_key]['columns'], row, src_key)
+            fields = col.getter(
+                'tax_id', 'GeneID', 'Discontinued_GeneID', 'Discontinued_Symbol')
 
             for line in tsv:
                 # skip comments
@@ -524,11 +520,9 @@ class NCBIGene(OMIMSource):
                 if row[0][0] == '#':
                     continue
 
-                tax_num = row[col.index('tax_id')].strip()
-                gene_num = row[col.index('GeneID')].strip()
-                discontinued_num = row[col.index('Discontinued_GeneID')].strip()
-                discontinued_symbol = row[col.index('Discontinued_Symbol')].strip()
-                # discontinued_date = row[col.index('Discontinue_Date')]
+                (tax_num, gene_num, discontinued_num, discontinued_symbol) = [
+                    field.strip() for field in fields(row)]
+                # (not wanted: Discontinue_Date)
 
                 # set filter=None in init if you don't want to have a filter
                 # if self.id_filter is not None:
@@ -608,12 +602,11 @@ class NCBIGene(OMIMSource):
         myfile = '/'.join((self.rawdir, self.files[src_key]['file']))
         LOG.info("FILE: %s", myfile)
         assoc_counter = 0
-        col = self.files[src_key]['columns']
-        with gzip.open(myfile, 'rb') as tsv:
+        with GzipReader(myfile, 'rb') as tsv:
             row = tsv.readline().decode().strip().split('\t')
             row[0] = row[0][1:]  # strip comment
-            if not self.check_fileheader(col, row):
-                pass
+            col = self.row_schema(self.files[src_key]['columns'], row, src_key)
+            fields = col.getter('tax_id', 'GeneID', 'PubMed_ID')
 
             for line in tsv:
                 line_counter += 1
@@ -621,9 +614,7 @@ class NCBIGene(OMIMSource):
                 row = line.decode().strip().split('\t')
                 if row[0][0] == '#':
                     continue
-                tax_num = row[col.index('tax_id')].strip()
-                gene_num = row[col.index('GeneID')].strip()
-                pubmed_num = row[col.index('PubMed_ID')].strip()
+                (tax_num, gene_num, pubmed_num) = [field.strip() for field in fields(row)]
 
                 # ## set id_filter=None in init if you don't want to have a filter
                 # if self.id_filter is not None:
@@ -709,20 +700,18 @@ class NCBIGene(OMIMSource):
         group_to_orthology = {}
         gene_to_group = {}
         gene_to_taxon = {}
-        col = self.files[src_key]['columns']
 
-        with gzip.open(src_file, 'rb') as tsv:
+        with GzipReader(src_file, 'rb') as tsv:
             row = tsv.readline().decode().strip().split('\t')
             row[0] = row[0][1:]  # strip octothorp
-            if not self.check_fileheader(col, row):
-                pass
+            col = self.row_schema(self.files[src_key]['columns'], row, src_key)
+            fields = col.getter(
+                'tax_id', 'GeneID', 'relationship', 'Other_tax_id', 'Other_GeneID')
             for row in tsv:
                 row = row.decode().strip().split('\t')
-                tax_a = row[col.index('tax_id')]
-                gene_a = row[col.index('GeneID')].strip()
-                rel = row[col.index('relationship')]
-                tax_b = row[col.index('Other_tax_id')]
-                gene_b = row[col.index('Other_GeneID')].strip()
+                (tax_a, gene_a, rel, tax_b, gene_b) = fields(row)
+                gene_a = gene_a.strip()
+                gene_b = gene_b.strip()
 
                 if rel != 'Ortholog':
                     continue
@@ -1,10 +1,13 @@
+import os
 import logging
 import re
 import json
 import urllib
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from urllib.error import HTTPError
-from datetime import date, datetime, timedelta
+from datetime import timedelta
 
 from dipper.sources.OMIMSource import OMIMSource
 from dipper.sources.Source import USER_AGENT
@@ -16,6 +19,7 @@ from dipper.models.GenomicFeature import Feature, makeChromID
 from dipper.models.Reference import Reference
 from dipper import config
 from dipper.utils.romanplus import romanNumeralPattern, fromRoman, toRoman
+from dipper.utils.TokenBucket import TokenBucket
 
 LOG = logging.getLogger(__name__)
 
@@ -26,6 +30,9 @@ OMIMURL = 'https://data.omim.org/downloads/'
 OMIMFTP = OMIMURL + config.get_config()['keys']['omim']
 OMIMAPI = 'https://api.omim.org/api/entry?format=json&apiKey=' + \
     config.get_config()['keys']['omim'] + '&'
+OMIMSEARCH = 'https://api.omim.org/api/entry/search?format=json&apiKey=' + \
+    config.get_config()['keys']['omim'] + '&'
+UPDATES_PAGE = 100  # entries per page when listing recent updates
 
 
 class OMIM(OMIMSource):
@@ -55,6 +62,12 @@ class OMIM(OMIMSource):
 
     """
 
+    API_RATE = 2        # requests per second to the api, on average
+    API_BURST = 2       # requests which may go at once after a quiet spell
+    API_INFLIGHT = 4    # requests waiting on the api at any one time
+    UPDATES_MAX = 2000  # most recently updated entries looked through per run
+    ENTRY_MAX_AGE = timedelta(days=90)  # entries on hand are requested again after
+
     files = {
         'morbidmap': {
             'file': 'morbidmap.txt',
@@ -157,19 +170,27 @@ class OMIM(OMIMSource):
         the basic entry from omim, that is ALL fields,
         which includes an entry's:  prefix, mimNumber, status, and titles.
 
+        Each entry's json is kept in raw/omim/entries*/<mimNumber>.json;
+        only entries not on hand, updated at OMIM since (see _stale_entries)
+        or older than ENTRY_MAX_AGE are requested again.
+        Requests of (up to) 20 entries go API_INFLIGHT at a time,
+        no faster than API_RATE per second.
+        The entries are then transformed one at a time, from their files.
+
         :param omimids: the set of omim entry ids to fetch using their API
         :param transform: Function to transform each omim entry when looping
         :param included_fields: A set of what fields are required to retrieve
          from the API
         :param graph: the graph to add the transformed data into
+        :param limit: int, fetch & transform only the first this many entries
+         (unless in test mode)
         """
 
         omimparams = {}
-        reponse_batches = []
 
         # add the included_fields as parameters
         if included_fields is not None and included_fields:
-            omimparams['include'] = ','.join(included_fields)
+            omimparams['include'] = ','.join(sorted(included_fields))
 
         # not expecting any, but keeping just in case
         cleanomimids = [o.split(':')[-1] for o in omimids]
@@ -179,92 +200,147 @@ class OMIM(OMIMSource):
             omimids = cleanomimids
         cleanomimids = []
 
-        # WIP: check if we can use a cached copy of the json records
-        # maybe if exists raw/omim/_<iso-date>.json use that
-
-        # in the meanwhile, to bypass (in case of emergencies)
-        # cache_date = '2019-06-27'
-        # with open('raw/omim/_' + cache_date + '.json', 'r') as cachefile:
-        #    reponse_batches = json.load(cachefile)
-        if True:  # False:
+        if self.test_mode:
+            test_ids = set(str(i) for i in self.test_ids)
+            omimids = [omimid for omimid in omimids if omimid in test_ids]
+            LOG.info("found test ids: %s", omimids)
+        elif limit is not None:
+            omimids = list(omimids)[:limit]
+
+        # entries with different fields included are kept apart
+        entrydir = '/'.join((self.rawdir, '_'.join(
+            ['entries'] + sorted(included_fields or ()))))
+        os.makedirs(entrydir, exist_ok=True)
+
+        bucket = TokenBucket(self.API_RATE, self.API_BURST)
+        stale = self._stale_entries(omimids, entrydir, bucket)
+        LOG.info(
+            "Requesting %i of %i omim entries, the rest are on hand",
+            len(stale), len(omimids))
+        self._fetch_entries(stale, omimparams, entrydir, bucket)
+
+        LOG.info("begin transforming the %i records", len(omimids))
+        for omimid in omimids:
+            entry = self._read_entry(entrydir, omimid)
+            if entry is None:
+                LOG.warning("No entry for OMIM:%s", omimid)
+                continue
+            # apply the data transformation, and save it to the graph
+            transform(entry, graph)
 
-            acc = 0  # for counting
+    @staticmethod
+    def _entry_path(entrydir, omimid):
+        return '/'.join((entrydir, str(omimid) + '.json'))
 
-            # note that you can only do request batches of 20
-            # see info about "Limits" at http://omim.org/help/api
-            # TODO 2017 May seems a majority of many groups of 20
-            # are producing python None for RDF triple Objects
+    def _read_entry(self, entrydir, omimid):
+        """
+        :return: the cached entry (as in the api's entryList) or None
+        """
+        path = self._entry_path(entrydir, omimid)
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r') as reader:
+            return json.load(reader)
 
-            groupsize = 20
-            if not self.test_mode and limit is not None:
-                # just in case the limit is larger than the number of records,
-                maxit = limit
-                if limit > len(omimids):
-                    maxit = len(omimids)
+    def _stale_entries(self, omimids, entrydir, bucket):
+        """
+        The omim ids whose entries must be requested: those not on hand,
+        older than ENTRY_MAX_AGE, or updated at OMIM since they were fetched.
+
+        Updates are found by paging through the api's search results,
+        most recently updated first, comparing each entry's dateUpdated
+        with the copy on hand, until a page holds nothing new.
+        If that fails, only ENTRY_MAX_AGE brings changes in.
+        :return: list of omim ids, in the order given
+        """
+        oldest = time.time() - self.ENTRY_MAX_AGE.total_seconds()
+        stale = set()
+        on_hand = 0
+        for omimid in omimids:
+            path = self._entry_path(entrydir, omimid)
+            if not os.path.exists(path) or os.path.getmtime(path) < oldest:
+                stale.add(omimid)
             else:
-                maxit = len(omimids)
-
-            then = datetime.now()
-            while acc < maxit:
-                end = min((maxit, acc + groupsize))
-                # iterate through the omim ids list,
-                # and fetch from the OMIM api in batches of 20
-
-                if self.test_mode:
-                    intersect = list(
-                        set([str(i) for i in self.test_ids]) & set(omimids[acc:end]))
-                    # some of the test ids are in the omimids
-                    if intersect:
-                        LOG.info("found test ids: %s", intersect)
-                        omimparams.update({'mimNumber': ','.join(intersect)})
-                    else:
-                        acc += groupsize
-                        continue
-                else:
-                    omimparams.update({'mimNumber': ','.join(omimids[acc:end])})
-
-                url = OMIMAPI + urllib.parse.urlencode(omimparams)
-
-                # slow down api calls
-                then += timedelta(seconds=4)
-                pause = then - datetime.now()
-                LOG.info("Naptime! %i", pause.seconds)
-                time.sleep(pause.seconds if pause.seconds > 0 else 0)
-                then = datetime.now()
-
-                try:
-                    req = urllib.request.urlopen(url)
-                except HTTPError as err:  # URLError?
-                    LOG.warning('fetching: %s', url)
-                    error_msg = err.read()
-                    if re.search(r'The API key: .* is invalid', str(error_msg)):
-                        msg = "API Key not valid"
-                        raise HTTPError(url, err.code, msg, err.hdrs, err.fp)
-                    LOG.error("Failed with: %s", str(error_msg))
-                    # dump what we have to see how far we got.
-                    with open(
-                            './raw/omim/_' + date.today().isoformat() + '.json_partial',
-                            'w') as writer:
-                        json.dump(reponse_batches, writer)
-                    break
-
-                resp = req.read().decode()
-                acc += groupsize
-                # gather all batches
-                reponse_batches.append(json.loads(resp))
-
-            # snag a copy of all the batches
-
-            with open(
-                    './raw/omim/_' + date.today().isoformat() + '.json', 'w') as writer:
-                json.dump(reponse_batches, writer)
-
-        LOG.info(
-            "begin transforming the %i blocks of (20) records", len(reponse_batches))
-        for myjson in reponse_batches:
-            for entery in myjson['omim']['entryList']:
-                # apply the data transformation, and save it to the graph
-                transform(entery, graph)
+                on_hand += 1
+
+        if on_hand > 0:
+            wanted = set(omimids)
+            start = 0
+            try:
+                while start < self.UPDATES_MAX:
+                    bucket.take()
+                    url = OMIMSEARCH + urllib.parse.urlencode({
+                        'search': '*', 'sort': 'date_updated desc',
+                        'start': start, 'limit': UPDATES_PAGE})
+                    with urllib.request.urlopen(url) as response:
+                        found = json.loads(response.read().decode())
+                    page = [
+                        item['entry'] for item in
+                        found['omim']['searchResponse']['entryList']]
+                    if not page:
+                        break
+                    changed = 0
+                    for entry in page:
+                        omimid = str(entry['mimNumber'])
+                        cached = self._read_entry(entrydir, omimid)
+                        if cached is not None and cached['entry'].get(
+                                'dateUpdated') != entry['dateUpdated']:
+                            changed += 1
+                            if omimid in wanted:
+                                stale.add(omimid)
+                    if changed == 0:
+                        break
+                    start += len(page)
+            except (HTTPError, urllib.error.URLError, KeyError, ValueError) as err:
+                LOG.warning(
+                    "Could not list recently updated omim entries (%r), "
+                    "entries on hand are used until %s old",
+                    err, self.ENTRY_MAX_AGE)
+
+        return [omimid for omimid in omimids if omimid in stale]
+
+    def _fetch_entries(self, omimids, omimparams, entrydir, bucket):
+        """
+        Request entries from the api in batches of 20 (its limit), writing each
+        to its own file in entrydir.  After a failure (other than a bad api key,
+        which is raised) no more batches are requested.
+        """
+        groupsize = 20
+        batches = [
+            omimids[acc:acc + groupsize] for acc in range(0, len(omimids), groupsize)]
+        failed = threading.Event()
+
+        def fetch_batch(batch):
+            if failed.is_set():
+                return 0
+            params = dict(omimparams)
+            params['mimNumber'] = ','.join(batch)
+            url = OMIMAPI + urllib.parse.urlencode(params)
+            bucket.take()
+            try:
+                with urllib.request.urlopen(url) as req:
+                    resp = req.read().decode()
+            except HTTPError as err:  # URLError?
+                LOG.warning('fetching: %s', url)
+                error_msg = err.read()
+                if re.search(r'The API key: .* is invalid', str(error_msg)):
+                    msg = "API Key not valid"
+                    raise HTTPError(url, err.code, msg, err.hdrs, err.fp)
+                LOG.error("Failed with: %s", str(error_msg))
+                failed.set()
+                return 0
+
+            entries = json.loads(resp)['omim']['entryList']
+            for entry in entries:
+                path = self._entry_path(entrydir, entry['entry']['mimNumber'])
+                with open(path + '.tmp', 'w') as writer:
+                    json.dump(entry, writer)
+                os.replace(path + '.tmp', path)
+            return len(entries)
+
+        with ThreadPoolExecutor(max_workers=self.API_INFLIGHT) as pool:
+            fetched = sum(pool.map(fetch_batch, batches))
+        LOG.info("Fetched %i omim entries in %i requests", fetched, len(batches))
 
     def _process_all(self, limit):
         """
@@ -533,7 +609,7 @@ class OMIM(OMIMSource):
         line_counter = 0
         assoc_count = 0
         src_key = 'morbidmap'
-        col = self.files[src_key]['columns']
+        col = self.row_schema(self.files[src_key]['columns'])
         raw = '/'.join((self.rawdir, self.files[src_key]['file']))
         with open(raw) as reader:
             line = reader.readline()  # Copyright
@@ -882,7 +958,7 @@ class OMIM(OMIMSource):
         model = Model(graph)
         line_counter = 0
         src_key = 'phenotypicSeries'
-        col = self.files[src_key]['columns']
+        col = self.row_schema(self.files[src_key]['columns'])
         raw = '/'.join((self.rawdir, self.files[src_key]['file']))
         with open(raw) as reader:
             line = reader.readline()  # title
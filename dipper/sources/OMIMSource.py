@@ -175,7 +175,7 @@ class OMIMSource(Source):
 
         myfile = '/'.join((self.rawdir, self.mimfiles[src_key]['file']))
 
-        col = self.mimfiles[src_key]['columns']
+        col = self.row_schema(self.mimfiles[src_key]['columns'])
         with open(myfile, 'r') as readfile:
             reader = csv.reader(readfile, delimiter='\t')
             row = next(reader)  # copyright
@@ -175,7 +175,9 @@ class Panther(Source):
 
         src_file = '/'.join((self.rawdir, self.files[src_key]['file']))
         matchcounter = line_counter = 0
-        col = self.files[src_key]['columns']
+        col = self.row_schema(self.files[src_key]['columns'])
+        # ancestor_taxons ('Common ancestor for the orthologs') is unused
+        fields = col.getter('Gene', 'Ortholog', 'Type of ortholog', 'Panther Ortholog ID')
         reader = tarfile.open(src_file, 'r:gz')
 
         LOG.info("Parsing %s", src_key)
@@ -193,13 +195,8 @@ class Panther(Source):
                 #       	LDO	Euarchontoglires	PTHR15964
 
                 row = line.decode().split('\t')
-                thing1 = row[col.index('Gene')].strip()
-                thing2 = row[col.index('Ortholog')].strip()
-                orthology_type = row[col.index('Type of ortholog')].strip()
-                # ancestor_taxons  = row[
-                #    col.index('Common ancestor for the orthologs')].strip()
-                panther_id = row[
-                    col.index('Panther Ortholog ID')].strip()
+                (thing1, thing2, orthology_type, panther_id) = [
+                    field.strip() for field in fields(row)]
 
                 (species_a, gene_a, protein_a) = thing1.split('|')
                 (species_b, gene_b, protein_b) = thing2.split('|')
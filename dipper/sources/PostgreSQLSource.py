@@ -1,10 +1,56 @@
 
+import os
+import gzip
+import time
+import hashlib
 import logging
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 import psycopg2
+import psycopg2.pool
 from dipper.sources.Source import Source
+from dipper.utils.FileManifest import FileManifest
 
 LOG = logging.getLogger(__name__)
 
+# a query result's row count and an order independent sum of (60 bits of)
+# its rows' md5s; computed by the server, so no rows cross the network.
+# It is not cheap: the server runs the whole query and casts & hashes every row,
+# about the work of the COPY itself, so a changed result costs both.
+# It pays where results mostly do not change between runs, saving the COPY
+# and the transfer; a count or max key would be cheaper but misses rows
+# updated in place, and MGI's queries (joins over views) have no one key.
+FINGERPRINT = """
+SELECT COUNT(*),
+    SUM(('x' || SUBSTR(MD5(x::text), 1, 15))::bit(60)::bigint::numeric)
+FROM ({}) x"""
+
+
+class CopyOutput:
+    """
+    Write-only file for cursor.copy_expert(), optionally gzipped,
+    counting lines as they pass (rather than re-reading the file after)
+    """
+
+    def __init__(self, path, compress=False):
+        if compress:
+            self.out = gzip.open(path, 'wb', compresslevel=6)
+        else:
+            self.out = open(path, 'wb')
+        self.lines = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.out.close()
+
+    def write(self, data):
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        self.lines += data.count(b'\n')
+        return self.out.write(data)
+
 
 class PostgreSQLSource(Source):
     """
@@ -12,6 +58,7 @@ class PostgreSQLSource(Source):
     """
 
     files = {}
+    PG_WORKERS = 4  # queries fetched at once, each over its own connection
 
     def __init__(
             self,
@@ -46,7 +93,7 @@ class PostgreSQLSource(Source):
         # globaltcid = self.globaltcid
         # all_test_ids = self.all_test_ids
 
-    def fetch_from_pgdb(self, tables, cxn, limit=None):
+    def fetch_from_pgdb(self, tables, cxn, limit=None, is_dl_forced=False):
         """
         Will fetch all Postgres tables from the specified database
             in the cxn connection parameters.
@@ -55,53 +102,54 @@ class PostgreSQLSource(Source):
         :param tables: Names of tables to fetch
         :param cxn: database connection details
         :param limit: A max row count to fetch for each table
+        :param is_dl_forced: boolean, fetch even unchanged tables
         :return: None
         """
+        self.fetch_queries_from_pgdb(
+            {tab: ' '.join(("SELECT * FROM", tab)) for tab in tables}, cxn, limit,
+            is_dl_forced=is_dl_forced)
 
-        con = None
-        try:
-            con = psycopg2.connect(
-                host=cxn['host'], database=cxn['database'], port=cxn['port'],
-                user=cxn['user'], password=cxn['password'])
-            cur = con.cursor()
-            for tab in tables:
-                LOG.info("Fetching data from table %s", tab)
-                self._getcols(cur, tab)
-                query = ' '.join(("SELECT * FROM", tab))
-                countquery = ' '.join(("SELECT COUNT(*) FROM", tab))
-                if limit is not None:
-                    query = ' '.join((query, "LIMIT", str(limit)))
-                    countquery = ' '.join((countquery, "LIMIT", str(limit)))
-
-                cur.execute(countquery)
-                tablerowcount = cur.fetchone()[0]
-
-                outfile = '/'.join((self.rawdir, tab))
-
-                # download the file
-                LOG.info("COMMAND:%s", query)
-                outputquery = "COPY ({0}) TO STDOUT WITH DELIMITER AS '\t' CSV HEADER"\
-                              .format(query)
-                with open(outfile, 'w') as tsvfile:
-                    cur.copy_expert(outputquery, tsvfile)
-
-                filerowcount = self.file_len(outfile)
-
-                if (filerowcount - 1) < tablerowcount:
-                    raise Exception(
-                        "Download from {} failed, {} != {}"
-                        .format(cxn['host'] + ':' + cxn['database'],
-                                (filerowcount - 1), tablerowcount))
-                if (filerowcount - 1) > tablerowcount:
-                    LOG.warning(
-                        "Fetched from %s more rows in file (%s) than reported "
-                        "in count(%s)",
-                        cxn['host'] + ':' + cxn['database'],
-                        (filerowcount - 1), tablerowcount)
+    def fetch_queries_from_pgdb(
+            self, queries, cxn, limit=None, compress=False, is_dl_forced=False):
+        """
+        Save the results of several queries at once, each over its own
+        connection from a pool of (up to) PG_WORKERS, to local files named
+        for the query, in tab-delimited format, including a header.
+        Rows are counted as they stream to disk and checked against
+        the count the server reports.
 
+        Each file's FINGERPRINT is kept in the raw directory's FileManifest;
+        a query whose result has the same fingerprint as the file on hand
+        is not fetched again (unless forced, or limited).
+        :param queries: dict of output file name -> SQL query
+        :param cxn: database connection details
+        :param limit: A max row count to fetch for each query
+        :param compress: boolean, gzip the files (adding '.gz' to their names)
+        :param is_dl_forced: boolean, fetch even unchanged results
+        :return: dict of output file name -> int rows fetched (or on hand)
+        """
+        workers = max(1, min(self.PG_WORKERS, len(queries)))
+        pool = self._connection_pool(cxn, workers)
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                exports = {
+                    qname: executor.submit(
+                        self._pooled_copy, pool, cxn, qname, query, limit,
+                        compress, is_dl_forced)
+                    for qname, query in queries.items()}
+                fetched = {
+                    qname: export.result() for qname, export in exports.items()}
         finally:
-            if con:
-                con.close()
+            pool.closeall()
+
+        unchanged = [entry for _, entry in fetched.values() if entry is not None]
+        if unchanged:
+            LOG.info(
+                "%i of %i query results unchanged, not fetching them saved "
+                "%i bytes and about %.0f seconds", len(unchanged), len(queries),
+                sum(entry['size'] for entry in unchanged),
+                sum(entry['seconds'] for entry in unchanged))
+        return {qname: rows for qname, (rows, _) in fetched.items()}
 
     def fetch_query_from_pgdb(self, qname, query, con, cxn, limit=None):
         """
@@ -117,53 +165,115 @@ class PostgreSQLSource(Source):
         if con is None and cxn is None:
             raise ValueError("ERROR: you need to supply connection information")
 
-        if con is None and cxn is not None:
-            con = psycopg2.connect(
-                host=cxn['host'], database=cxn['database'], port=cxn['port'],
-                user=cxn['user'], password=cxn['password'])
+        if con is not None:
+            self._copy_query(con.cursor(), cxn, qname, query, limit)
+            return
+        con = self._connect(cxn)
+        try:
+            self._copy_query(con.cursor(), cxn, qname, query, limit)
+        finally:
+            con.close()
 
-        outfile = '/'.join((self.rawdir, qname))
-        cur = con.cursor()
-        # wrap the query to get the count
-        countquery = ' '.join(("SELECT COUNT(*) FROM (", query, ") x"))
-        if limit is not None:
-            countquery = ' '.join((countquery, "LIMIT", str(limit)))
+    @staticmethod
+    def _connect(cxn):
+        return psycopg2.connect(
+            host=cxn['host'], database=cxn['database'], port=cxn['port'],
+            user=cxn['user'], password=cxn['password'])
+
+    @staticmethod
+    def _connection_pool(cxn, size):
+        """
+        :return: pool of up to size connections, with getconn() putconn() closeall()
+        """
+        return psycopg2.pool.ThreadedConnectionPool(
+            1, size, host=cxn['host'], database=cxn['database'], port=cxn['port'],
+            user=cxn['user'], password=cxn['password'])
 
-        cur.execute(countquery)
-        tablerowcount = cur.fetchone()[0]
+    def _pooled_copy(self, pool, cxn, qname, query, limit, compress, is_dl_forced):
+        con = pool.getconn()
+        try:
+            cur = con.cursor()
+            if limit is not None:
+                return self._copy_query(cur, cxn, qname, query, limit, compress), None
+            return self._incremental_copy(
+                cur, cxn, qname, query, compress, is_dl_forced)
+        finally:
+            pool.putconn(con)
 
-        # download the file
+    def _incremental_copy(self, cur, cxn, qname, query, compress, is_dl_forced):
+        """
+        _copy_query(), unless the file on hand holds the same result
+        :return: (int rows, the file's manifest entry if it was unchanged else None)
+        """
+        outfile = '/'.join((self.rawdir, qname)) + ('.gz' if compress else '')
+        filename = os.path.basename(outfile)
+        manifest = FileManifest(self.rawdir)
+        started = time.monotonic()
+        cur.execute(FINGERPRINT.format(query))
+        fingerprint = ':'.join(str(column) for column in cur.fetchone())
+        recorded = {
+            'url': 'postgresql://{}:{}/{}'.format(
+                cxn['host'], cxn['port'], cxn['database']),
+            'query': hashlib.sha1(query.encode('utf-8')).hexdigest(),
+            'fingerprint': fingerprint,
+        }
+
+        entry = manifest.get(filename)
+        if not is_dl_forced and entry is not None and os.path.exists(outfile) and \
+                entry['size'] == os.path.getsize(outfile) and \
+                all(entry.get(key) == value for key, value in recorded.items()):
+            LOG.info("%s unchanged (%s), not fetching it again", outfile, fingerprint)
+            return entry['rows'], entry
+
+        rows = self._copy_query(cur, cxn, qname, query, None, compress)
+        recorded.update({
+            'size': os.path.getsize(outfile),
+            'rows': rows,
+            'seconds': round(time.monotonic() - started, 1),
+            'retrieved': datetime.utcnow().isoformat(timespec='seconds'),
+        })
+        manifest.update(filename, recorded)
+        return rows, None
+
+    def _copy_query(self, cur, cxn, qname, query, limit=None, compress=False):
+        """
+        COPY the query's result to rawdir/qname, by way of a '.part' file
+        :return: int rows fetched
+        """
+        if limit is not None:
+            query = "SELECT * FROM ({}) x LIMIT {}".format(query, limit)
+        outfile = '/'.join((self.rawdir, qname)) + ('.gz' if compress else '')
+        LOG.info("Fetching %s", outfile)
         LOG.debug("COMMAND:%s", query)
         outputquery = \
             "COPY ({0}) TO STDOUT WITH DELIMITER AS '\t' CSV HEADER".format(query)
 
-        with open(outfile, 'w') as tsvfile:
-            cur.copy_expert(outputquery, tsvfile)
-        # Regenerate row count to check integrity
-        filerowcount = self.file_len(outfile)
-        if (filerowcount-1) < tablerowcount:
+        try:
+            with CopyOutput(outfile + '.part', compress) as output:
+                cur.copy_expert(outputquery, output)
+        except Exception:
+            os.remove(outfile + '.part')
+            raise
+        filerowcount = output.lines - 1  # less the header
+
+        # the server's count of rows copied, or failing that, of rows to copy
+        tablerowcount = cur.rowcount
+        if tablerowcount is None or tablerowcount < 0:
+            cur.execute(' '.join(("SELECT COUNT(*) FROM (", query, ") x")))
+            tablerowcount = cur.fetchone()[0]
+
+        if filerowcount < tablerowcount:
+            os.remove(outfile + '.part')
             raise Exception(
                 "Download from {} failed, {} != {}"
                 .format(cxn['host'] + ':' + cxn['database'],
-                        (filerowcount-1), tablerowcount))
-        if (filerowcount-1) > tablerowcount:
+                        filerowcount, tablerowcount))
+        if filerowcount > tablerowcount:
             LOG.warning(
                 "Fetched from %s more rows in file (%s) than reported in count(%s)",
-                cxn['host'] + ':'+cxn['database'], (filerowcount-1), tablerowcount)
-
-    @staticmethod
-    def _getcols(cur, table):
-        """
-        Will execute a pg query to get the column names for the given table.
-        :param cur:
-        :param table:
-        :return:
-        """
-        query = ' '.join(("SELECT * FROM", table, "LIMIT 0"))  # for testing
-
-        cur.execute(query)
-        colnames = [desc[0] for desc in cur.description]
-        LOG.info("COLS (%s): %s", table, colnames)
+                cxn['host'] + ':' + cxn['database'], filerowcount, tablerowcount)
+        os.replace(outfile + '.part', outfile)
+        return filerowcount
 
     # abstract
     def fetch(self, is_dl_forced=False):
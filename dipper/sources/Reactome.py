@@ -115,7 +115,7 @@ class Reactome(Source):
         :return: None
         """
         src_file = '/'.join((self.rawdir, self.files[src_key]['file']))
-        col = self.files[src_key]['columns']
+        col = self.row_schema(self.files[src_key]['columns'])
 
         with open(src_file, 'r') as tsvfile:
             reader = csv.reader(tsvfile, delimiter="\t")
@@ -4,8 +4,11 @@ import os
 import time
 import logging
 import urllib
+import http.client
 import csv
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from email.utils import formatdate, parsedate_to_datetime
 from stat import ST_CTIME, ST_SIZE
 from inspect import getdoc
 from rdflib import XSD, Literal
@@ -13,11 +16,21 @@ from rdflib import XSD, Literal
 import yaml
 from dipper.graph.RDFGraph import RDFGraph
 from dipper.graph.StreamedGraph import StreamedGraph
+from dipper.graph.OutputSink import OutputSink, SUFFIX
+from dipper.graph.CompactGraph import CompactGraph
+from dipper.graph.SQLiteGraph import SQLiteGraph
 from dipper.utils.GraphUtils import GraphUtils
+from dipper.utils.HostLimiter import HostLimiter
+from dipper.utils.FileManifest import FileManifest
+from dipper.utils.BlobStore import BlobStore, BLOB_DIR
+from dipper.utils.DipperCache import DipperCache
+from dipper.utils.RowSchema import RowSchema
 from dipper.models.Dataset import Dataset
 
 LOG = logging.getLogger(__name__)
 CHUNK = 16 * 1024  # read remote urls of unknown size in 16k chunks
+MAX_CHUNK = 2**20  # growing up to 1M chunks while data keeps up
+CHECKSUMS = ('md5', 'sha256')  # computed as files download, kept in their manifest
 USER_AGENT = \
     "The Monarch Initiative (https://monarchinitiative.org/;info@monarchinitiative.org)"
 
@@ -36,13 +49,20 @@ class Source:
 
     """
     DIPPERCACHE = 'https://archive.monarchinitiative.org/DipperCache'
+    CACHE = DIPPERCACHE  # where get_files() looks first; url, directory or None
+    FETCH_WORKERS = 8   # files get_files() fetches at once
+    FETCH_PER_HOST = 2  # of which at most this many from any one server
+    FETCH_TIMEOUT = 120  # seconds a download may stall before it is resumed
+    FETCH_RETRIES = 5   # times a download is resumed after a dropped connection
+    FETCH_BACKOFF = 1   # seconds before the first resume, doubling after that
+    BLOB_STORE = BLOB_DIR  # raw files shared between sources, None to keep apart
     namespaces = {}
     files = {}
     ARGV = {}
 
     def __init__(
             self,
-            graph_type='rdf_graph',     # or streamed_graph
+            graph_type='rdf_graph',     # or streamed_graph, compact_graph, sqlite_graph
             are_bnodes_skized=False,    # typically True
             data_release_version=None,
             name=None,                  # identifier; make an URI for nquads
@@ -108,22 +128,32 @@ class Source:
         # note: tools such as protoge need skolemized blank nodes
         self.testgraph = RDFGraph(True, self.testname)
 
-        if graph_type == 'rdf_graph':
+        if graph_type in ('rdf_graph', 'compact_graph', 'sqlite_graph'):
             graph_id = ':MONARCH_' + str(self.name) + "_" + \
                 datetime.now().isoformat(' ').split()[0]
 
             LOG.info("Creating graph  %s", graph_id)
-            self.graph = RDFGraph(are_bnodes_skized, graph_id)
+            if graph_type == 'rdf_graph':
+                self.graph = RDFGraph(are_bnodes_skized, graph_id)
+            elif graph_type == 'compact_graph':
+                self.graph = CompactGraph(are_bnodes_skized, graph_id)
+            else:
+                self.graph = SQLiteGraph(are_bnodes_skized, graph_id)
 
         elif graph_type == 'streamed_graph':
             # need to expand on export formats
-            dest_file = open(out_pth + '/' + name + '.nt', 'w')   # where is the close?
-            self.graph = StreamedGraph(are_bnodes_skized, dest_file)
+            # closed (and moved into place) by self.graph.close() after parse()
+            compression = self.ARGV.get('compress')
+            dest_file = OutputSink(
+                '/'.join((out_pth, self.name + '.nt' + SUFFIX[compression])),
+                compression)
+            self.graph = StreamedGraph(are_bnodes_skized, file_handle=dest_file)
             # leave test files as turtle (better human readibility)
         else:
             LOG.error(
                 "%s graph type not supported\n"
-                "valid types: rdf_graph, streamed_graph", graph_type)
+                "valid types: rdf_graph, streamed_graph, compact_graph, sqlite_graph",
+                graph_type)
 
         # pull in global ontology mapping datastructures
         self.globaltt = self.graph.globaltt
@@ -186,7 +216,7 @@ class Source:
 
         In addition, if the version number isn't yet set in the dataset,
         it will be set to the date on file.
-        :return: None
+        :return: int count of triples written to the main graph when known
 
         """
         fmt_ext = {
@@ -235,9 +265,9 @@ class Source:
             outfile = None
         else:
             LOG.error("I don't understand our stream.")
-            return
+            return None
 
-        graph_util.write(self.graph, fmt, filename=outfile)
+        return graph_util.write(self.graph, fmt, filename=outfile)
 
     def whoami(self):
         '''
@@ -362,136 +392,399 @@ class Source:
         Given a set of files for this source, it will go fetch them, and
         set a default version by date.  If you need to set the version number
         by another method, then it can be set again.
+
+        Each file is looked for first in the DipperCache at CACHE
+        (or dipper-etl.py --cache: an url, a directory, or none).
+        Files are fetched concurrently (up to FETCH_WORKERS at once),
+        but no more than FETCH_PER_HOST at a time from any one server
+        and `delay` seconds apart per server.
         :param is_dl_forced - boolean
         :param files dict - override instance files dict
+        :param delay - seconds between requests to the same server
         :return: None
         """
 
-        fstat = None
         if files is None:
             files = self.files
 
-        for src_key in files:
-            headers = None
-            filesource = files[src_key]
-
-            if 'clean' in filesource:
-                cleaned_file_iri = filesource['clean']
-            else:
-                cleaned_file_iri = filesource['url']
-
-            # attempt to fetch from a web cache
-            remote_file = '/'.join((self.DIPPERCACHE, self.name, filesource['file']))
-            local_file = '/'.join((self.rawdir, filesource['file']))
-
-            cache_response = self.fetch_from_url(remote_file, local_file, is_dl_forced)
-
-            if cache_response:
-                LOG.info(
-                    "Found File '%s/%s' in DipperCache", self.name, filesource['file'])
-                self.dataset.set_ingest_source(cleaned_file_iri)
-
-                if remote_file in self.remote_file_timestamps:
+        cache = DipperCache.create(self.ARGV.get('cache', self.CACHE))
+        limiter = HostLimiter(self.FETCH_PER_HOST, delay)
+        with ThreadPoolExecutor(max_workers=self.FETCH_WORKERS) as pool:
+            fetches = [
+                pool.submit(
+                    self._get_file,
+                    src_key, files[src_key], is_dl_forced, cache, limiter)
+                for src_key in files]
+            fetched = [fetch.result() for fetch in fetches]
+
+        # rdflib graphs are not thread safe; record provenance from here, in order
+        for cleaned_file_iri, from_cache, timestamp in fetched:
+            self.dataset.set_ingest_source(cleaned_file_iri)
+            if from_cache:
+                if timestamp is not None:
                     # Here the timestamp on the file in DipperCache is a best effort
                     # representation of the earliest time the file
                     #  _could_ have been retrieved from source.
                     # not necessarily when it _was_ retrieved (e.g not 11 years ago)
                     # which will be not-before the timestamp (modulo timezones).
-                    timestamp = Literal(
-                        self.remote_file_timestamps[remote_file], datatype=XSD.dateTime)
                     self.dataset.graph.addTriple(
-                        cleaned_file_iri, self.globaltt['retrieved_on'], timestamp)
+                        cleaned_file_iri, self.globaltt['retrieved_on'],
+                        Literal(timestamp, datatype=XSD.dateTime))
             else:
-                LOG.warning(
-                    "File %s/%s absent from DipperCache", self.name, filesource['file'])
-
-                if 'headers' in filesource:
-                    headers = filesource['headers']
-                LOG.info("Getting %s", src_key)
-                # if the key 'clean' exists in the sources `files` dict
-                # expose that instead of the longer url
-                self.dataset.set_ingest_source(cleaned_file_iri)
-
-                LOG.info('Fetching %s in %i seconds', cleaned_file_iri, delay)
-
-                time.sleep(delay)
-
-                if not self.fetch_from_url(
-                        filesource['url'],
-                        '/'.join((self.rawdir, filesource['file'])),
-                        is_dl_forced, headers):
-                    LOG.warning('FAILED FETCH of %s', filesource['url'])
-
-                fstat = os.stat('/'.join((self.rawdir, filesource['file'])))
                 self.dataset.graph.addTriple(
                     self.dataset.version_level_curie, self.globaltt["Source"],
                     cleaned_file_iri)
-                filedate = Literal(
-                    datetime.utcfromtimestamp(fstat[ST_CTIME]).strftime("%Y%m%d"),
-                    datatype=XSD.date)
                 self.dataset.graph.addTriple(
-                    cleaned_file_iri, self.globaltt['retrieved_on'], filedate)
+                    cleaned_file_iri, self.globaltt['retrieved_on'],
+                    Literal(timestamp, datatype=XSD.date))
+
+    def _get_file(self, src_key, filesource, is_dl_forced, cache, limiter):
+        """
+        Fetch one of get_files() files, from the cache if it is there
+        else from its origin.  Runs on a worker thread.
+        :param src_key: str key of the file in the files dict
+        :param filesource: dict, an entry of the files dict
+        :param is_dl_forced: boolean
+        :param cache: DipperCache
+        :param limiter: HostLimiter
+        :return: (str file iri, bool from cache, timestamp) where the timestamp is
+            the cached copy's datetime (or None) or the fetched file's YYYYMMDD date
+        """
+        headers = None
+        if 'clean' in filesource:
+            cleaned_file_iri = filesource['clean']
+        else:
+            cleaned_file_iri = filesource['url']
+
+        # attempt to fetch from a cache
+        local_file = '/'.join((self.rawdir, filesource['file']))
+        with limiter.slot(cache.location(self.name, filesource['file']), delay=0):
+            found, timestamp = cache.fetch(
+                self, filesource['file'], local_file, is_dl_forced)
+
+        if found:
+            LOG.info(
+                "Found File '%s/%s' in DipperCache", self.name, filesource['file'])
+            return cleaned_file_iri, True, timestamp
+
+        LOG.warning(
+            "File %s/%s absent from DipperCache", self.name, filesource['file'])
+
+        if 'headers' in filesource:
+            headers = filesource['headers']
+        LOG.info("Getting %s", src_key)
+        # if the key 'clean' exists in the sources `files` dict
+        # expose that instead of the longer url
+        with limiter.slot(filesource['url']):
+            LOG.info('Fetching %s', cleaned_file_iri)
+            if not self.fetch_from_url(
+                    filesource['url'], local_file, is_dl_forced, headers):
+                LOG.warning('FAILED FETCH of %s', filesource['url'])
+
+        fstat = os.stat(local_file)
+        filedate = datetime.utcfromtimestamp(fstat[ST_CTIME]).strftime("%Y%m%d")
+        return cleaned_file_iri, False, filedate
 
     def fetch_from_url(
             self, remoteurl, localfile=None, is_dl_forced=False, headers=None):
         """
-        Given a remote url and a local filename, attempt to determine
-        if the remote file is newer; if it is,
-        fetch the remote file and save it to the specified localfile,
-        reporting the basic file information once it is downloaded
+        Fetch the remote file into localfile, unless the local copy is current.
+
+        Each directory keeps a FileManifest of the validators (ETag, Last-Modified),
+        size and checksums of the files fetched into it.  If the local file is the one
+        recorded there, a single conditional GET (If-None-Match / If-Modified-Since)
+        asks the server for it only if it changed; without a manifest entry the
+        local file's modification time is offered instead.  A '304 Not Modified'
+        costs no transfer.  Downloads go to a '.part' file, are resumed where
+        they stopped if the connection drops (see _download) and are moved
+        into place once complete, with their size checked against the
+        response's Content-Length.
         :param remoteurl: URL of remote file to fetch
         :param localfile: pathname of file to save locally
+        :param is_dl_forced: boolean, download without asking if it changed
+        :param headers: dict of request headers, default a User-Agent
+
+        :return: bool, True if localfile holds the (unchanged) remote file
 
-        :return: bool
+        """
+        if localfile is None:
+            LOG.error('Local filename is required')
+            exit(-1)
+        if self.BLOB_STORE is None:
+            return self._fetch_from_url(remoteurl, localfile, is_dl_forced, headers)
+        store = BlobStore(self.BLOB_STORE)
+        with store.fetching(remoteurl):
+            return self._fetch_from_url(
+                remoteurl, localfile, is_dl_forced, headers, store)
+
+    def _fetch_from_url(
+            self, remoteurl, localfile, is_dl_forced, headers, store=None):
+        """
+        fetch_from_url(), optionally by way of a BlobStore:
+        lacking a current local file, the stored copy of remoteurl
+        (fetched before by any source) is offered for the conditional GET,
+        and linked to localfile if it is not modified.
+        New downloads are moved into the store and linked from there.
+        """
+        if headers is None:
+            headers = self._get_default_request_headers()
+        headers = dict(headers)
+
+        manifest = FileManifest(os.path.dirname(localfile))
+        filename = os.path.basename(localfile)
+        # what localfile holds now, released from the store once replaced
+        previous = (manifest.get(filename) or {}).get('sha256')
+        entry = None
+        stored = None
+        known = None
+        if not is_dl_forced:
+            if os.path.exists(localfile):
+                entry = manifest.get(filename)
+                if entry is not None and (
+                        entry.get('url') != remoteurl or
+                        entry.get('size') != os.path.getsize(localfile)):
+                    entry = None    # not the file we have
+            if entry is None and store is not None:
+                stored = store.lookup(remoteurl)
+            known = entry if entry is not None else stored
+            if known is not None:
+                if known.get('etag') is not None:
+                    headers['If-None-Match'] = known['etag']
+                if known.get('last_modified') is not None:
+                    headers['If-Modified-Since'] = known['last_modified']
+            elif os.path.exists(localfile):
+                headers['If-Modified-Since'] = formatdate(
+                    os.path.getmtime(localfile), usegmt=True)
+
+        try:
+            request = urllib.request.Request(remoteurl, headers=headers)
+            response = urllib.request.urlopen(request, timeout=self.FETCH_TIMEOUT)
+        except urllib.error.HTTPError as httperr:
+            if httperr.code == 304:
+                self._discard_part(manifest, localfile + '.part')
+                if entry is None and stored is not None:
+                    LOG.info("Linking %s from the blob store (not modified)", localfile)
+                    store.link(stored['sha256'], localfile, previous)
+                    entry = stored
+                    manifest.update(filename, entry)
+                elif entry is None:
+                    LOG.info("Using existing file %s (not modified)", localfile)
+                    entry = self._manifest_entry(remoteurl, localfile, httperr.headers)
+                    manifest.update(filename, entry)
+                else:
+                    LOG.info("Using existing file %s (not modified)", localfile)
+                self._set_remote_timestamp(remoteurl, entry['last_modified'])
+                return True
+            LOG.error('NETWORK issue %s\n\tFor: %s', httperr.read(), remoteurl)
+            return False  # allows re try (e.g. not found in Cache)
+        except urllib.error.URLError as urlerr:
+            LOG.error('URLError %s\n\tFor: %s', urlerr, remoteurl)
+            return False
+
+        resp_headers = response.info()
+        size = resp_headers.get('Content-Length')
+        size = int(size) if size else None
+        if known is not None and 'If-None-Match' not in headers and \
+                'If-Modified-Since' not in headers and size == known['size']:
+            # no validators to go on (e.g. ftp), judge by size alone as before
+            response.close()
+            LOG.info("Using existing file %s (same size as remote)", localfile)
+            if entry is None:
+                store.link(stored['sha256'], localfile, previous)
+                manifest.update(filename, stored)
+            return True
+
+        partfile = localfile + '.part'
+        checksums = self._download(remoteurl, response, partfile, headers, manifest)
+        fsize = os.path.getsize(partfile)
+        if size is not None and fsize != size:
+            self._discard_part(manifest, partfile)
+            raise Exception(
+                "Error downloading file: "
+                "local file size {} != remote file size {}".format(fsize, size))
+        if store is None:
+            os.replace(partfile, localfile)
+        else:
+            store.add(partfile, checksums['sha256'])
+            store.link(checksums['sha256'], localfile, previous)
+        manifest.remove(os.path.basename(partfile))
+        LOG.info("Finished.  Wrote file to %s", localfile)
+
+        entry = self._manifest_entry(remoteurl, localfile, resp_headers, checksums)
+        manifest.update(filename, entry)
+        if store is not None:
+            store.record(entry)
+        self._set_remote_timestamp(remoteurl, entry['last_modified'])
+
+        fstat = os.stat(localfile)
+        LOG.info("file size: %s", fstat[ST_SIZE])
+        LOG.info(
+            "file created: %s",
+            time.asctime(time.localtime(fstat[ST_CTIME])))
+        return True
 
+    def _download(self, remoteurl, response, partfile, headers, manifest):
         """
+        Stream response into partfile.  A connection which drops (or stalls for
+        FETCH_TIMEOUT seconds) is resumed with a Range request from where it
+        stopped, up to FETCH_RETRIES times with a doubling back off.
+        A partfile left by an earlier run is continued likewise,
+        if the remote file is still the version it was started from.
+        Resuming needs the server to send an ETag or Last-Modified
+        (for If-Range) and to accept byte ranges; otherwise failures are raised.
+        :param remoteurl: str
+        :param response: the open response for remoteurl (closed here)
+        :param partfile: str path to download into
+        :param headers: dict of the request headers
+        :param manifest: FileManifest recording which version the partfile holds
+        :return: dict of the whole file's CHECKSUMS, as hex digests
+        """
+        partname = os.path.basename(partfile)
+        resp_headers = response.info()
+        validator = resp_headers.get('ETag') or resp_headers.get('Last-Modified')
+        if resp_headers.get('Accept-Ranges') != 'bytes':
+            validator = None
+        part = manifest.get(partname)
+        length = resp_headers.get('Content-Length')
+        resumable = validator is not None and os.path.exists(partfile) and \
+            part == {'url': remoteurl, 'validator': validator} and \
+            (not length or os.path.getsize(partfile) < int(length))
+        if not resumable:
+            with open(partfile, 'wb'):
+                pass
+            manifest.update(partname, {'url': remoteurl, 'validator': validator})
+        else:
+            LOG.info("Resuming %s at byte %i", partfile, os.path.getsize(partfile))
+            response.close()
+            response = None
 
-        response = None
-        result = False
-        rmt_check = self.check_if_remote_is_newer(remoteurl, localfile, headers)
-        if (is_dl_forced is True) or (localfile is None) or (
-                rmt_check is not None and rmt_check):
-            if headers is None:
-                headers = self._get_default_request_headers()
+        digests = {name: hashlib.new(name) for name in CHECKSUMS}
+        digested = 0
+        chunk_size = CHUNK
+        attempts = 0
+        while True:
             try:
-                request = urllib.request.Request(remoteurl, headers=headers)
-                response = urllib.request.urlopen(request)
-            except urllib.error.HTTPError as httperr:
-                # raise Exception(httpErr.read())
-                LOG.error('NETWORK issue %s\n\tFor: %s', httperr.read(), remoteurl)
-                return False  # allows re try (e.g. not found in Cache)
-            except urllib.error.URLError as urlerr:
-                LOG.error('URLError %s\n\tFor: %s', urlerr, remoteurl)
-            result = response is not None
-            if localfile is not None and result:
-                with open(localfile, 'wb') as binwrite:
+                if response is None:
+                    response = self._open_range(
+                        remoteurl, headers, os.path.getsize(partfile), validator)
+                    if response.status != 206:  # the whole file again
+                        with open(partfile, 'wb'):
+                            pass
+                if digested != os.path.getsize(partfile):
+                    digests, digested = self._hash_file(partfile)
+                length = response.info().get('Content-Length')
+                end = digested + int(length) if length else None
+                with open(partfile, 'ab') as binwrite:
                     while True:
-                        chunk = response.read(CHUNK)
+                        started = time.monotonic()
+                        chunk = response.read(chunk_size)
                         if not chunk:
                             break
                         binwrite.write(chunk)
+                        for digest in digests.values():
+                            digest.update(chunk)
+                        digested += len(chunk)
+                        # a full read in good time: ask for more at once
+                        if len(chunk) == chunk_size and chunk_size < MAX_CHUNK and \
+                                time.monotonic() - started < 0.1:
+                            chunk_size *= 2
+                response.close()
+                if end is not None and digested < end:
+                    # read() just comes up short when the connection drops
+                    raise http.client.IncompleteRead(b'', end - digested)
+                return {name: digest.hexdigest() for name, digest in digests.items()}
+            except (OSError, http.client.HTTPException) as err:
+                if response is not None:
+                    response.close()
+                    response = None
+                attempts += 1
+                if validator is None or attempts > self.FETCH_RETRIES:
+                    raise
+                backoff = self.FETCH_BACKOFF * 2 ** (attempts - 1)
+                LOG.warning(
+                    "Download of %s failed at byte %i (%s), resuming in %i seconds",
+                    remoteurl, os.path.getsize(partfile), err, backoff)
+                time.sleep(backoff)
 
-                LOG.info("Finished.  Wrote file to %s", localfile)
-                if self.compare_local_remote_bytes(remoteurl, localfile, headers):
-                    LOG.debug("local file is same size as remote after download")
-                else:
-                    raise Exception(
-                        "Error downloading file: "
-                        "local file size  != remote file size")
-
-                fstat = os.stat(localfile)
-                LOG.info("file size: %s", fstat[ST_SIZE])
-                LOG.info(
-                    "file created: %s",
-                    time.asctime(time.localtime(fstat[ST_CTIME])))
+    def _open_range(self, remoteurl, headers, offset, validator):
+        """
+        Request remoteurl from byte offset on, if it is still the validator version
+        :return: the response, status 206 for the range or 200 for the whole file
+        """
+        headers = dict(headers)
+        for conditional in ('If-None-Match', 'If-Modified-Since'):
+            headers.pop(conditional, None)
+        headers['Range'] = 'bytes={}-'.format(offset)
+        headers['If-Range'] = validator
+        request = urllib.request.Request(remoteurl, headers=headers)
+        response = urllib.request.urlopen(request, timeout=self.FETCH_TIMEOUT)
+        if response.status == 206:
+            content_range = response.info().get('Content-Range', '')
+            if not content_range.startswith('bytes {}-'.format(offset)):
                 response.close()
-            else:
-                LOG.error('Local filename is required')
-                exit(-1)
+                raise http.client.HTTPException(
+                    "Unexpected Content-Range '{}' for {}".format(
+                        content_range, remoteurl))
+        return response
 
-        else:
-            LOG.info("Using existing file %s", localfile)
-        return result
+    @staticmethod
+    def _hash_file(path):
+        """
+        :return: (dict of CHECKSUMS hash objects of the file's content, int bytes hashed)
+        """
+        digests = {name: hashlib.new(name) for name in CHECKSUMS}
+        size = 0
+        with open(path, 'rb') as binread:
+            for chunk in iter(lambda: binread.read(MAX_CHUNK), b''):
+                for digest in digests.values():
+                    digest.update(chunk)
+                size += len(chunk)
+        return digests, size
+
+    @staticmethod
+    def _discard_part(manifest, partfile):
+        """
+        Remove a partial download (and its manifest entry), if there is one
+        """
+        if os.path.exists(partfile):
+            os.remove(partfile)
+        if manifest.get(os.path.basename(partfile)) is not None:
+            manifest.remove(os.path.basename(partfile))
+
+    @staticmethod
+    def _manifest_entry(remoteurl, localfile, resp_headers, checksums=None):
+        """
+        :param remoteurl: str
+        :param localfile: str path of the file as fetched from remoteurl
+        :param resp_headers: the response's headers
+        :param checksums: dict of CHECKSUMS hex digests, from localfile if not given
+        :return: dict FileManifest entry
+        """
+        if checksums is None:
+            checksums = {
+                name: digest.hexdigest()
+                for name, digest in Source._hash_file(localfile)[0].items()}
+        entry = {
+            'url': remoteurl,
+            'etag': resp_headers.get('ETag'),
+            'last_modified': resp_headers.get('Last-Modified'),
+            'size': os.path.getsize(localfile),
+            'retrieved': datetime.utcnow().isoformat(timespec='seconds'),
+        }
+        entry.update(checksums)
+        return entry
+
+    def _set_remote_timestamp(self, remoteurl, last_modified):
+        """
+        Note the remote file's Last-Modified date (if any) as a naive utc datetime
+        """
+        if last_modified is None:
+            return
+        try:
+            self.remote_file_timestamps[remoteurl] = \
+                parsedate_to_datetime(last_modified).replace(tzinfo=None)
+        except (TypeError, ValueError):
+            LOG.warning("Unparsable Last-Modified '%s' for %s", last_modified, remoteurl)
 
     # TODO: rephrase as mysql-dump-xml specific format
     def process_xml_table(self, elem, table_name, processing_function, limit):
@@ -543,9 +836,17 @@ class Source:
 
     @staticmethod
     def get_file_md5(directory, filename, blocksize=2**20):
+        """
+        md5 of a file, as computed while it was downloaded when the manifest
+        of its directory has it, else by reading the file
+        """
+        entry = FileManifest(directory).get(filename)
+        if entry is not None and entry.get('md5') is not None and \
+                entry['size'] == os.path.getsize(os.path.join(directory, filename)):
+            return entry['md5']
+
         # reference:
         # http://stackoverflow.com/questions/1131220/get-md5-hash-of-big-files-in-python
-
         md5 = hashlib.md5()
         with open(os.path.join(directory, filename), "rb") as bin_reader:
             while True:
@@ -827,6 +1128,21 @@ class Source:
 
         return (exp ^ got) & exp == set()
 
+    def row_schema(self, columns, header=None, src_key=None):
+        '''
+        The expected columns of a file, their positions in its rows resolved once
+        (see RowSchema) from the received header when there is one,
+        which is checked with check_fileheader() first.
+
+            param:  columns  list of the expected column names
+            param:  header   list of the column names received (or None)
+
+            return: RowSchema
+        '''
+        if header is not None:
+            self.check_fileheader(columns, header, src_key)
+        return RowSchema(columns, header)
+
     def command_args(self):
         '''
             To make arbitrary variables from dipper-etl.py's calling enviroment
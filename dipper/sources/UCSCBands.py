@@ -313,7 +313,7 @@ class UCSCBands(Source):
         unplaced_scaffold_regex = re.compile(r'chr(Un(?:_\w+)?)')
 
         # process the bands
-        col = self.files[src_key]['columns']
+        col = self.row_schema(self.files[src_key]['columns'])
 
         with gzip.open(myfile, 'rb') as binreader:
             for line in binreader:
@@ -1,8 +1,6 @@
 import csv
 import re
 import logging
-import gzip
-import io
 import yaml
 from ftplib import FTP
 from dipper.sources.Source import Source
@@ -13,6 +11,7 @@ from dipper.models.Reference import Reference
 from dipper.models.Model import Model
 from dipper.models.assoc.InteractionAssoc import InteractionAssoc
 from dipper.models.BiolinkVocabulary import BioLinkVocabulary as blv
+from dipper.utils.GzipReader import GzipReader
 
 LOG = logging.getLogger(__name__)
 
@@ -319,12 +318,11 @@ class WormBase(Source):
         graph = self.graph
         model = Model(graph)
         geno = Genotype(graph)
-        col = self.files[src_key]['columns']
+        col = self.row_schema(self.files[src_key]['columns'])
         LOG.info("Processing: %s", self.files[src_key]['file'])
 
-        with gzip.open(raw, 'rb') as csvfile:
-            reader = csv.reader(
-                io.TextIOWrapper(csvfile, newline=""), delimiter=',', quotechar='\"')
+        with GzipReader(raw, 'rt', newline='') as csvfile:
+            reader = csv.reader(csvfile, delimiter=',', quotechar='\"')
             # no header row to check
             collen = len(col)
             for row in reader:
@@ -367,11 +365,10 @@ class WormBase(Source):
         LOG.info("Processing: %s", self.files[src_key]['file'])
         graph = self.graph
         model = Model(graph)
-        col = self.files[src_key]['columns']
+        col = self.row_schema(self.files[src_key]['columns'])
 
-        with gzip.open(raw, 'rb') as csvfile:
-            reader = csv.reader(
-                io.TextIOWrapper(csvfile, newline=""), delimiter='\t', quotechar='\"')
+        with GzipReader(raw, 'rt', newline='') as csvfile:
+            reader = csv.reader(csvfile, delimiter='\t', quotechar='\"')
             row = next(reader)
             for row in reader:
                 if re.match(r'\#', ''.join(row)):
@@ -422,7 +419,7 @@ class WormBase(Source):
         """
         src_key = 'allele_pheno'
         raw = '/'.join((self.rawdir, self.files[src_key]['file']))
-        col = self.files[src_key]['columns']
+        col = self.row_schema(self.files[src_key]['columns'])
         graph = self.graph
         model = Model(self.graph)
         LOG.info("Processing: %s", self.files[src_key]['file'])
@@ -577,7 +574,7 @@ class WormBase(Source):
         LOG.info("Processing: %s", self.files[src_key]['file'])
         graph = self.graph
         geno = Genotype(graph)
-        col = self.files[src_key]['columns']
+        col = self.row_schema(self.files[src_key]['columns'])
         with open(raw, 'r') as csvfile:
             reader = csv.reader(csvfile, delimiter='\t', quotechar='\"')
             # no header row to check
@@ -653,7 +650,7 @@ WBRNAi00008687|WBPaper00005654 WBRNAi00025197|WBPaper00006395 WBRNAi00045381|WBP
         LOG.info("Processing: %s", self.files[src_key]['file'])
         graph = self.graph
         model = Model(graph)
-        col = self.files[src_key]['columns']
+        col = self.row_schema(self.files[src_key]['columns'])
         with open(raw, 'r') as csvfile:
             reader = csv.reader(csvfile, delimiter='\t', quotechar='\"')
             for row in reader:
@@ -696,11 +693,10 @@ WBRNAi00008687|WBPaper00005654 WBRNAi00025197|WBPaper00006395 WBRNAi00045381|WBP
         strain_to_variant_map = {}
         build_num = self.version_num
         build_id = 'WormBase:' + build_num
-        col = self.files[src_key]['columns']
+        col = self.row_schema(self.files[src_key]['columns'])
 
-        with gzip.open(raw, 'rb') as csvfile:
-            reader = csv.reader(
-                io.TextIOWrapper(csvfile, newline=""), delimiter='\t', quotechar='\"')
+        with GzipReader(raw, 'rt', newline='') as csvfile:
+            reader = csv.reader(csvfile, delimiter='\t', quotechar='\"')
 
             for row in reader:
                 if re.match(r'\#', ''.join(row)):
@@ -854,7 +850,7 @@ I	TF_binding_site_region	TF_binding_site	3403	4072	.	+	.	Name=WBsf331847;tf_id=W
     def process_disease_association(self, limit):
         src_key = 'disease_assoc'
         raw = '/'.join((self.rawdir, self.files[src_key]['file']))
-        col = self.files[src_key]['columns']
+        col = self.row_schema(self.files[src_key]['columns'])
         graph = self.graph
         LOG.info("Processing: %s", self.files[src_key]['file'])
         with open(raw, 'r') as csvfile:
@@ -931,9 +927,8 @@ I	TF_binding_site_region	TF_binding_site	3403	4072	.	+	.	Name=WBsf331847;tf_id=W
         model = Model(graph)
         LOG.info("Processing gene interaction associations")
 
-        with gzip.open(raw, 'rb') as csvfile:
-            reader = csv.reader(
-                io.TextIOWrapper(csvfile, newline=""), delimiter='\t', quotechar="'")
+        with GzipReader(raw, 'rt', newline='') as csvfile:
+            reader = csv.reader(csvfile, delimiter='\t', quotechar="'")
 
             for row in reader:
                 if re.match(r'#', ''.join(row)):
@@ -542,7 +542,7 @@ class ZFIN(Source):
             graph = self.graph
         model = Model(graph)
         geno = Genotype(graph)
-        col = self.files[src_key]['columns']
+        col = self.row_schema(self.files[src_key]['columns'])
         collen = len(col)
         taxon_id = self.default_taxon_id
 
@@ -807,7 +807,7 @@ class ZFIN(Source):
         taxon_id = self.default_taxon_id
         geno_hash = {}  # This is used to store the genotype partonomy
         gvc_hash = {}
-        col = self.files[src_key]['columns']
+        col = self.row_schema(self.files[src_key]['columns'])
         collen = len(col)
         with open(raw, 'r', encoding="utf8") as csvfile:
             reader = csv.reader(csvfile, delimiter='\t', quotechar='\"')
@@ -1217,7 +1217,7 @@ class ZFIN(Source):
         taxon_id = self.default_taxon_id
         model.addClassToGraph(taxon_id, None)
 
-        col = self.files[src_key]['columns']
+        col = self.row_schema(self.files[src_key]['columns'])
         collen = len(col)
         with open(raw, 'r', encoding="iso-8859-1") as csvfile:
             reader = csv.reader(csvfile, delimiter='\t', quotechar='\"')
@@ -1287,7 +1287,7 @@ class ZFIN(Source):
             graph = self.graph
         # model = Model(graph)  # unused
         geno = Genotype(graph)
-        col = self.files[src_key]['columns']
+        col = self.row_schema(self.files[src_key]['columns'])
         collen = len(col)
         with open(raw, 'r', encoding="iso-8859-1") as csvfile:
             reader = csv.reader(csvfile, delimiter='\t', quotechar='\"')
@@ -1347,7 +1347,7 @@ class ZFIN(Source):
             graph = self.graph
         model = Model(graph)
 
-        col = self.files[src_key]['columns']
+        col = self.row_schema(self.files[src_key]['columns'])
         collen = len(col)
         with open(raw, 'r', encoding="iso-8859-1") as csvfile:
             reader = csv.reader(csvfile, delimiter='\t', quotechar='\"')
@@ -1407,7 +1407,7 @@ class ZFIN(Source):
         mapped_zpids = list()
         model = Model(graph)
         eco_id = self.globaltt['experimental phenotypic evidence']
-        col = self.files[src_key]['columns']
+        col = self.row_schema(self.files[src_key]['columns'])
         collen = len(col)
         with open(raw, 'r', encoding="utf8") as csvfile:
             reader = csv.reader(csvfile, delimiter='\t', quotechar='\"')
@@ -1543,7 +1543,7 @@ class ZFIN(Source):
         model = Model(graph)
         geno = Genotype(graph)
         taxon_id = self.default_taxon_id
-        col = self.files[src_key]['columns']
+        col = self.row_schema(self.files[src_key]['columns'])
         collen = len(col)
         with open(raw, 'r', encoding="iso-8859-1") as csvfile:
             reader = csv.reader(csvfile, delimiter='\t', quotechar='\"')
@@ -1599,7 +1599,7 @@ class ZFIN(Source):
             graph = self.graph
         model = Model(graph)
         geno = Genotype(graph)
-        col = self.files[src_key]['columns']
+        col = self.row_schema(self.files[src_key]['columns'])
         collen = len(col)
         with open(raw, 'r', encoding="iso-8859-1") as csvfile:
             reader = csv.reader(csvfile, delimiter='\t', quotechar='\"')
@@ -1690,7 +1690,7 @@ class ZFIN(Source):
             graph = self.graph
         model = Model(graph)
         geno = Genotype(graph)
-        col = self.files[src_key]['columns']
+        col = self.row_schema(self.files[src_key]['columns'])
         collen = len(col)
         with open(raw, 'r', encoding="iso-8859-1") as csvfile:
             reader = csv.reader(csvfile, delimiter='\t', quotechar='\"')
@@ -1821,7 +1821,7 @@ class ZFIN(Source):
             graph = self.graph
         model = Model(graph)
         geno = Genotype(graph)
-        col = self.files[src_key]['columns']
+        col = self.row_schema(self.files[src_key]['columns'])
         collen = len(col)
         with open(raw, 'r', encoding="iso-8859-1") as csvfile:
             reader = csv.reader(csvfile, delimiter='\t', quotechar='\"')
@@ -1957,7 +1957,7 @@ class ZFIN(Source):
             graph = self.graph
         model = Model(graph)
 
-        col = self.files[src_key]['columns']
+        col = self.row_schema(self.files[src_key]['columns'])
         collen = len(col)
         with open(raw, 'r', encoding="latin-1") as csvfile:
             reader = csv.reader(csvfile, delimiter='\t', quotechar='\"')
@@ -2034,7 +2034,7 @@ class ZFIN(Source):
         else:
             graph = self.graph
         model = Model(graph)
-        col = self.files[src_key]['columns']
+        col = self.row_schema(self.files[src_key]['columns'])
         collen = len(col)
         with open(raw, 'r', encoding="latin-1") as csvfile:
             reader = csv.reader(csvfile, delimiter='\t', quotechar='\"')
@@ -2114,7 +2114,7 @@ class ZFIN(Source):
             graph = self.graph
         model = Model(graph)
         geno = Genotype(graph)
-        col = self.files[src_key]['columns']
+        col = self.row_schema(self.files[src_key]['columns'])
         collen = len(col)
         kol = [
             'gene_num',
@@ -2234,7 +2234,7 @@ class ZFIN(Source):
             graph = self.graph
         env_hash = {}
         envo = Environment(graph)
-        col = self.files[src_key]['columns']
+        col = self.row_schema(self.files[src_key]['columns'])
         collen = len(col)
         with open(raw, 'r', encoding="iso-8859-1") as csvfile:
             reader = csv.reader(csvfile, delimiter='\t', quotechar='\"')
@@ -2355,7 +2355,7 @@ class ZFIN(Source):
 
         # genome_id = geno.makeGenomeID(taxon_id)
         geno.addGenome(taxon_id, taxon_label)
-        col = self.files[src_key]['columns']
+        col = self.row_schema(self.files[src_key]['columns'])
         collen = len(col)
         with open(raw, 'r', encoding="iso-8859-1") as csvfile:
             reader = csv.reader(csvfile, delimiter='\t', quotechar='\"')
@@ -2449,7 +2449,7 @@ class ZFIN(Source):
             graph = self.graph
         model = Model(graph)
         geno = Genotype(graph)
-        col = self.files[src_key]['columns']
+        col = self.row_schema(self.files[src_key]['columns'])
         collen = len(col)
         with open(raw, 'r', encoding="iso-8859-1") as csvfile:
             reader = csv.reader(csvfile, delimiter='\t', quotechar='\"')
@@ -2513,7 +2513,7 @@ class ZFIN(Source):
             graph = self.graph
         geno = Genotype(graph)
         # model = Model(graph)  # unused
-        col = self.files[src_key]['columns']
+        col = self.row_schema(self.files[src_key]['columns'])
         collen = len(col)
         with open(raw, 'r', encoding="iso-8859-1") as csvfile:
             reader = csv.reader(csvfile, delimiter='\t', quotechar='\"')
@@ -2573,7 +2573,7 @@ class ZFIN(Source):
             graph = self.graph
         geno = Genotype(graph)
         model = Model(graph)
-        col = self.files[src_key]['columns']
+        col = self.row_schema(self.files[src_key]['columns'])
         collen = len(col)
         with open(raw, 'r', encoding="iso-8859-1") as csvfile:
             reader = csv.reader(csvfile, delimiter='\t', quotechar='\"')
@@ -2642,7 +2642,7 @@ class ZFIN(Source):
             graph = self.graph
         geno = Genotype(graph)
         model = Model(graph)
-        col = self.files[src_key]['columns']
+        col = self.row_schema(self.files[src_key]['columns'])
         collen = len(col)
         fish_taxon = self.globaltt['Danio rerio']
         with open(raw, 'r', encoding="iso-8859-1") as csvfile:
@@ -2782,7 +2782,7 @@ class ZFIN(Source):
         #  'zpmap'
         zp_file = '/'.join((self.rawdir, self.files[src_key]['file']))
         zp_map = {}
-        col = self.files[src_key]['columns']
+        col = self.row_schema(self.files[src_key]['columns'])
         kol = [
             'zp_id',
             'subterm1_id',
@@ -2990,7 +2990,7 @@ class ZFIN(Source):
         else:
             graph = self.graph
 
-        col = self.files[src_key]['columns']
+        col = self.row_schema(self.files[src_key]['columns'])
         collen = len(col)
         with open(raw, 'r', encoding="utf-8") as csvfile:
             reader = csv.reader(csvfile, delimiter='\t', quotechar='\"')
@@ -89,7 +89,7 @@ class ZFINSlim(Source):
         src_key = 'g2p_clean'
         raw = '/'.join((self.rawdir, self.files[src_key]['file']))
         LOG.info("Processing clean Geno to Pheno from file: %s", raw)
-        col = self.files[src_key]['columns']
+        col = self.row_schema(self.files[src_key]['columns'])
         collen = len(col)
         with open(raw, 'r', encoding="utf8") as csvfile:
             reader = csv.reader(csvfile, delimiter='\t', quotechar='\"')
@@ -0,0 +1,153 @@
+import os
+import stat
+import fcntl
+import shutil
+import hashlib
+import logging
+from contextlib import contextmanager
+
+from dipper.utils.FileManifest import FileManifest
+
+LOG = logging.getLogger(__name__)
+
+BLOB_DIR = 'raw/.blobs'
+SYMLINKS = '.symlinks.json'
+
+
+class BlobStore:
+    """
+    Raw files fetched by any source, stored once by their content.
+
+    The same upstream file (e.g. NCBI's gene_info.gz) is wanted by several
+    sources, each in its own raw/<source>/ directory.  A fetched file is moved
+    into the store under its sha256 and (hard, else symbolic) linked back,
+    and the store's index remembers the url it came from and its validators.
+    The next source to want that url asks the server with the validators of
+    the stored copy and, if it is unchanged, just links it.
+
+        <root>/sha256/9f/9f86d0...    the files, read only
+        <root>/.manifest.json         FileManifest keyed by url (not file name)
+        <root>/.symlinks.json         the symbolic links made (where hard links fail)
+        <root>/locks/<sha1 of url>    held by whoever is fetching the url
+
+    A stored file is removed once it is neither the latest from any url
+    nor linked to by any raw file, so each release of a file
+    does not leave another copy behind.
+
+    A stored file is shared by all the raw files linked to it, so sources
+    must replace their raw files rather than write to them in place.
+    Stored files are marked read only to make that plain, but that
+    stops neither root nor a writer that changes the mode first.
+    """
+
+    def __init__(self, root=BLOB_DIR):
+        self.root = root
+        self.index = FileManifest(root)
+        self.symlinks = FileManifest(root, SYMLINKS)
+        os.makedirs(os.path.join(root, 'locks'), exist_ok=True)
+
+    def path(self, sha256):
+        """
+        :param sha256: str hex digest
+        :return: str path of the stored file with that digest
+        """
+        return os.path.join(self.root, 'sha256', sha256[:2], sha256)
+
+    @contextmanager
+    def fetching(self, url):
+        """
+        Hold while fetching url, so other threads or processes after the same
+        url wait and then find it in the store rather than fetch it again
+        """
+        name = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        with open(os.path.join(self.root, 'locks', name), 'a') as lockfile:
+            fcntl.flock(lockfile, fcntl.LOCK_EX)
+            yield
+
+    def lookup(self, url):
+        """
+        :param url: str
+        :return: dict FileManifest entry of the file last stored from url, or None
+        """
+        entry = self.index.get(url)
+        if entry is None or not os.path.exists(self.path(entry['sha256'])):
+            return None
+        return entry
+
+    def add(self, filepath, sha256):
+        """
+        Move a file into the store (unless its content is already there)
+        :param filepath: str path of the file, gone afterwards
+        :param sha256: str hex digest of the file
+        :return: str path of the stored file
+        """
+        blob = self.path(sha256)
+        if os.path.exists(blob):
+            os.remove(filepath)
+        else:
+            os.makedirs(os.path.dirname(blob), exist_ok=True)
+            os.chmod(filepath, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+            shutil.move(filepath, blob)
+        return blob
+
+    def record(self, entry):
+        """
+        Remember the stored file fetched from entry['url'],
+        releasing the one stored from that url before
+        :param entry: dict FileManifest entry
+        """
+        previous = self.index.get(entry['url'])
+        self.index.update(entry['url'], entry)
+        if previous is not None and previous['sha256'] != entry['sha256']:
+            self.release(previous['sha256'])
+
+    def link(self, sha256, localfile, previous=None):
+        """
+        Put (a link to) the stored file at localfile, replacing what was there
+        and releasing the stored file that was
+        :param sha256: str hex digest of a stored file
+        :param localfile: str path
+        :param previous: str hex digest of what localfile held (if known)
+        """
+        blob = self.path(sha256)
+        localpath = os.path.abspath(localfile)
+        if os.path.islink(localfile):
+            previous = os.path.basename(os.readlink(localfile))
+        temp_path = localfile + '.link'
+        if os.path.lexists(temp_path):
+            os.remove(temp_path)
+        try:
+            os.link(blob, temp_path)
+        except OSError:  # e.g. across file systems
+            os.symlink(os.path.abspath(blob), temp_path)
+            self.symlinks.update(localpath, {'sha256': sha256})
+        else:
+            if self.symlinks.get(localpath) is not None:
+                self.symlinks.remove(localpath)
+        os.replace(temp_path, localfile)
+        if previous is not None and previous != sha256:
+            self.release(previous)
+
+    def release(self, sha256):
+        """
+        Remove a stored file once nothing uses it: it is not the latest from any
+        url, no raw file is hard linked to it (it has one link, its own)
+        and none of the symbolic links made to it are still there
+        :param sha256: str hex digest
+        :return: bool, True if it was removed
+        """
+        blob = self.path(sha256)
+        try:
+            if os.stat(blob).st_nlink > 1:
+                return False
+        except FileNotFoundError:
+            return False
+        if any(entry.get('sha256') == sha256 for entry in self.index.load().values()):
+            return False
+        for localpath, entry in self.symlinks.load().items():
+            if entry['sha256'] == sha256 and os.path.islink(localpath) and \
+                    os.path.realpath(localpath) == os.path.realpath(blob):
+                return False
+        LOG.info("Removing %s, no longer used", blob)
+        os.remove(blob)
+        return True
@@ -26,8 +26,23 @@ class CurieUtil(object):
             self.uri_map = {}
             for key, value in curie_map.items():
                 self.uri_map[value] = key
+            self.uri_trie = self._make_trie(self.uri_map)
         return
 
+    @staticmethod
+    def _make_trie(uri_map):
+        '''
+        Character trie of base IRIs; nested dicts keyed by character,
+        the None key of a node holds the prefix of the base IRI ending there
+        '''
+        trie = {}
+        for base, prefix in uri_map.items():
+            node = trie
+            for char in base:
+                node = node.setdefault(char, {})
+            node[None] = prefix
+        return trie
+
     def get_curie(self, uri):
         '''Get a CURIE from a URI '''
         prefix = self.get_curie_prefix(uri)
@@ -36,12 +51,22 @@ class CurieUtil(object):
             return f'{prefix}:{uri[len(key):len(uri)]}'
         return None
 
+    def get_curies(self, uris):
+        '''Get a CURIE (or None) for each of an iterable of URIs '''
+        get_curie = self.get_curie
+        return [get_curie(uri) for uri in uris]
+
     def get_curie_prefix(self, uri):
-        ''' Return the CURIE's prefix:'''
-        for key, value in self.uri_map.items():
-            if uri.startswith(key):  # no... need the longest match not the first match
-                return value
-        return None
+        ''' Return the CURIE's prefix, the one with the longest matching base IRI'''
+        node = self.uri_trie
+        prefix = node.get(None)
+        for char in uri:
+            node = node.get(char)
+            if node is None:
+                break
+            if None in node:
+                prefix = node[None]
+        return prefix
 
     def get_uri(self, curie):
         ''' Get a URI from a CURIE '''
@@ -0,0 +1,175 @@
+import os
+import shutil
+import logging
+import urllib.parse
+from abc import ABCMeta, abstractmethod
+from datetime import datetime, timedelta
+from email.utils import formatdate
+
+from dipper.utils.FileManifest import FileManifest, MANIFEST
+
+LOG = logging.getLogger(__name__)
+
+MISSES = '.dippercache_misses.json'
+MISS_TTL = timedelta(days=1)  # how long a file found absent is not asked for again
+
+
+class DipperCache(metaclass=ABCMeta):
+    """
+    Where Source.get_files() looks for a source's files before their origin,
+    by location:
+        'https://archive.monarchinitiative.org/DipperCache'   HTTPCache
+        '/mnt/mirror/DipperCache' or 'file:///mnt/...'        DirectoryCache
+        None or 'none'                                        NoCache
+    Files are looked for as <location>/<source name>/<file>.
+    """
+
+    @staticmethod
+    def create(location):
+        """
+        :param location: str url or directory, or None
+        :return: DipperCache
+        """
+        if location is None or location.lower() in ('', 'none'):
+            return NoCache()
+        scheme = urllib.parse.urlsplit(location).scheme
+        if scheme in ('http', 'https', 'ftp'):
+            return HTTPCache(location)
+        if scheme == 'file':
+            return DirectoryCache(
+                urllib.parse.unquote(urllib.parse.urlsplit(location).path))
+        return DirectoryCache(location)
+
+    @abstractmethod
+    def location(self, name, filename):
+        """
+        :return: str where the cached copy of a source's file would be
+        """
+        pass
+
+    @abstractmethod
+    def fetch(self, source, filename, localfile, is_dl_forced):
+        """
+        Put the cached copy of one of source's files at localfile
+        :param source: Source
+        :param filename: str as in the source's files dict
+        :param localfile: str path
+        :param is_dl_forced: boolean
+        :return: (bool found, datetime of the cached copy or None)
+        """
+        pass
+
+
+class NoCache(DipperCache):
+    """
+    Fetch everything from its origin
+    """
+
+    def location(self, name, filename):
+        return ''
+
+    def fetch(self, source, filename, localfile, is_dl_forced):
+        return False, None
+
+
+class HTTPCache(DipperCache):
+    """
+    A web server mirroring source files (the Monarch DipperCache by default).
+
+    Most files are not cached, asking for them costs a round trip per file
+    on every fetch; files found absent are noted (in raw/<source>/) and
+    not asked for again for MISS_TTL, unless the download is forced.
+    """
+
+    def __init__(self, url):
+        self.url = url.rstrip('/')
+
+    def location(self, name, filename):
+        return '/'.join((self.url, name, filename))
+
+    def fetch(self, source, filename, localfile, is_dl_forced):
+        remote = self.location(source.name, filename)
+        misses = FileManifest(os.path.dirname(localfile), MISSES)
+        if not is_dl_forced:
+            missed = misses.get(remote)
+            if missed is not None and datetime.utcnow() - \
+                    datetime.fromisoformat(missed['missed']) < MISS_TTL:
+                LOG.info("Not asking for %s, absent at %s", remote, missed['missed'])
+                return False, None
+        if source.fetch_from_url(remote, localfile, is_dl_forced):
+            return True, source.remote_file_timestamps.get(remote)
+        misses.update(
+            remote, {'missed': datetime.utcnow().isoformat(timespec='seconds')})
+        return False, None
+
+
+class DirectoryCache(DipperCache):
+    """
+    A directory (local or e.g. NFS mounted) laid out like the DipperCache,
+    for builds without network access to it.
+
+    Cached files are hard linked into raw/<source>/ where possible, else
+    copied with copy_file_range(), which file systems able to share extents
+    (btrfs, XFS, NFS 4.2 server side copy ...) do without copying bytes.
+    Hard linked files are shared with the mirror: keep it read only.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def location(self, name, filename):
+        return os.path.join(self.directory, name, filename)
+
+    def fetch(self, source, filename, localfile, is_dl_forced):
+        cached = self.location(source.name, filename)
+        if not os.path.isfile(cached):
+            return False, None
+        cached_stat = os.stat(cached)
+        if os.path.exists(localfile) and os.path.samefile(cached, localfile):
+            LOG.info("%s is linked to %s", localfile, cached)
+        else:
+            temp_path = localfile + '.link'
+            if os.path.lexists(temp_path):
+                os.remove(temp_path)
+            try:
+                os.link(cached, temp_path)
+            except OSError:  # e.g. across file systems
+                self.copy(cached, temp_path)
+                os.utime(
+                    temp_path, ns=(cached_stat.st_atime_ns, cached_stat.st_mtime_ns))
+            os.replace(temp_path, localfile)
+            LOG.info("Took %s from %s", localfile, cached)
+
+        # where it came from
+        FileManifest(os.path.dirname(localfile), MANIFEST).update(
+            os.path.basename(localfile), {
+                'url': 'file://' + urllib.parse.quote(os.path.abspath(cached)),
+                'etag': None,
+                'last_modified': formatdate(cached_stat.st_mtime, usegmt=True),
+                'size': cached_stat.st_size,
+                'sha256': None,
+                'retrieved': datetime.utcnow().isoformat(timespec='seconds')})
+        return True, datetime.utcfromtimestamp(cached_stat.st_mtime)
+
+    @staticmethod
+    def copy(src, dst):
+        """
+        Copy a file, sharing its blocks where the file system can
+        """
+        with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+            try:
+                remaining = os.fstat(fsrc.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(
+                        fsrc.fileno(), fdst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+                if remaining == 0:
+                    return
+            except (AttributeError, OSError):  # no copy_file_range here
+                pass
+            fsrc.seek(0)
+            fdst.seek(0)
+            fdst.truncate()
+            shutil.copyfileobj(fsrc, fdst)
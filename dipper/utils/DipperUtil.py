@@ -2,6 +2,9 @@ import logging
 import unicodedata
 import requests
 
+from dipper.utils.EUtils import EUtils
+from dipper.utils.HGNCSymbols import HGNCSymbols
+
 __author__ = 'nlw'
 LOG = logging.getLogger(__name__)
 
@@ -10,11 +13,6 @@ ADAPTER = requests.adapters.HTTPAdapter(max_retries=3)
 SESSION.mount('https://', ADAPTER)
 SESSION.mount('http://', ADAPTER)
 
-EUTIL = 'https://eutils.ncbi.nlm.nih.gov/entrez/eutils'
-ESEARCH = EUTIL + '/esearch.fcgi'
-ESUMMARY = EUTIL + '/esummary.fcgi'
-EREQ = {'email': 'info@monarchinitiative.org', 'tool': 'Dipper'}
-
 
 class DipperUtil:
     """
@@ -29,6 +27,7 @@ class DipperUtil:
 
     restructuring to make bulk queries
     is less likely to result in another ban for peppering them with one offs
+    (so, with lists to look up, use dipper.utils.EUtils directly)
 
     """
     @staticmethod
@@ -52,60 +51,14 @@ class DipperUtil:
         :return:
 
         """
-        req = {'db': 'taxonomy', 'retmode': 'json', 'term': label}
-        req.update(EREQ)
-
-        request = SESSION.get(ESEARCH, params=req)
-        LOG.info('fetching: %s', request.url)
-        request.raise_for_status()
-        result = request.json()['esearchresult']
-
-        # Occasionally eutils returns the json blob
-        # {'ERROR': 'Invalid db name specified: taxonomy'}
-        if 'ERROR' in result:
-            request = SESSION.get(ESEARCH, params=req)
-            LOG.info('fetching: %s', request.url)
-            request.raise_for_status()
-            result = request.json()['esearchresult']
-
-        tax_num = None
-        if 'count' in result and str(result['count']) == '1':
-            tax_num = result['idlist'][0]
-        else:
-            # TODO throw errors
-            LOG.warning('ESEARCH for taxon label "%s"  returns %s', label, str(result))
-
-        return tax_num
+        return EUtils().taxon_nums_by_label([label])[label]
 
     @staticmethod
     def get_homologene_by_gene_num(gene_num):
-        # first, get the homologene id from the gene id
-        # gene_id = '1264'  for testing
-        req = {
-            'db': 'homologene',
-            'retmode': 'json',
-            'term': str(gene_num) + "[Gene ID]",
-            # 'usehistory': None  # y/n
-            # 'rettype':  [uilist|count]
-        }
-        req.update(EREQ)
-        ereq = requests.get(ESEARCH, params=req)
-        homologene_ids = ereq.json()['esearchresult']['idlist']
-        if len(homologene_ids) != 1:
-            return
-        hid = homologene_ids[0]
-        # now, fetch the homologene record
-        req = {'db': 'homologene', 'id': hid, 'retmode': 'json'}
-        req.update(EREQ)
-        request = SESSION.get(ESUMMARY, params=req)
-        data = request.json()
-
-        if 'result' in data and hid in data['result']:
-            homologs = data['result'][hid]
-        else:
-            homologs = None
-
-        return homologs
+        """
+        :return: the esummary of the HomoloGene group holding the gene, or None
+        """
+        return EUtils().homologenes_by_gene_num([gene_num])[str(gene_num)]
 
     @staticmethod
     def is_id_in_mondo(curie, mondo_min):
@@ -115,6 +68,9 @@ class DipperUtil:
                 https://github.com/monarch-initiative/mondo/releases/
                 download/2019-04-06/mondo-minimal.json
         :return: boolean, true if ID is in mondo and false otherwise
+
+        (this reads every xref, every time; to ask about many IDs
+        use a dipper.utils.MondoIndex)
         """
         xref_curies = []
         for node in mondo_min['graphs'][0]['nodes']:
@@ -127,17 +83,23 @@ class DipperUtil:
     @staticmethod
     def get_hgnc_id_from_symbol(gene_symbol):
         """
-        Get HGNC curie from symbol using monarch and mygene services
+        Get HGNC curie from symbol, with the index of HGNC symbols when
+        the HGNC ingest has made one (see HGNCSymbols),
+        else using monarch and mygene services
         :param gene_symbol:
         :return:
         """
+        symbols = HGNCSymbols.get()
+        if symbols is not None:
+            return symbols.resolve(gene_symbol)
+
         monarch_url = 'https://solr.monarchinitiative.org/solr/search/select'
         params = DipperUtil._get_solr_weight_settings()
         params["q"] = "{0} \"{0}\"".format(gene_symbol)
         params["fq"] = ["taxon:\"NCBITaxon:9606\"", "category:\"gene\""]
         gene_id = None
         try:
-            monarch_request = requests.get(monarch_url, params=params)
+            monarch_request = SESSION.get(monarch_url, params=params)
             response = monarch_request.json()
             count = response['response']['numFound']
             if count > 0:
@@ -0,0 +1,183 @@
+import os
+import logging
+from datetime import datetime, timedelta
+
+import requests
+
+from dipper.utils.FileManifest import FileManifest
+from dipper.utils.TokenBucket import TokenBucket
+
+LOG = logging.getLogger(__name__)
+
+EUTIL = 'https://eutils.ncbi.nlm.nih.gov/entrez/eutils'
+EREQ = {'email': 'info@monarchinitiative.org', 'tool': 'Dipper'}
+CACHE_DIR = 'raw/.eutils'
+
+SESSION = requests.Session()
+ADAPTER = requests.adapters.HTTPAdapter(max_retries=3)
+SESSION.mount('https://', ADAPTER)
+SESSION.mount('http://', ADAPTER)
+
+# NCBI asks for no more than three requests a second (from anywhere in the process)
+RATE = 3
+BUCKET = TokenBucket(RATE)
+
+
+class EUtils:
+    """
+    Bulk lookups with the NCBI E-utilities
+    (https://www.ncbi.nlm.nih.gov/books/NBK25497/)
+
+    Lists of terms are POSTed to esearch in batches of BATCH, ORed together,
+    and kept on the History server; their summaries are then paged out of it
+    with esummary, RETMAX at a time. So a few thousand labels or ids take
+    a handful of requests rather than one (or two) each,
+    while one label or id takes no more requests than asking for it alone.
+
+    Answers, including the absence of one, are kept in <cachedir>/<lookup>.json
+    for MAX_AGE, and all requests share one rate limit of RATE per second.
+
+    usage:
+        eutils = EUtils()
+        eutils.taxon_nums_by_label(['Mus musculus', 'Danio rerio'])
+        -> {'Mus musculus': '10090', 'Danio rerio': '7955'}
+    """
+
+    BATCH = 200
+    RETMAX = 500
+    MAX_AGE = timedelta(days=30)
+
+    def __init__(self, cachedir=CACHE_DIR, url=EUTIL):
+        self.cachedir = cachedir
+        self.url = url
+        os.makedirs(cachedir, exist_ok=True)
+
+    def taxon_nums_by_label(self, labels):
+        """
+        Look up NCBI Taxon ids using some kind of label (scientific or common name).
+        A label only gets an id if there is a unique hit.
+
+        :param labels: iterable of str
+        :return: dict of label -> str taxon number, or None
+        """
+        return self._cached('taxon', labels, self._fetch_taxon_nums)
+
+    def homologenes_by_gene_num(self, gene_nums):
+        """
+        Fetch the HomoloGene group summary holding each NCBI gene.
+        A gene only gets a summary if it is in exactly one group.
+
+        :param gene_nums: iterable of NCBI gene numbers (int or str)
+        :return: dict of str gene number -> dict esummary of the group, or None
+        """
+        return self._cached(
+            'homologene', (str(num) for num in gene_nums), self._fetch_homologenes)
+
+    def _cached(self, lookup, keys, fetch):
+        """
+        Answer keys from the cache, fetching (and keeping) what it lacks
+        """
+        keys = list(dict.fromkeys(keys))
+        cache = FileManifest(self.cachedir, lookup + '.json')
+        known = cache.load()
+        oldest = (datetime.utcnow() - self.MAX_AGE).isoformat(timespec='seconds')
+        answers = {
+            key: known[key]['value'] for key in keys
+            if key in known and known[key]['retrieved'] >= oldest}
+        wanted = [key for key in keys if key not in answers]
+        if wanted:
+            LOG.info(
+                "Looking up %i %s, %i were cached", len(wanted), lookup, len(answers))
+            fetched = fetch(wanted)
+            retrieved = datetime.utcnow().isoformat(timespec='seconds')
+            cache.update_all({
+                key: {'value': fetched.get(key), 'retrieved': retrieved}
+                for key in wanted})
+            answers.update((key, fetched.get(key)) for key in wanted)
+        return answers
+
+    def _fetch_taxon_nums(self, labels):
+        found = {}
+        # a lone label is asked for directly, one request rather than two
+        if len(labels) > 1:
+            for batch in self._batches(labels):
+                term = ' OR '.join('"{}"[All Names]'.format(label) for label in batch)
+                summaries = self._summaries('taxonomy', *self._search('taxonomy', term))
+                hits = {}
+                for uid, summary in summaries.items():
+                    for name in ('scientificname', 'commonname'):
+                        if summary.get(name):
+                            hits.setdefault(summary[name].lower(), set()).add(uid)
+                for label in batch:
+                    uids = hits.get(label.lower(), set())
+                    if len(uids) == 1:
+                        found[label] = uids.pop()
+
+        # names (e.g. synonyms) not in a summary are searched for one at a time
+        # (as are lone labels)
+        for label in labels:
+            if label not in found:
+                result = self._esearch({'db': 'taxonomy', 'term': label})
+                if str(result.get('count')) == '1':
+                    found[label] = result['idlist'][0]
+                else:
+                    LOG.warning(
+                        'ESEARCH for taxon label "%s"  returns %s', label, str(result))
+        return found
+
+    def _fetch_homologenes(self, gene_nums):
+        groups = {}
+        for batch in self._batches(gene_nums):
+            term = ' OR '.join(num + '[Gene ID]' for num in batch)
+            summaries = self._summaries('homologene', *self._search('homologene', term))
+            wanted = set(batch)
+            for summary in summaries.values():
+                for homolog in summary.get('homologenedatalist', ()):
+                    gene_num = str(homolog.get('geneid'))
+                    if gene_num in wanted:
+                        groups.setdefault(gene_num, []).append(summary)
+        return {
+            gene_num: homologs[0] for gene_num, homologs in groups.items()
+            if len(homologs) == 1}
+
+    def _batches(self, keys):
+        return [keys[acc:acc + self.BATCH] for acc in range(0, len(keys), self.BATCH)]
+
+    def _search(self, db, term):
+        """
+        Keep the ids matching term on the History server
+        :return: (int count, str webenv, str query_key)
+        """
+        result = self._esearch(
+            {'db': db, 'term': term, 'usehistory': 'y', 'retmax': 0})
+        return int(result.get('count', 0)), result.get('webenv'), result.get('querykey')
+
+    def _esearch(self, params):
+        result = self._post('esearch.fcgi', params)['esearchresult']
+        # Occasionally eutils returns the json blob
+        # {'ERROR': 'Invalid db name specified: taxonomy'}
+        if 'ERROR' in result:
+            result = self._post('esearch.fcgi', params)['esearchresult']
+        return result
+
+    def _summaries(self, db, count, webenv, query_key):
+        """
+        Page the summaries of a search out of the History server
+        :return: dict of uid -> summary
+        """
+        summaries = {}
+        for retstart in range(0, count, self.RETMAX):
+            result = self._post('esummary.fcgi', {
+                'db': db, 'WebEnv': webenv, 'query_key': query_key,
+                'retstart': retstart, 'retmax': self.RETMAX}).get('result', {})
+            for uid in result.get('uids', ()):
+                summaries[uid] = result[uid]
+        return summaries
+
+    def _post(self, utility, params):
+        data = dict(params, retmode='json', **EREQ)
+        BUCKET.take()
+        request = SESSION.post('/'.join((self.url, utility)), data=data)
+        LOG.info('fetching: %s', request.url)
+        request.raise_for_status()
+        return request.json()
@@ -0,0 +1,97 @@
+import os
+import json
+import fcntl
+import logging
+from contextlib import contextmanager
+
+LOG = logging.getLogger(__name__)
+
+MANIFEST = '.manifest.json'
+
+
+class FileManifest:
+    """
+    What is known about the files downloaded into a directory (e.g. raw/<source>/),
+    kept beside them in a small json file keyed by file name:
+
+        {"genes.txt": {
+            "url": "https://...", "etag": "\"5e1f-...\"",
+            "last_modified": "Thu, 07 Aug 2008 16:20:19 GMT",
+            "size": 24095, "sha256": "9f86d0...", "retrieved": "2020-01-01T12:00:00"}}
+
+    The validators let a refresh ask the server for the file only if it changed
+    (If-None-Match / If-Modified-Since), the size and digest tell whether the
+    local copy is still the file that was fetched.
+
+    Files of one directory may be fetched on several threads (or processes) at once,
+    updates are serialized by a lock on a '.lock' file beside the manifest
+    and written by atomic rename.
+    """
+
+    def __init__(self, directory, name=MANIFEST):
+        self.path = os.path.join(directory, name)
+
+    @contextmanager
+    def _lock(self):
+        # flock() locks belong to the open file, so they hold between threads too
+        with open(self.path + '.lock', 'a') as lockfile:
+            fcntl.flock(lockfile, fcntl.LOCK_EX)
+            yield
+
+    def load(self):
+        """
+        :return: dict of file name -> entry, empty if there is no (readable) manifest
+        """
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r') as manifest:
+                return json.load(manifest)
+        except (OSError, ValueError) as err:
+            LOG.warning("Ignoring unreadable manifest %s: %s", self.path, err)
+            return {}
+
+    def get(self, filename):
+        """
+        :param filename: str name of a file in the directory
+        :return: dict entry for the file or None
+        """
+        with self._lock():
+            return self.load().get(filename)
+
+    def update(self, filename, entry):
+        """
+        Record (replace) the entry for a file
+        :param filename: str name of a file in the directory
+        :param entry: dict
+        """
+        with self._lock():
+            manifest = self.load()
+            manifest[filename] = entry
+            self._write(manifest)
+
+    def update_all(self, entries):
+        """
+        Record (replace) the entries for several files at once
+        :param entries: dict of file name -> entry
+        """
+        with self._lock():
+            manifest = self.load()
+            manifest.update(entries)
+            self._write(manifest)
+
+    def remove(self, filename):
+        """
+        Forget a file
+        :param filename: str name of a file in the directory
+        """
+        with self._lock():
+            manifest = self.load()
+            if manifest.pop(filename, None) is not None:
+                self._write(manifest)
+
+    def _write(self, manifest):
+        temp_path = '{}.{}.tmp'.format(self.path, os.getpid())
+        with open(temp_path, 'w') as temp:
+            json.dump(manifest, temp, indent=1, sort_keys=True)
+        os.replace(temp_path, self.path)
@@ -1,10 +1,15 @@
+import os
+import json
 import logging
 import hashlib
+import urllib.request
 
 from xml.sax import SAXParseException
 from collections import defaultdict
-from rdflib import URIRef, ConjunctiveGraph, util as rdflib_util
+from rdflib import URIRef, Literal, ConjunctiveGraph, util as rdflib_util
 from rdflib.namespace import DCTERMS, RDF, OWL
+# importing the nt serializer registers its '_rdflib_nt_escape' codec error handler
+from rdflib.plugins.serializers.nt import _quoteLiteral
 
 from dipper.utils.CurieUtil import CurieUtil
 
@@ -12,9 +17,34 @@ __author__ = 'nlw'
 
 LOG = logging.getLogger(__name__)
 
+WRITE_BUFFER = 2**20    # bytes of output buffered between write syscalls
+LINES_PER_WRITE = 2**13  # lines joined and encoded per write
+TERM_CACHE_SIZE = 2**16  # n3 strings of IRIs & bnodes memoized while writing
+
+GH = 'https://raw.githubusercontent.com'
+OBO = 'http://purl.obolibrary.org/obo'
+# ontologies consulted for the types of the properties used in an ingest
+PROPERTY_ONTOLOGIES = [
+    OBO + '/sepio.owl',
+    OBO + '/geno.owl',
+    OBO + '/iao.owl',
+    OBO + '/ero.owl',
+    OBO + '/pco.owl',
+    OBO + '/xco.owl',
+    OBO + '/ro.owl',
+    GH + '/jamesmalone/OBAN/master/ontology/oban_core.ttl',
+]
+PROPERTY_TYPES = ('ObjectProperty', 'AnnotationProperty', 'DatatypeProperty')
+PROPERTY_INDEX_DIR = 'raw/ontology_properties'  # cached property type indexes
+VERSION_TIMEOUT = 30    # seconds to wait on an ontology's version (HEAD) check
+
 
 class GraphUtils:
 
+    # ontology (url or path) -> property type -> frozenset of property IRIs
+    # reused by every source in the process
+    property_indexes = {}
+
     def __init__(self, curie_map):
         self.curie_map = curie_map
         self.cu = CurieUtil(curie_map)
@@ -28,105 +58,301 @@ class GraphUtils:
         this will write raw triples in rdfxml, unless specified.
         to write turtle, specify format='turtle'
         an optional file can be supplied instead of stdout
-        :return: None
+
+        'nt' & 'nquads' files skip rdflib serialize() and are streamed
+        line by line from the store via write_ntriples()
+        :return: int count of triples written to file when known, else None
 
         """
 
         filewriter = None
+        triple_count = None
         if fileformat is None:
             fileformat = 'turtle'
         if filename is not None:
 
-            with open(filename, 'wb') as filewriter:
+            with open(filename, 'wb', buffering=WRITE_BUFFER) as filewriter:
                 LOG.info("Writing triples in %s to %s", fileformat, filename)
-                # rdflib serialize
-                graph.serialize(filewriter, format=fileformat)
+                if fileformat in ('nt', 'nquads'):
+                    triple_count = GraphUtils.write_ntriples(
+                        graph, filewriter, fileformat)
+                else:
+                    # rdflib serialize
+                    graph.serialize(filewriter, format=fileformat)
         else:
             print(graph.serialize(fileformat).decode())
-        return
+        return triple_count
 
     @staticmethod
-    def get_properties_from_graph(graph):
+    def write_ntriples(graph, stream, fileformat='nt'):
         """
-        Wrapper for RDFLib.graph.predicates() that returns a unique set
-        :param graph: RDFLib.graph
-        :return: set, set of properties
+        Write the graph's triples to a binary stream as N-Triples (or N-Quads)
+        without building rdflib's serializer machinery around each row.
+
+        Output is byte for byte what rdflib's 'nt' and 'nquads' serializers
+        produce; triples are visited in the same order, terms are escaped
+        the same way, and the same trailing blank line is written.
+        The n3 form of recurring IRIs is memoized and lines are encoded
+        in large batches to keep per-triple overhead down.
+
+        Graphs which already hold their terms in n3 form (e.g. CompactGraph)
+        supply their own lines through an nt_lines(fileformat) generator.
+
+        :param graph: rdflib (conjunctive) graph or dipper graph with nt_lines()
+        :param stream: binary file-like object
+        :param fileformat: 'nt' or 'nquads'
+        :return: int count of triples written
         """
-        # collapse to single list
-        property_set = list()
-        for row in graph.predicates():
-            property_set.append(row)
+        if fileformat == 'nquads':
+            encoding, errors = 'UTF-8', 'replace'
+        elif fileformat == 'nt':
+            encoding, errors = 'ascii', '_rdflib_nt_escape'
+        else:
+            raise ValueError("Can not stream {} as ntriples".format(fileformat))
+
+        if hasattr(graph, 'nt_lines'):
+            rows = graph.nt_lines(fileformat)
+        else:
+            rows = GraphUtils._rdflib_nt_lines(graph, fileformat)
 
-        return set(property_set)
+        triple_count = 0
+        lines = []
+        for line in rows:
+            lines.append(line)
+            if len(lines) >= LINES_PER_WRITE:
+                stream.write(''.join(lines).encode(encoding, errors))
+                triple_count += len(lines)
+                lines = []
+        stream.write(''.join(lines).encode(encoding, errors))
+        triple_count += len(lines)
+        stream.write(b'\n')
+
+        return triple_count
 
     @staticmethod
-    def add_property_axioms(graph, properties):
-        ontology_graph = ConjunctiveGraph()
-        GH = 'https://raw.githubusercontent.com'
-        OBO = 'http://purl.obolibrary.org/obo'
-        ontologies = [
-            OBO + '/sepio.owl',
-            OBO + '/geno.owl',
-            OBO + '/iao.owl',
-            OBO + '/ero.owl',
-            OBO + '/pco.owl',
-            OBO + '/xco.owl',
-            OBO + '/ro.owl',
-            GH + '/jamesmalone/OBAN/master/ontology/oban_core.ttl',
-        ]
+    def _rdflib_nt_lines(graph, fileformat='nt'):
+        """
+        Generate N-Triples (or N-Quads) lines from an rdflib graph
+        in the order rdflib's own serializers visit them
+        :param graph: rdflib (conjunctive) graph
+        :param fileformat: 'nt' or 'nquads'
+        :return: generator of str lines
+        """
+        if fileformat == 'nquads':
+            if not graph.store.context_aware:
+                raise Exception(
+                    "NQuads serialization only makes "
+                    "sense for context-aware stores!")
+            rows = (
+                (triple, context.identifier)
+                for context in graph.store.contexts() for triple in context)
+        else:
+            rows = ((triple, None) for triple in graph)
 
-        # random timeouts can waste hours. (too many redirects?)
-        # there is a timeout param in urllib.request,
-        # but it is not exposed by rdflib.parsing
-        # so retry once on URLError
-        for ontology in ontologies:
-            LOG.info("parsing: " + ontology)
+        term_n3 = {}
+
+        def n3(term):
+            if isinstance(term, Literal):
+                return _quoteLiteral(term)
             try:
-                ontology_graph.parse(
-                    ontology, format=rdflib_util.guess_format(ontology))
-            except SAXParseException as e:
-                LOG.error(e)
-                LOG.error('Retrying as turtle: ' + ontology)
-                ontology_graph.parse(ontology, format="turtle")
-            except OSError as e:  # URLError:
-                # simple retry
-                LOG.error(e)
-                LOG.error('Retrying: ' + ontology)
-                ontology_graph.parse(
-                    ontology, format=rdflib_util.guess_format(ontology))
-
-        # Get object properties
-        graph = GraphUtils.add_property_to_graph(
-            ontology_graph.subjects(RDF['type'], OWL['ObjectProperty']),
-            graph, OWL['ObjectProperty'], properties)
-
-        # Get annotation properties
-        graph = GraphUtils.add_property_to_graph(
-            ontology_graph.subjects(RDF['type'], OWL['AnnotationProperty']),
-            graph, OWL['AnnotationProperty'], properties)
-
-        # Get data properties
-        graph = GraphUtils.add_property_to_graph(
-            ontology_graph.subjects(RDF['type'], OWL['DatatypeProperty']),
-            graph, OWL['DatatypeProperty'], properties)
-
-        for row in graph.predicates(DCTERMS['source'], OWL['AnnotationProperty']):
-            if row == RDF['type']:
-                graph.remove(
-                    (DCTERMS['source'], RDF['type'], OWL['AnnotationProperty']))
-        graph.add((DCTERMS['source'], RDF['type'], OWL['ObjectProperty']))
+                return term_n3[term]
+            except KeyError:
+                if len(term_n3) >= TERM_CACHE_SIZE:
+                    term_n3.clear()
+                term_n3[term] = text = term.n3()
+                return text
+
+        for (subj, pred, obj), context in rows:
+            if context is None:
+                yield ' '.join((n3(subj), n3(pred), n3(obj), '.\n'))
+            else:
+                yield ' '.join((n3(subj), n3(pred), n3(obj), n3(context), '.\n'))
+
+    @staticmethod
+    def get_properties_from_graph(graph):
+        """
+        The unique set of predicates used in a graph.
+        Dipper graphs keep count of their predicates as triples are added,
+        anything else (e.g. a plain rdflib graph) is scanned with predicates()
+        :param graph: dipper or RDFLib graph
+        :return: set, set of properties
+        """
+        if hasattr(graph, 'predicate_counts'):
+            return set(graph.predicate_counts)
+        return set(graph.predicates())
+
+    @staticmethod
+    def add_property_axioms(
+            graph, properties, index_dir=PROPERTY_INDEX_DIR, offline=False):
+        """
+        Declare the type (owl:ObjectProperty, owl:AnnotationProperty,
+        owl:DatatypeProperty) of those properties the PROPERTY_ONTOLOGIES know of.
+        :param graph: dipper graph to add the axioms to
+        :param properties: set of property URIRefs used in the graph
+        :param index_dir: str directory of cached ontology property indexes
+        :param offline: bool, use the cached indexes without asking for new versions
+        :return: the graph
+        """
+        property_types = GraphUtils.get_property_types(
+            PROPERTY_ONTOLOGIES, index_dir, offline)
+
+        # Collect the axioms first, so graphs which can not be queried
+        # or edited (i.e. a StreamedGraph) can take them too
+        properties = set(properties)
+        axioms = []
+        for property_type in PROPERTY_TYPES:
+            for row in sorted(property_types[property_type] & properties):
+                axioms.append((row, RDF['type'], OWL[property_type]))
+
+        # dcterms:source is used as an object property here
+        source_axiom = (DCTERMS['source'], RDF['type'], OWL['AnnotationProperty'])
+        if hasattr(graph, 'remove'):
+            graph.remove(source_axiom)
+        axioms.append((DCTERMS['source'], RDF['type'], OWL['ObjectProperty']))
 
         # Hardcoded properties
-        graph.add((
+        axioms.append((
             URIRef('https://monarchinitiative.org/MONARCH_cliqueLeader'), RDF['type'],
             OWL['AnnotationProperty']))
 
-        graph.add((
+        axioms.append((
             URIRef('https://monarchinitiative.org/MONARCH_anonymous'), RDF['type'],
             OWL['AnnotationProperty']))
 
+        for axiom in dict.fromkeys(axioms):  # unique, in order
+            if axiom != source_axiom:
+                graph.add(axiom)
+
         return graph
 
+    @staticmethod
+    def get_property_types(
+            ontologies=PROPERTY_ONTOLOGIES, index_dir=PROPERTY_INDEX_DIR,
+            offline=False):
+        """
+        Which IRIs the ontologies declare to be properties, by property type
+        :param ontologies: list of ontology urls (or local paths)
+        :param index_dir: str directory of cached ontology property indexes
+        :param offline: bool, use the cached indexes without asking for new versions
+        :return: dict of property type -> set of property URIRefs
+        """
+        property_types = {property_type: set() for property_type in PROPERTY_TYPES}
+        for ontology in ontologies:
+            index = GraphUtils.get_property_index(ontology, index_dir, offline)
+            for property_type in PROPERTY_TYPES:
+                property_types[property_type] |= index[property_type]
+        return property_types
+
+    @staticmethod
+    def get_property_index(ontology, index_dir=PROPERTY_INDEX_DIR, offline=False):
+        """
+        The properties an ontology declares, by type.
+        Parsing an ontology takes minutes so its index is kept (as json)
+        in index_dir along with the version (ETag, Last-Modified ...) it was built from
+        and only rebuilt once the ontology has a new version.
+        Indexes are also kept in memory for the life of the process.
+
+        :param ontology: str ontology url (or local path)
+        :param index_dir: str directory of cached ontology property indexes
+        :param offline: bool, use a cached index without asking for a new version
+        :return: dict of property type -> frozenset of property URIRefs
+        """
+        if ontology in GraphUtils.property_indexes:
+            return GraphUtils.property_indexes[ontology]
+
+        index_file = os.path.join(index_dir, os.path.basename(ontology) + '.json')
+        cached = None
+        if os.path.exists(index_file):
+            with open(index_file) as index_handle:
+                cached = json.load(index_handle)
+
+        version = None
+        if cached is not None and offline:
+            LOG.info("Using %s offline", index_file)
+        elif offline:
+            raise FileNotFoundError(
+                "No property index {} for {} to use offline".format(
+                    index_file, ontology))
+        else:
+            version = GraphUtils.get_ontology_version(ontology)
+            if cached is not None and version is None:
+                LOG.warning(
+                    "Can not tell if %s changed, using %s", ontology, index_file)
+            elif cached is not None and cached['version'] != version:
+                LOG.info(
+                    "%s changed (%s to %s)", ontology, cached['version'], version)
+                cached = None
+
+        if cached is None:
+            ontology_graph = GraphUtils.parse_ontology(ontology)
+            cached = {'ontology': ontology, 'version': version}
+            for property_type in PROPERTY_TYPES:
+                cached[property_type] = sorted(
+                    str(row) for row in ontology_graph.subjects(
+                        RDF['type'], OWL[property_type]) if isinstance(row, URIRef))
+            os.makedirs(index_dir, exist_ok=True)
+            # sources running in parallel (dipper-etl.py --jobs) may race to write it
+            tmp_file = '{}.{}.tmp'.format(index_file, os.getpid())
+            with open(tmp_file, 'w') as index_handle:
+                json.dump(cached, index_handle, indent=1)
+            os.replace(tmp_file, index_file)
+            LOG.info("Wrote %s", index_file)
+
+        index = {
+            property_type: frozenset(URIRef(iri) for iri in cached[property_type])
+            for property_type in PROPERTY_TYPES}
+        GraphUtils.property_indexes[ontology] = index
+        return index
+
+    @staticmethod
+    def get_ontology_version(ontology):
+        """
+        Something which changes when the ontology does, without fetching it
+        :param ontology: str ontology url (or local path)
+        :return: str ETag, Last-Modified or Content-Length; None if unknown
+        """
+        if os.path.exists(ontology):
+            fstat = os.stat(ontology)
+            return '{}-{}'.format(fstat.st_size, fstat.st_mtime_ns)
+        request = urllib.request.Request(ontology, method='HEAD')
+        try:
+            with urllib.request.urlopen(request, timeout=VERSION_TIMEOUT) as response:
+                headers = response.info()
+        except OSError as err:  # URLError, timeouts
+            LOG.error('%s\n\tFor: %s', err, ontology)
+            return None
+        for header in ('ETag', 'Last-Modified', 'Content-Length'):
+            if headers.get(header):
+                return '{}: {}'.format(header, headers.get(header))
+        return None
+
+    @staticmethod
+    def parse_ontology(ontology):
+        """
+        :param ontology: str ontology url (or local path)
+        :return: rdflib ConjunctiveGraph
+        """
+        ontology_graph = ConjunctiveGraph()
+        # random timeouts can waste hours. (too many redirects?)
+        # there is a timeout param in urllib.request,
+        # but it is not exposed by rdflib.parsing
+        # so retry once on URLError
+        LOG.info("parsing: " + ontology)
+        try:
+            ontology_graph.parse(
+                ontology, format=rdflib_util.guess_format(ontology))
+        except SAXParseException as e:
+            LOG.error(e)
+            LOG.error('Retrying as turtle: ' + ontology)
+            ontology_graph.parse(ontology, format="turtle")
+        except OSError as e:  # URLError:
+            # simple retry
+            LOG.error(e)
+            LOG.error('Retrying: ' + ontology)
+            ontology_graph.parse(
+                ontology, format=rdflib_util.guess_format(ontology))
+        return ontology_graph
+
     @staticmethod
     def add_property_to_graph(results, graph, property_type, property_list):
 
@@ -170,9 +396,8 @@ class GraphUtils:
         # exist is accessed
         counts = defaultdict(lambda: defaultdict(int))
         for this_g in [graph1, graph2]:
-            for this_p in this_g.predicates():
-                counts[this_p][str(this_g.identifier)] = \
-                    counts[this_p][str(this_g.identifier)] + 1
+            for this_p, count in GraphUtils.count_predicates(this_g).items():
+                counts[this_p][str(this_g.identifier)] += count
         return counts
 
     @staticmethod
@@ -190,6 +415,9 @@ class GraphUtils:
         # dict of dicts that acts sensibly when a key that doesn't
         # exist is accessed
         counts = defaultdict(int)
+        if hasattr(graph, 'predicate_counts'):  # kept up to date by dipper graphs
+            counts.update(graph.predicate_counts)
+            return counts
         for this_p in graph.predicates():
             counts[this_p] = counts[this_p] + 1
         return counts
@@ -0,0 +1,224 @@
+import io
+import os
+import gzip
+import queue
+import shutil
+import logging
+import tempfile
+import threading
+import subprocess
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+LOG = logging.getLogger(__name__)
+
+BLOCKSIZE = 2**22  # decompressed bytes per batch of lines
+DEPTH = 8          # batches waiting for the reader at most
+# external decompressors, used (the first one found) in place of the gzip module
+# when there is a core to spare for one
+DECOMPRESSORS = ('pigz', 'igzip')
+_END = object()
+
+
+def find_decompressor():
+    """
+    :return: str path of an external decompressor, or None
+     (on a single core, where it is slower than the gzip module)
+    """
+    if (os.cpu_count() or 1) < 2:
+        return None
+    for name in DECOMPRESSORS:
+        path = shutil.which(name)
+        if path is not None:
+            return path
+    return None
+
+
+class GzipReader:
+    """
+    Read the lines of a (large) gzip file, decompressed ahead of the reader
+    on another thread, or by pigz / igzip when one is installed
+    (and there is more than one core),
+    so decompressing and parsing need not take turns on one core.
+
+    A drop-in for gzip.open(path, 'rb' | 'rt') where the file is read
+    from start to end, by iterating or readline():
+
+        with GzipReader(raw, 'rt') as tsvfile:
+            reader = csv.reader(tsvfile, delimiter='\\t')
+            ...
+
+    Lines come off the other thread in batches of about BLOCKSIZE bytes,
+    through a queue holding at most DEPTH of them. Those batches can also be
+    had as they are (batches()), or mapped over worker processes (map_batches()).
+    """
+
+    def __init__(
+            self, path, mode='rb', encoding='utf-8', errors='strict', newline=None,
+            blocksize=BLOCKSIZE, depth=DEPTH, decompressor=None):
+        """
+        :param path: str gzip file
+        :param mode: 'rb' for lines of bytes, 'rt' (or 'r') for lines of str
+        :param encoding, errors, newline: as for gzip.open() in text mode
+        :param decompressor: str path of an external decompressor (pigz -dc ...),
+         default find_decompressor(), or '' for the gzip module
+        """
+        if mode not in ('r', 'rb', 'rt'):
+            raise ValueError('GzipReader only reads, not: ' + mode)
+        if not os.path.isfile(path):
+            raise FileNotFoundError(path)
+        self.path = path
+        self.binary = mode == 'rb'
+        self.encoding = encoding
+        self.errors = errors
+        self.newline = newline
+        self.blocksize = blocksize
+        if decompressor is None:
+            decompressor = find_decompressor()
+        self.decompressor = decompressor
+        self._queue = queue.Queue(depth)
+        self._stop = threading.Event()
+        self._process = None
+        self._batch = []
+        self._pos = 0
+        self._done = False
+        self._thread = threading.Thread(target=self._produce, daemon=True)
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __iter__(self):
+        while True:
+            if self._pos < len(self._batch):
+                batch, pos = self._batch, self._pos
+                self._batch, self._pos = [], 0
+                yield from islice(batch, pos, None)
+            if not self._next_batch():
+                return
+
+    def readline(self):
+        """
+        :return: the next line, empty at the end of the file
+        """
+        if self._pos >= len(self._batch) and not self._next_batch():
+            return b'' if self.binary else ''
+        self._pos += 1
+        return self._batch[self._pos - 1]
+
+    def batches(self):
+        """
+        The lines left to read, a list at a time
+        """
+        if self._pos < len(self._batch):
+            yield self._batch[self._pos:]
+        self._batch, self._pos = [], 0
+        while self._next_batch():
+            batch = self._batch
+            self._batch = []
+            yield batch
+
+    def map_batches(self, func, workers=None):
+        """
+        func of each batch of lines, in order, computed in worker processes.
+        func (a module level function) gets a list of lines, its results are pickled
+        back, so it should return what the parent needs (e.g. rows, or triples to
+        add to its graph) rather than change anything itself.
+
+        :param func: function of a list of lines
+        :param workers: int number of processes, default the number of cores
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        with ProcessPoolExecutor(workers) as pool:
+            pending = deque()
+            for batch in self.batches():
+                pending.append(pool.submit(func, batch))
+                if len(pending) > 2 * workers:  # keep the workers busy, no more
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def _next_batch(self):
+        if self._done:
+            return False
+        item = self._queue.get()
+        if item is _END:
+            self._done = True
+            return False
+        if isinstance(item, BaseException):
+            self._done = True
+            raise item
+        self._batch, self._pos = item, 0
+        return True
+
+    def close(self):
+        self._stop.set()
+        if self._process is not None and self._process.poll() is None:
+            self._process.kill()
+        while self._thread.is_alive():  # let a blocked put() through
+            try:
+                self._queue.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        self._done = True
+        self._batch = []
+
+    def _put(self, item):
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+
+    def _lines(self, block):
+        if self.binary:
+            return io.BytesIO(block).readlines()
+        return io.StringIO(
+            block.decode(self.encoding, self.errors), newline=self.newline).readlines()
+
+    def _produce(self):
+        # a file rather than a pipe for the decompressor's stderr,
+        # which can not fill up (and stall it) while stdout is being read
+        errfile = None
+        try:
+            if self.decompressor:
+                errfile = tempfile.TemporaryFile()
+                self._process = subprocess.Popen(
+                    [self.decompressor, '-dc', self.path],
+                    stdout=subprocess.PIPE, stderr=errfile)
+                raw = self._process.stdout
+                LOG.info("Reading %s with %s", self.path, self.decompressor)
+            else:
+                raw = gzip.open(self.path, 'rb')
+            with raw:
+                remainder = b''
+                while not self._stop.is_set():
+                    block = raw.read(self.blocksize)
+                    if not block:
+                        break
+                    block = remainder + block
+                    # lines (and so characters) are not split between batches
+                    cut = block.rfind(b'\n') + 1
+                    remainder = block[cut:]
+                    if cut > 0:
+                        self._put(self._lines(block[:cut]))
+                if remainder and not self._stop.is_set():
+                    self._put(self._lines(remainder))
+            if self._process is not None:
+                if self._process.wait() != 0 and not self._stop.is_set():
+                    errfile.seek(0)
+                    raise OSError('{} could not read {}: {}'.format(
+                        self.decompressor, self.path,
+                        errfile.read().decode(errors='replace')))
+            self._put(_END)
+        except BaseException as err:  # for the reader to raise
+            self._put(err)
+        finally:
+            if errfile is not None:
+                errfile.close()
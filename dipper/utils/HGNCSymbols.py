@@ -0,0 +1,115 @@
+import os
+import gzip
+import logging
+import threading
+
+LOG = logging.getLogger(__name__)
+
+INDEX_FILE = 'hgnc_symbols.tsv.gz'
+INDEX = '/'.join(('raw', 'hgnc', INDEX_FILE))  # as written by the HGNC ingest
+
+# a symbol found in several places resolves to the best of them
+APPROVED = 0
+PREVIOUS = 1
+ALIAS = 2
+
+
+class HGNCSymbols:
+    """
+    Human gene symbols -> HGNC ids, from HGNC's complete set.
+
+    A symbol is looked for (ignoring case) among the approved symbols,
+    then the previous symbols, then the aliases of approved genes;
+    it resolves to a gene only if that is the one gene it names at
+    the first of these to have it.
+
+    The HGNC ingest writes the index as raw/hgnc/hgnc_symbols.tsv.gz
+    (symbol, HGNC id and rank per line), which DipperUtil.get_hgnc_id_from_symbol
+    then uses in place of asking the Monarch Solr service.
+
+    usage:
+        symbols = HGNCSymbols()
+        symbols.add('HGNC:5', 'A1BG', (), ())
+        symbols.resolve('a1bg')  -> 'HGNC:5'
+    """
+
+    _loaded = {}
+    _load_lock = threading.Lock()
+
+    def __init__(self):
+        self.symbols = {}  # SYMBOL -> (rank, hgnc id or None when ambiguous)
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def add(self, hgnc_id, symbol, previous_symbols, alias_symbols):
+        """
+        Add the symbols of an approved gene
+        :param hgnc_id: str 'HGNC:<num>'
+        :param symbol: str approved symbol
+        :param previous_symbols: iterable of str
+        :param alias_symbols: iterable of str
+        """
+        self._add(symbol, APPROVED, hgnc_id)
+        for prev in previous_symbols:
+            self._add(prev, PREVIOUS, hgnc_id)
+        for alias in alias_symbols:
+            self._add(alias, ALIAS, hgnc_id)
+
+    def _add(self, symbol, rank, hgnc_id):
+        symbol = symbol.strip().upper()
+        if symbol == '':
+            return
+        known = self.symbols.get(symbol)
+        if known is None or rank < known[0]:
+            self.symbols[symbol] = (rank, hgnc_id)
+        elif rank == known[0] and hgnc_id != known[1]:
+            self.symbols[symbol] = (rank, None)
+
+    def resolve(self, symbol):
+        """
+        :param symbol: str gene symbol
+        :return: str HGNC id, or None if the symbol names none, or several, genes
+        """
+        known = self.symbols.get(symbol.strip().upper())
+        if known is None:
+            return None
+        return known[1]
+
+    def write(self, path):
+        """
+        Keep the resolvable symbols in path, a gzipped tsv
+        """
+        temp_path = '{}.{}.tmp'.format(path, os.getpid())
+        with gzip.open(temp_path, 'wt') as writer:
+            for symbol in sorted(self.symbols):
+                rank, hgnc_id = self.symbols[symbol]
+                if hgnc_id is not None:
+                    writer.write('\t'.join((symbol, hgnc_id, str(rank))) + '\n')
+        os.replace(temp_path, path)
+        LOG.info("Wrote %i gene symbols to %s", len(self.symbols), path)
+
+    @staticmethod
+    def read(path):
+        """
+        :param path: str a file written by write()
+        :return: HGNCSymbols
+        """
+        symbols = HGNCSymbols()
+        with gzip.open(path, 'rt') as reader:
+            for line in reader:
+                symbol, hgnc_id, rank = line.rstrip('\n').split('\t')
+                symbols.symbols[symbol] = (int(rank), hgnc_id)
+        LOG.info("Read %i gene symbols from %s", len(symbols), path)
+        return symbols
+
+    @staticmethod
+    def get(path=INDEX):
+        """
+        The index at path, read once per process
+        :return: HGNCSymbols or None if there is no index
+        """
+        with HGNCSymbols._load_lock:
+            if path not in HGNCSymbols._loaded and os.path.exists(path):
+                HGNCSymbols._loaded[path] = HGNCSymbols.read(path)
+            return HGNCSymbols._loaded.get(path)
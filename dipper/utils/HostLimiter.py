@@ -0,0 +1,56 @@
+import time
+import logging
+import threading
+import urllib.parse
+from contextlib import contextmanager
+
+LOG = logging.getLogger(__name__)
+
+
+class HostLimiter:
+    """
+    Keep concurrent downloads polite to each of the servers involved:
+    at most `concurrency` requests to any one host at a time,
+    and each starting at least `delay` seconds after the previous one to that host.
+    Different hosts do not hold each other up.
+
+    usage (from any number of threads):
+        limiter = HostLimiter(concurrency=2, delay=1)
+        with limiter.slot(url):
+            ... fetch url ...
+    """
+
+    def __init__(self, concurrency=2, delay=0):
+        self.concurrency = concurrency
+        self.delay = delay
+        self._lock = threading.Lock()
+        self._slots = {}        # host -> semaphore
+        self._next_start = {}   # host -> time.monotonic() the next request may start
+
+    @staticmethod
+    def host(url):
+        return urllib.parse.urlsplit(url).netloc.lower()
+
+    @contextmanager
+    def slot(self, url, delay=None):
+        """
+        Wait for a turn to request url
+        :param url: str
+        :param delay: seconds to keep after the previous request; default self.delay
+        """
+        host = self.host(url)
+        if delay is None:
+            delay = self.delay
+        with self._lock:
+            if host not in self._slots:
+                self._slots[host] = threading.BoundedSemaphore(self.concurrency)
+            semaphore = self._slots[host]
+        with semaphore:
+            with self._lock:
+                now = time.monotonic()
+                start = max(now, self._next_start.get(host, now))
+                self._next_start[host] = start + delay
+            if start > now:
+                LOG.info('Fetching from %s in %.1f seconds', host, start - now)
+                time.sleep(start - now)
+            yield
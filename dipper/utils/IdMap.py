@@ -0,0 +1,95 @@
+import os
+import mmap
+import logging
+from array import array
+from collections.abc import Mapping
+
+LOG = logging.getLogger(__name__)
+
+MAGIC = b'DIPIDMAP'
+
+
+class IdMap(Mapping):
+    """
+    A read only str -> str map kept in a file, looked up in place
+    (memory mapped, so processes reading the same file share its pages)
+    rather than loaded.
+
+    The file is
+        MAGIC, the number of entries n (uint64),
+        n + 1 offsets (uint64) of the lines below, from the first,
+        n lines of 'key<TAB>value\\n', sorted by key (as utf-8)
+    so a key is found by binary search over the offsets.
+    The integers are in the byte order of the machine which wrote them.
+
+    usage:
+        IdMap.write('raw/go/id_map.idx', {'P12345': 'NCBIGene:1'})
+        id_map = IdMap('raw/go/id_map.idx')
+        id_map['P12345']  -> 'NCBIGene:1'
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as reader:
+            self._mmap = mmap.mmap(reader.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            raise ValueError(path + ' is not an IdMap')
+        head = len(MAGIC) + 8
+        self._len = array('Q', self._mmap[len(MAGIC):head])[0]
+        self._data = head + 8 * (self._len + 1)
+        self._offsets = memoryview(self._mmap)[head:self._data].cast('Q')
+
+    def _line(self, index):
+        start = self._data + self._offsets[index]
+        return self._mmap[start:self._data + self._offsets[index + 1] - 1]
+
+    def __getitem__(self, key):
+        bkey = key.encode()
+        low, high = 0, self._len
+        while low < high:
+            mid = (low + high) // 2
+            line = self._line(mid)
+            tab = line.index(b'\t')
+            here = line[:tab]
+            if here < bkey:
+                low = mid + 1
+            elif here > bkey:
+                high = mid
+            else:
+                return line[tab + 1:].decode()
+        raise KeyError(key)
+
+    def __iter__(self):
+        for index in range(self._len):
+            line = self._line(index)
+            yield line[:line.index(b'\t')].decode()
+
+    def __len__(self):
+        return self._len
+
+    def close(self):
+        self._offsets.release()
+        self._mmap.close()
+
+    @staticmethod
+    def write(path, mapping):
+        """
+        Write mapping (str -> str, neither with tabs or newlines) as an IdMap file,
+        by atomic rename
+        :param path: str
+        :param mapping: dict
+        """
+        lines = sorted(
+            key.encode() + b'\t' + value.encode() + b'\n'
+            for key, value in mapping.items())
+        offsets = array('Q', [0])
+        for line in lines:
+            offsets.append(offsets[-1] + len(line))
+        temp_path = '{}.{}.tmp'.format(path, os.getpid())
+        with open(temp_path, 'wb') as writer:
+            writer.write(MAGIC)
+            writer.write(array('Q', [len(lines)]).tobytes())
+            writer.write(offsets.tobytes())
+            writer.writelines(lines)
+        os.replace(temp_path, path)
+        LOG.info("Wrote %i ids to %s", len(lines), path)
@@ -0,0 +1,107 @@
+import os
+import gzip
+import json
+import hashlib
+import logging
+
+from dipper.utils.FileManifest import FileManifest
+
+LOG = logging.getLogger(__name__)
+
+MONDO_IRI = 'http://purl.obolibrary.org/obo/MONDO_'
+
+
+class MondoIndex:
+    """
+    The xrefs of a Mondo json file (e.g. mondo-minimal.json),
+    to ask whether an id is in Mondo, and as which Mondo id(s):
+
+        mondo = MondoIndex.load('raw/gwascatalog/mondo.json')
+        'EFO:0000270' in mondo          -> True
+        mondo.mondo_ids('EFO:0000270')  -> ('MONDO:0004979',)
+
+    Reading the json takes a while (and a lot of memory); the index is also kept
+    beside it as <file>.xrefs.tsv.gz, an xref and Mondo id per line, headed by
+    the sha256 of the json it came from. Later runs read that instead,
+    as long as the json has not changed.
+    """
+
+    def __init__(self, xref_map):
+        """
+        :param xref_map: dict of xref curie -> tuple of Mondo curies
+        """
+        self.xref_map = xref_map
+        self.xrefs = frozenset(xref_map)
+
+    def __contains__(self, curie):
+        return curie in self.xrefs
+
+    def __len__(self):
+        return len(self.xrefs)
+
+    def mondo_ids(self, curie):
+        """
+        :return: tuple of the Mondo curies with curie as an xref, may be empty
+        """
+        return self.xref_map.get(curie, ())
+
+    @staticmethod
+    def from_json(mondo_json):
+        """
+        :param mondo_json: a json decoded Mondo obographs file
+        :return: MondoIndex
+        """
+        xref_map = {}
+        for node in mondo_json['graphs'][0]['nodes']:
+            if 'meta' in node and 'xrefs' in node['meta']:
+                mondo_id = node['id'].replace(MONDO_IRI, 'MONDO:')
+                for xref in node['meta']['xrefs']:
+                    xref_map.setdefault(xref['val'], []).append(mondo_id)
+        return MondoIndex({xref: tuple(ids) for xref, ids in xref_map.items()})
+
+    @staticmethod
+    def load(mondo_file):
+        """
+        Index a Mondo json file, or read the index kept of it
+        :param mondo_file: str path
+        :return: MondoIndex
+        """
+        sha256 = MondoIndex._sha256(mondo_file)
+        index_file = mondo_file + '.xrefs.tsv.gz'
+        if os.path.exists(index_file):
+            with gzip.open(index_file, 'rt') as reader:
+                if reader.readline().rstrip('\n') == '# sha256 ' + sha256:
+                    xref_map = {}
+                    for line in reader:
+                        xref, mondo_id = line.rstrip('\n').split('\t')
+                        xref_map[xref] = xref_map.get(xref, ()) + (mondo_id,)
+                    LOG.info("Read %i Mondo xrefs from %s", len(xref_map), index_file)
+                    return MondoIndex(xref_map)
+
+        with open(mondo_file, 'r') as mondo_fh:
+            index = MondoIndex.from_json(json.load(mondo_fh))
+        temp_path = '{}.{}.tmp'.format(index_file, os.getpid())
+        with gzip.open(temp_path, 'wt') as writer:
+            writer.write('# sha256 ' + sha256 + '\n')
+            for xref in sorted(index.xref_map):
+                for mondo_id in index.xref_map[xref]:
+                    writer.write(xref + '\t' + mondo_id + '\n')
+        os.replace(temp_path, index_file)
+        LOG.info("Indexed %i Mondo xrefs of %s", len(index), mondo_file)
+        return index
+
+    @staticmethod
+    def _sha256(path, blocksize=2**20):
+        """
+        sha256 of a file, from the manifest of its directory when it has it
+        """
+        directory, filename = os.path.split(path)
+        entry = FileManifest(directory).get(filename)
+        if entry is not None and entry.get('sha256') is not None and \
+                entry['size'] == os.path.getsize(path):
+            return entry['sha256']
+        sha256 = hashlib.sha256()
+        with open(path, 'rb') as bin_reader:
+            for buff in iter(lambda: bin_reader.read(blocksize), b''):
+                sha256.update(buff)
+        return sha256.hexdigest()
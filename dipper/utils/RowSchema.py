@@ -0,0 +1,88 @@
+import re
+import keyword
+import logging
+from collections import namedtuple
+from operator import itemgetter
+
+LOG = logging.getLogger(__name__)
+
+
+class RowSchema(list):
+    """
+    The column names of a file (as listed in a source's files, tables ...),
+    with the position of each in the rows looked up once, not per row:
+
+        col = RowSchema(self.files[src_key]['columns'])
+        row[col.index('Gene ID')]         # a dict lookup, not a list search
+
+    Given the file's header, positions are those of the header
+    (so reordered columns are still read right).
+    Per row, an itemgetter or namedtuple records do better still:
+
+        col = self.row_schema(self.files[src_key]['columns'], header, src_key)
+        fields = col.getter('Gene ID', 'Symbol')
+        for row in reader:
+            (gene_num, symbol) = fields(row)
+
+        for rec in col.records(reader):
+            rec.Gene_ID ...
+
+    It is still the list of names, for len(), check_fileheader() and the like.
+    """
+
+    def __init__(self, columns, header=None):
+        super().__init__(columns)
+        positions = list(self if header is None else header)
+        self.positions = {}
+        for name in self:
+            if name not in self.positions:
+                self.positions[name] = positions.index(name)
+        self._all = self.getter(*self)
+        self.Record = namedtuple(
+            'Record', [self.field_name(name) for name in self], rename=True)
+
+    def index(self, name, *args):
+        """
+        Position of a column in the rows (not of the name in this list,
+        but they are the same unless the schema was made with a header)
+        """
+        if args:
+            return super().index(name, *args)
+        try:
+            return self.positions[name]
+        except KeyError:
+            raise ValueError('{!r} is not a column'.format(name)) from None
+
+    def getter(self, *names):
+        """
+        :return: function of a row to the tuple of the named columns' values
+        """
+        if len(names) < 2:  # an itemgetter of one is not a tuple
+            positions = tuple(self.index(name) for name in names)
+            return lambda row: tuple(row[position] for position in positions)
+        return itemgetter(*(self.index(name) for name in names))
+
+    def record(self, row):
+        """
+        :return: Record (namedtuple) of a row, fields named as by field_name()
+        """
+        return self.Record._make(self._all(row))
+
+    def records(self, rows):
+        """
+        :return: iterator of Records
+        """
+        return map(self.Record._make, map(self._all, rows))
+
+    @staticmethod
+    def field_name(name):
+        """
+        The name of a column as a Record field: runs of other than letters,
+        digits and '_' become '_', leading and trailing '_' are dropped
+        ('Gene ID' -> Gene_ID, '_object_key' -> object_key), and names left
+        starting with a digit or being a keyword get a 'c_' in front.
+        """
+        field = re.sub(r'\W+', '_', name).strip('_')
+        if field == '' or field[0].isdigit() or keyword.iskeyword(field):
+            field = 'c_' + field
+        return field
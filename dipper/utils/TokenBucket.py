@@ -0,0 +1,43 @@
+import time
+import logging
+import threading
+
+LOG = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Rate limit shared between threads: on average `rate` takes per second,
+    with up to `burst` of them at once after a quiet spell.
+
+    usage (from any number of threads):
+        bucket = TokenBucket(rate=2, burst=2)
+        bucket.take()
+        ... make a request ...
+    """
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._stamp = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take(self):
+        """
+        Wait for, and use up, a token
+        :return: float seconds waited
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.burst, self._tokens + (now - self._stamp) * self.rate)
+                self._stamp = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
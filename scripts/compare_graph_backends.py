@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+'''
+    Parse the same ingest into each of several graph backends
+    and report wall clock time, throughput and peak memory for each.
+
+    Every backend is run in a fresh process so peak RSS is not shared.
+    Raw files are expected to be fetched already (as with --parse_only)
+
+    USAGE:
+    ./scripts/compare_graph_backends.py -s NCBIGene -l 100000 -t 9606
+    ./scripts/compare_graph_backends.py -s MGI -g rdf_graph,compact_graph
+'''
+
+import argparse
+import importlib
+import logging
+import multiprocessing
+import resource
+import sys
+import time
+
+sys.path.insert(0, '.')
+LOG = logging.getLogger(__name__)
+
+
+def parse_source(class_name, graph_type, limit, tax_ids, fmt, queue):
+    imported_module = importlib.import_module('dipper.sources.' + class_name)
+    source_class = getattr(imported_module, class_name)
+    source_args = dict(graph_type=graph_type, are_bnodes_skolemized=True)
+    if tax_ids is not None:
+        source_args['tax_ids'] = tax_ids
+    source = source_class(**source_args)
+
+    start = time.perf_counter()
+    source.parse(limit)
+    parse_time = time.perf_counter() - start
+    triples = len(source.graph)
+
+    write_time = None
+    if fmt is not None:
+        start = time.perf_counter()
+        source.write(fmt=fmt)
+        write_time = time.perf_counter() - start
+
+    # ru_maxrss is in kilobytes on linux
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    queue.put((triples, parse_time, write_time, max_rss))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compare graph backends on the same ingest',
+        formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument(
+        '-s', '--source', type=str, required=True,
+        help='source class name (e.g. NCBIGene)')
+    parser.add_argument(
+        '-g', '--graphs', type=str, default='rdf_graph,compact_graph',
+        help='comma separated graph types to compare')
+    parser.add_argument('-l', '--limit', type=int, help='limit number of rows used')
+    parser.add_argument(
+        '-t', '--taxon', type=str, help='comma delimited NCBITaxon numbers')
+    parser.add_argument(
+        '-f', '--dest_fmt', type=str, default=None,
+        help='also time writing the graph in this format (e.g. nt)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    tax_ids = None
+    if args.taxon is not None:
+        tax_ids = [tax for tax in args.taxon.split(',') if tax.isdigit()]
+
+    results = []
+    for graph_type in args.graphs.split(','):
+        queue = multiprocessing.Queue()
+        proc = multiprocessing.Process(
+            target=parse_source,
+            args=(args.source, graph_type, args.limit,
+                  tax_ids, args.dest_fmt, queue))
+        proc.start()
+        proc.join()
+        if proc.exitcode != 0:
+            LOG.error('%s failed with %s', graph_type, proc.exitcode)
+            continue
+        results.append((graph_type,) + queue.get())
+
+    print('\t'.join((
+        'graph', 'triples', 'parse sec', 'triples/sec', 'write sec', 'peak MB')))
+    for graph_type, triples, parse_time, write_time, max_rss in results:
+        print('\t'.join((
+            graph_type,
+            str(triples),
+            '{:.1f}'.format(parse_time),
+            '{:.0f}'.format(triples / parse_time if parse_time else 0),
+            '-' if write_time is None else '{:.1f}'.format(write_time),
+            '{:.0f}'.format(max_rss / 1024))))
+
+
+if __name__ == "__main__":
+    main()
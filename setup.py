@@ -38,6 +38,9 @@ setup(
         'pandas',
         'ontobio',
     ],
+    extras_require={
+        'zstd': ['zstandard'],  # --compress zstd
+    },
     include_package_data=True,
     keywords='ontology graph obo owl sparql rdf',
     classifiers=[
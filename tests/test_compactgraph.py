@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+
+import io
+import unittest
+import logging
+from rdflib import URIRef, Literal, BNode, RDF, OWL
+from dipper import curie_map
+from dipper.graph.CompactGraph import CompactGraph
+from dipper.graph.RDFGraph import RDFGraph
+from dipper.utils.CurieUtil import CurieUtil
+from dipper.utils.GraphUtils import GraphUtils
+
+logging.basicConfig(level=logging.WARNING)
+LOG = logging.getLogger(__name__)
+
+
+class CompactGraphTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.graph = CompactGraph(True, ':MONARCH_test')
+        self.rdf_graph = RDFGraph(True, ':MONARCH_test')
+
+        self.cutil = CurieUtil(curie_map.get())
+        self.john = URIRef(self.cutil.get_uri('foaf:John'))
+        self.knows = URIRef(self.cutil.get_uri('foaf:knows'))
+        self.joseph = URIRef(self.cutil.get_uri('foaf:Joseph'))
+
+        for graph in (self.graph, self.rdf_graph):
+            graph.addTriple(
+                'foaf:John', 'foaf:knows', 'foaf:Joseph',
+                subject_category='biolink:Gene')
+            graph.addTriple('foaf:John', 'rdfs:label', 'John "Jack"\nSmith\\')
+            graph.addTriple('foaf:John', 'rdfs:comment', 'Jöhn ☃')
+            graph.addTriple(
+                'foaf:John', 'foaf:age', 12,
+                object_is_literal=True, literal_type='xsd:integer')
+            graph.addTriple('_:b0', 'foaf:knows', 'foaf:John')
+            graph.addTriple('foaf:John', 'foaf:knows', 'foaf:Joseph')  # dup
+
+    def tearDown(self):
+        self.graph = None
+        self.rdf_graph = None
+
+    def test_same_triples_as_rdfgraph(self):
+        self.assertEqual(len(self.graph), len(self.rdf_graph))
+        self.assertEqual(set(self.graph), set(self.rdf_graph))
+
+    def test_triple_patterns(self):
+        self.assertEqual(set(self.graph.objects(self.john, self.knows)), {self.joseph})
+        self.assertEqual(
+            set(self.graph.predicates()), set(self.rdf_graph.predicates()))
+        self.assertEqual(
+            len(list(self.graph.subjects(self.knows, None))), 2)
+        self.assertEqual(list(self.graph.objects(self.joseph, None)), [])
+        self.assertEqual(list(self.graph.triples((URIRef('x:y'), None, None))), [])
+        self.assertIn(
+            (self.john, URIRef(self.cutil.get_uri('foaf:age')), Literal(12)),
+            self.graph)
+
+    def test_patterns_in(self):
+        self.assertIn((self.john, self.knows, None), self.graph)
+        self.assertIn((None, None, self.joseph), self.graph)
+        self.assertNotIn((self.joseph, self.knows, None), self.graph)
+
+    def test_unknown_literal_type(self):
+        for graph in (self.graph, self.rdf_graph):
+            graph.addTriple(
+                'foaf:Joseph', 'foaf:age', '7',
+                object_is_literal=True, literal_type='nosuchprefix:int')
+        self.assertEqual(set(self.graph), set(self.rdf_graph))
+        self.assertIn(
+            (self.joseph, URIRef(self.cutil.get_uri('foaf:age')), Literal('7')),
+            self.graph)
+
+    def test_add_remove(self):
+        self.graph.add((self.knows, RDF.type, OWL.ObjectProperty))
+        self.graph.add((self.knows, RDF.type, OWL.ObjectProperty))
+        self.assertEqual(len(self.graph), len(self.rdf_graph) + 1)
+
+        self.graph.remove((None, self.knows, None))
+        self.assertEqual(len(self.graph), len(self.rdf_graph) - 1)
+        self.assertEqual(len(list(self.graph)), len(self.graph))
+        self.assertNotIn((self.john, self.knows, self.joseph), self.graph)
+
+        self.graph.add((self.john, self.knows, self.joseph))
+        self.assertEqual(len(list(self.graph)), len(self.graph))
+        self.assertIn((self.john, self.knows, self.joseph), self.graph)
+
+    def test_literal_round_trip(self):
+        for literal in (
+                Literal('a "quoted"\r\nline \\ of text'),
+                Literal('Jean', lang='fr'),
+                Literal(1.5)):
+            self.graph.add((self.john, self.knows, literal))
+            self.assertIn(literal, set(self.graph.objects(self.john, self.knows)))
+
+    def test_unskolemized_bnode(self):
+        graph = CompactGraph(False)
+        graph.addTriple('_:b0', 'foaf:knows', 'foaf:John')
+        self.assertEqual(list(graph.subjects()), [BNode('b0')])
+
+    def test_serialize_ntriples(self):
+        for fmt in ('nt', 'nquads'):
+            stream = io.BytesIO()
+            count = GraphUtils.write_ntriples(self.graph, stream, fmt)
+            self.assertEqual(count, len(self.rdf_graph))
+            self.assertEqual(
+                sorted(stream.getvalue().splitlines()),
+                sorted(self.rdf_graph.serialize(format=fmt).splitlines()))
+
+    def test_serialize_turtle(self):
+        turtle = RDFGraph()
+        turtle.parse(data=self.graph.serialize(format='turtle'), format='turtle')
+        self.assertEqual(set(turtle), set(self.rdf_graph))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+
+import unittest
+import logging
+from dipper.utils.CurieUtil import CurieUtil
+
+logging.basicConfig(level=logging.WARNING)
+LOG = logging.getLogger(__name__)
+
+
+class CurieUtilTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.cutil = CurieUtil({
+            'OBO': 'http://purl.obolibrary.org/obo/',
+            'HP': 'http://purl.obolibrary.org/obo/HP_',
+            'MONDO': 'http://purl.obolibrary.org/obo/MONDO_',
+            'foaf': 'http://xmlns.com/foaf/0.1/',
+        })
+
+    def tearDown(self):
+        self.cutil = None
+
+    def test_longest_prefix_wins(self):
+        self.assertEqual(
+            self.cutil.get_curie('http://purl.obolibrary.org/obo/HP_0000118'),
+            'HP:0000118')
+        self.assertEqual(
+            self.cutil.get_curie('http://purl.obolibrary.org/obo/RO_0002162'),
+            'OBO:RO_0002162')
+        self.assertEqual(
+            self.cutil.get_curie_prefix('http://purl.obolibrary.org/obo/MONDO_'),
+            'MONDO')
+
+    def test_no_prefix(self):
+        self.assertIsNone(self.cutil.get_curie('http://example.org/x'))
+        self.assertIsNone(self.cutil.get_curie_prefix('http://purl.obolibrary.org/'))
+        self.assertIsNone(self.cutil.get_curie_prefix(''))
+
+    def test_get_curies(self):
+        self.assertEqual(
+            self.cutil.get_curies((
+                'http://xmlns.com/foaf/0.1/John',
+                'http://example.org/x',
+                'http://purl.obolibrary.org/obo/MONDO_0000001')),
+            ['foaf:John', None, 'MONDO:0000001'])
+
+
+if __name__ == '__main__':
+    unittest.main()
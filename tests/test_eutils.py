@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+
+import os
+import re
+import json
+import shutil
+import tempfile
+import threading
+import unittest
+import logging
+import urllib.parse
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from dipper.utils.EUtils import EUtils
+
+logging.basicConfig(level=logging.WARNING)
+LOG = logging.getLogger(__name__)
+
+TAXA = {
+    '10090': {'scientificname': 'Mus musculus', 'commonname': 'house mouse'},
+    '7955': {'scientificname': 'Danio rerio', 'commonname': 'zebrafish'},
+    '9606': {'scientificname': 'Homo sapiens', 'commonname': 'human'},
+}
+HOMOLOGENE = {
+    '3': {'hid': 3, 'homologenedatalist': [{'geneid': 34}, {'geneid': 11364}]},
+    '5': {'hid': 5, 'homologenedatalist': [{'geneid': 38}, {'geneid': 110446}]},
+    '7': {'hid': 7, 'homologenedatalist': [{'geneid': 38}]},
+}
+
+
+class EUtilsHandler(BaseHTTPRequestHandler):
+    """
+    esearch & esummary of a few taxa and HomoloGene groups, keeping each search
+    on a 'History server' and noting the utility asked of each request
+    """
+    lock = threading.Lock()
+    requests = []
+    history = {}
+
+    def do_POST(self):
+        length = int(self.headers['Content-Length'])
+        params = dict(urllib.parse.parse_qsl(self.rfile.read(length).decode()))
+        utility = self.path.rsplit('/', 1)[-1]
+        with self.lock:
+            self.requests.append(utility)
+        records = TAXA if params['db'] == 'taxonomy' else HOMOLOGENE
+        if utility == 'esearch.fcgi':
+            uids = self.search(records, params['term'])
+            result = {'count': str(len(uids)), 'idlist': uids}
+            if params.get('usehistory') == 'y':
+                with self.lock:
+                    query_key = str(len(self.history) + 1)
+                    self.history[query_key] = uids
+                result.update({'webenv': 'env', 'querykey': query_key, 'idlist': []})
+            body = {'esearchresult': result}
+        else:
+            start = int(params['retstart'])
+            uids = self.history[params['query_key']][
+                start:start + int(params['retmax'])]
+            body = {'result': dict({'uids': uids}, **{
+                uid: dict(records[uid], uid=uid) for uid in uids})}
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    @staticmethod
+    def search(records, term):
+        uids = set()
+        for name in re.findall(r'"([^"]+)"\[All Names\]', term):
+            uids.update(
+                uid for uid, record in records.items()
+                if name.lower() in (
+                    record['scientificname'].lower(), record['commonname'].lower()))
+        for gene in re.findall(r'(\d+)\[Gene ID\]', term):
+            uids.update(
+                uid for uid, record in records.items()
+                if int(gene) in [h['geneid'] for h in record['homologenedatalist']])
+        if '[' not in term:  # free text
+            uids.update(
+                uid for uid, record in records.items()
+                if term.lower() in record['scientificname'].lower())
+        return sorted(uids)
+
+    def log_message(self, *args):
+        pass
+
+
+class EUtilsTestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), EUtilsHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.url = 'http://127.0.0.1:%d/entrez/eutils' % cls.server.server_address[1]
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        EUtilsHandler.requests.clear()
+        self.cachedir = tempfile.mkdtemp()
+        self.eutils = EUtils(self.cachedir, self.url)
+        self.eutils.RETMAX = 2
+
+    def tearDown(self):
+        shutil.rmtree(self.cachedir)
+
+    def test_taxa_in_bulk_then_cached(self):
+        labels = ['Mus musculus', 'zebrafish', 'Homo sapiens', 'Homo', 'Unicorn']
+        self.assertEqual(self.eutils.taxon_nums_by_label(labels), {
+            'Mus musculus': '10090', 'zebrafish': '7955', 'Homo sapiens': '9606',
+            'Homo': '9606', 'Unicorn': None})
+        # one search, two pages of summaries, then one at a time the unmatched
+        self.assertEqual(EUtilsHandler.requests, [
+            'esearch.fcgi', 'esummary.fcgi', 'esummary.fcgi',
+            'esearch.fcgi', 'esearch.fcgi'])
+
+        EUtilsHandler.requests.clear()
+        self.assertEqual(
+            EUtils(self.cachedir, self.url).taxon_nums_by_label(['Unicorn', 'zebrafish']),
+            {'Unicorn': None, 'zebrafish': '7955'})
+        self.assertEqual(EUtilsHandler.requests, [])
+
+    def test_one_at_a_time(self):
+        self.assertEqual(self.eutils.taxon_nums_by_label(['Mus musculus']), {
+            'Mus musculus': '10090'})
+        self.assertEqual(EUtilsHandler.requests, ['esearch.fcgi'])
+        EUtilsHandler.requests.clear()
+        self.assertEqual(self.eutils.homologenes_by_gene_num([34])['34']['hid'], 3)
+        self.assertEqual(EUtilsHandler.requests, ['esearch.fcgi', 'esummary.fcgi'])
+
+    def test_new_cachedir(self):
+        cachedir = os.path.join(self.cachedir, 'raw', '.eutils')
+        self.assertEqual(
+            EUtils(cachedir, self.url).taxon_nums_by_label(['Mus musculus']),
+            {'Mus musculus': '10090'})
+        self.assertTrue(os.path.exists(os.path.join(cachedir, 'taxon.json')))
+
+    def test_homologenes_unique_group_only(self):
+        homologs = self.eutils.homologenes_by_gene_num([34, 38, 11364, 99])
+        self.assertEqual(homologs['34']['hid'], 3)
+        self.assertEqual(homologs['11364']['hid'], 3)
+        self.assertIsNone(homologs['38'])  # in two groups
+        self.assertIsNone(homologs['99'])
+        self.assertEqual(EUtilsHandler.requests, [
+            'esearch.fcgi', 'esummary.fcgi', 'esummary.fcgi'])
+
+    def test_batches(self):
+        self.eutils.BATCH = 2
+        self.eutils.homologenes_by_gene_num([34, 38, 11364])
+        self.assertEqual(EUtilsHandler.requests.count('esearch.fcgi'), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
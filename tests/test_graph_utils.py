@@ -2,8 +2,17 @@
 
 import unittest
 import logging
+import io
+import os
+import shutil
+import tempfile
+from collections import defaultdict
 import rdflib
 from dipper.utils import GraphUtils
+from dipper.graph.RDFGraph import RDFGraph
+from dipper.graph.CompactGraph import CompactGraph
+from dipper.graph.SQLiteGraph import SQLiteGraph
+from dipper.graph.StreamedGraph import StreamedGraph
 
 logging.basicConfig(level=logging.WARNING)
 LOG = logging.getLogger(__name__)
@@ -60,6 +69,107 @@ class GraphUtilsTestCase(unittest.TestCase):
             "testing hit on both graphs, " +
             "didn't get correct count for 'name' (graph 2)")
 
+    def test_tracked_predicates_match_scan(self):
+        knows = rdflib.URIRef('http://xmlns.com/foaf/0.1/knows')
+        for graph in (RDFGraph(), CompactGraph(), SQLiteGraph()):
+            graph.addTriple('foaf:John', 'foaf:knows', 'foaf:Joseph')
+            graph.addTriple('foaf:John', 'foaf:knows', 'foaf:Joseph')
+            graph.addTriple('foaf:John', 'foaf:knows', 'foaf:Jack')
+            graph.addTriple(
+                'foaf:John', 'rdfs:label', 'John', subject_category='biolink:Gene')
+            graph.remove((None, knows, rdflib.URIRef('http://xmlns.com/foaf/0.1/Jack')))
+
+            scanned = defaultdict(int)
+            for predicate in graph.predicates():
+                scanned[predicate] += 1
+            self.assertEqual(self.graph_util.count_predicates(graph), scanned)
+            self.assertEqual(graph.predicate_counts[knows], 1)
+            self.assertEqual(
+                self.graph_util.get_properties_from_graph(graph), set(scanned))
+
+            graph.remove((None, knows, None))
+            self.assertNotIn(knows, graph.predicate_counts)
+
+    def test_property_index_cached(self):
+        index_dir = tempfile.mkdtemp()
+        ontology = os.path.join(index_dir, 'test.ttl')
+        shutil.copy('tests/resources/graphutils/gu_test_properties.ttl', ontology)
+        in_taxon = rdflib.URIRef('http://purl.obolibrary.org/obo/RO_0002162')
+        try:
+            with self.assertRaises(FileNotFoundError):
+                self.graph_util.get_property_index(ontology, index_dir, offline=True)
+
+            index = self.graph_util.get_property_index(ontology, index_dir)
+            self.assertIn(in_taxon, index['ObjectProperty'])
+            self.assertEqual(len(index['AnnotationProperty']), 1)
+            self.assertEqual(len(index['DatatypeProperty']), 1)
+            self.assertTrue(os.path.exists(os.path.join(index_dir, 'test.ttl.json')))
+            self.assertIs(
+                self.graph_util.get_property_index(ontology, index_dir), index)
+
+            # a new process, no network
+            del self.graph_util.property_indexes[ontology]
+            self.assertEqual(
+                self.graph_util.get_property_index(ontology, index_dir, offline=True),
+                index)
+
+            # a new version of the ontology
+            del self.graph_util.property_indexes[ontology]
+            with open(ontology, 'a') as ontology_file:
+                ontology_file.write('RO:0002201 a owl:ObjectProperty .\n')
+            index = self.graph_util.get_property_index(ontology, index_dir)
+            self.assertEqual(len(index['ObjectProperty']), 3)
+        finally:
+            self.graph_util.property_indexes.pop(ontology, None)
+            shutil.rmtree(index_dir)
+
+    def test_add_property_axioms_from_index(self):
+        in_taxon = rdflib.URIRef('http://purl.obolibrary.org/obo/RO_0002162')
+        empty = {
+            property_type: frozenset() for property_type in GraphUtils.PROPERTY_TYPES}
+        saved = dict(self.graph_util.property_indexes)
+        self.graph_util.property_indexes.update(
+            (ontology, empty) for ontology in GraphUtils.PROPERTY_ONTOLOGIES)
+        self.graph_util.property_indexes[GraphUtils.PROPERTY_ONTOLOGIES[0]] = dict(
+            empty, ObjectProperty=frozenset([in_taxon]))
+        stream = io.StringIO()
+        try:
+            for graph in (RDFGraph(), StreamedGraph(file_handle=stream)):
+                graph.addTriple('NCBIGene:1', 'RO:0002162', 'NCBITaxon:9606')
+                self.graph_util.add_property_axioms(
+                    graph, self.graph_util.get_properties_from_graph(graph))
+                # in_taxon, dcterms:source & two hardcoded annotation properties
+                self.assertEqual(graph.predicate_counts[rdflib.RDF.type], 4)
+            self.assertIn(
+                '<http://purl.obolibrary.org/obo/RO_0002162> '
+                '<http://www.w3.org/1999/02/22-rdf-syntax-ns#type> '
+                '<http://www.w3.org/2002/07/owl#ObjectProperty> .\n',
+                stream.getvalue())
+        finally:
+            self.graph_util.property_indexes.clear()
+            self.graph_util.property_indexes.update(saved)
+
+    def test_write_ntriples_matches_rdflib(self):
+        graph = RDFGraph(False, ':MONARCH_test')
+        graph.addTriple('foaf:John', 'foaf:knows', 'foaf:Joseph')
+        graph.addTriple('foaf:John', 'rdfs:label', 'John "Jack"\nSmith\\')
+        graph.addTriple('foaf:John', 'rdfs:comment', 'Jöhn ☃ \U0001F600')
+        graph.addTriple(
+            'foaf:John', 'foaf:age', 12,
+            object_is_literal=True, literal_type='xsd:integer')
+        graph.addTriple('_:b0', 'foaf:knows', 'foaf:John')
+        graph.add((
+            rdflib.URIRef('http://xmlns.com/foaf/0.1/John'),
+            rdflib.RDFS['label'], rdflib.Literal('Jean', lang='fr')))
+
+        for fmt in ('nt', 'nquads'):
+            stream = io.BytesIO()
+            count = self.graph_util.write_ntriples(graph, stream, fmt)
+            self.assertEqual(count, len(graph))
+            self.assertEqual(
+                stream.getvalue(), graph.serialize(format=fmt),
+                "{} output differs from rdflib".format(fmt))
+
 
 if __name__ == '__main__':
     unittest.main()
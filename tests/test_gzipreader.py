@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+
+import os
+import gzip
+import shutil
+import tempfile
+import unittest
+
+from dipper.utils.GzipReader import GzipReader
+
+
+def count_fields(lines):
+    return sum(len(line.split('\t')) for line in lines)
+
+
+class GzipReaderTestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tempdir = tempfile.mkdtemp()
+        cls.path = os.path.join(cls.tempdir, 'gene_info.gz')
+        with gzip.open(cls.path, 'wt', encoding='utf-8', newline='') as writer:
+            writer.write('#tax_id\tGeneID\tSymbol\n')
+            for i in range(20000):
+                writer.write('9606\t%d\tGENE%d ä\n' % (i, i))
+            writer.write('7955\t1\tquoted "multi\r\nline"\r\n')
+            writer.write('7955\t2\tno newline at the end')
+        cls.corrupt = os.path.join(cls.tempdir, 'corrupt.gz')
+        with open(cls.path, 'rb') as reader, open(cls.corrupt, 'wb') as writer:
+            writer.write(reader.read()[:50000])
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tempdir)
+
+    def assertSameLines(self, mode, **kwargs):
+        with gzip.open(self.path, mode, **kwargs) as expected:
+            expected = list(expected)
+        for decompressor in ('', 'gzip'):
+            with GzipReader(
+                    self.path, mode, blocksize=1000, depth=2,
+                    decompressor=decompressor, **kwargs) as reader:
+                self.assertEqual(reader.readline(), expected[0])
+                self.assertEqual(list(reader), expected[1:])
+                self.assertEqual(reader.readline(), expected[0][:0])
+
+    def test_same_lines_as_gzip_open(self):
+        self.assertSameLines('rb')
+        self.assertSameLines('rt')
+        self.assertSameLines('rt', newline='')
+        self.assertSameLines('rt', encoding='latin-1')
+
+    def test_stop_early(self):
+        with GzipReader(self.path, 'rt', blocksize=100, depth=1) as reader:
+            self.assertEqual(next(iter(reader)), '#tax_id\tGeneID\tSymbol\n')
+        self.assertEqual(reader.readline(), '')
+
+    def test_errors_raised_to_reader(self):
+        for decompressor in ('', 'gzip'):
+            with self.assertRaises((EOFError, OSError)):
+                with GzipReader(self.corrupt, decompressor=decompressor) as reader:
+                    for _ in reader:
+                        pass
+        with self.assertRaises(FileNotFoundError):
+            GzipReader(os.path.join(self.tempdir, 'absent.gz'))
+
+    def test_noisy_decompressor(self):
+        # more on stderr than a pipe holds, before any of the output
+        noisy = os.path.join(self.tempdir, 'noisy')
+        with open(noisy, 'w') as writer:
+            writer.write('#!/bin/sh\nhead -c 200000 /dev/zero | tr "\\0" w >&2\n')
+            writer.write('exec gzip "$@"\n')
+        os.chmod(noisy, 0o755)
+        with GzipReader(self.path, 'rb', decompressor=noisy) as reader, \
+                gzip.open(self.path, 'rb') as expected:
+            self.assertEqual(list(reader), list(expected))
+
+    def test_map_batches(self):
+        with GzipReader(self.path, 'rt', blocksize=10000) as reader:
+            counts = list(reader.map_batches(count_fields, workers=2))
+        self.assertGreater(len(counts), 10)
+        with gzip.open(self.path, 'rt') as lines:
+            self.assertEqual(sum(counts), count_fields(lines))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from dipper.utils.HGNCSymbols import HGNCSymbols
+
+
+class HGNCSymbolsTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.symbols = HGNCSymbols()
+        self.symbols.add('HGNC:5', 'A1BG', (), ('HEL-S-163pA',))
+        self.symbols.add('HGNC:1100', 'BRCA1', ('RNF53',), ('BRCC1', 'PPP1R53'))
+        self.symbols.add('HGNC:4057', 'FMR1', ('FRAXA',), ('POF',))
+        self.symbols.add('HGNC:3608', 'FANCD1', ('BRCC1',), ())  # not so
+        self.symbols.add('HGNC:9999', 'POF', (), ())  # not so either
+        self.symbols.add('HGNC:77', 'ABC1', (), ('SHARED',))
+        self.symbols.add('HGNC:78', 'ABC2', (), ('SHARED', ''))
+
+    def test_ranked(self):
+        self.assertEqual(self.symbols.resolve('BRCA1'), 'HGNC:1100')
+        self.assertEqual(self.symbols.resolve('rnf53'), 'HGNC:1100')
+        self.assertEqual(self.symbols.resolve('HEL-S-163pA'), 'HGNC:5')
+        # previous symbols before aliases, approved before either
+        self.assertEqual(self.symbols.resolve('BRCC1'), 'HGNC:3608')
+        self.assertEqual(self.symbols.resolve('POF'), 'HGNC:9999')
+        # the same at the best rank is none of them
+        self.assertIsNone(self.symbols.resolve('SHARED'))
+        self.assertIsNone(self.symbols.resolve('NOPE'))
+
+    def test_written_and_read(self):
+        tempdir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tempdir, 'hgnc_symbols.tsv.gz')
+            self.assertIsNone(HGNCSymbols.get(path))
+            self.symbols.write(path)
+            symbols = HGNCSymbols.get(path)
+            self.assertIs(HGNCSymbols.get(path), symbols)
+            for symbol in ('BRCA1', 'rnf53', 'BRCC1', 'POF', 'FRAXA', 'SHARED', 'NOPE'):
+                self.assertEqual(symbols.resolve(symbol), self.symbols.resolve(symbol))
+        finally:
+            shutil.rmtree(tempdir)
+
+
+if __name__ == '__main__':
+    unittest.main()
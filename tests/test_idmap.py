@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+from dipper.utils.IdMap import IdMap
+
+
+class IdMapTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tempdir, 'id_map.idx')
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def test_as_dict(self):
+        rand = random.Random(7)
+        mapping = {
+            ''.join(rand.choice('ABOPQ0123456789') for _ in range(rand.randint(1, 10))):
+            'NCBIGene:%d' % i for i in range(2000)}
+        mapping['A0A0'] = 'ENSEMBL:ENSG00000000003'
+        mapping['A0A01'] = 'NCBIGene:ä'
+        IdMap.write(self.path, mapping)
+        id_map = IdMap(self.path)
+        self.assertEqual(len(id_map), len(mapping))
+        self.assertEqual(dict(id_map), mapping)
+        self.assertEqual(list(id_map), sorted(mapping))
+        for key in ('A0A0', 'A0A01', 'A0A', 'A0A011', 'Z', ''):
+            self.assertEqual(id_map.get(key), mapping.get(key))
+        with self.assertRaises(KeyError):
+            id_map['not there']
+        id_map.close()
+
+    def test_empty(self):
+        IdMap.write(self.path, {})
+        id_map = IdMap(self.path)
+        self.assertEqual(len(id_map), 0)
+        self.assertNotIn('P12345', id_map)
+
+    def test_not_an_idmap(self):
+        with open(self.path, 'w') as writer:
+            writer.write('P12345: NCBIGene:1\n')
+        with self.assertRaises(ValueError):
+            IdMap(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+
+import os
+import gzip
+import json
+import shutil
+import tempfile
+import unittest
+
+from dipper.utils.MondoIndex import MondoIndex
+from dipper.utils.DipperUtil import DipperUtil
+
+MONDO = {'graphs': [{'nodes': [
+    {'id': 'http://purl.obolibrary.org/obo/MONDO_0004979',
+     'meta': {'xrefs': [{'val': 'EFO:0000270'}, {'val': 'DOID:2841'}]}},
+    {'id': 'http://purl.obolibrary.org/obo/MONDO_0005148',
+     'meta': {'xrefs': [{'val': 'EFO:0001360'}, {'val': 'DOID:2841'}]}},
+    {'id': 'http://purl.obolibrary.org/obo/MONDO_0000001', 'meta': {}},
+    {'id': 'http://purl.obolibrary.org/obo/HP_0000118'},
+]}]}
+
+
+class MondoIndexTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.rawdir = tempfile.mkdtemp()
+        self.mondo_file = os.path.join(self.rawdir, 'mondo.json')
+        with open(self.mondo_file, 'w') as writer:
+            json.dump(MONDO, writer)
+
+    def tearDown(self):
+        shutil.rmtree(self.rawdir)
+
+    def test_as_is_id_in_mondo(self):
+        index = MondoIndex.from_json(MONDO)
+        for curie in ('EFO:0000270', 'DOID:2841', 'EFO:0001360', 'EFO:9', 'HP:0000118'):
+            self.assertEqual(curie in index, DipperUtil.is_id_in_mondo(curie, MONDO))
+        self.assertEqual(index.mondo_ids('EFO:0000270'), ('MONDO:0004979',))
+        self.assertEqual(
+            index.mondo_ids('DOID:2841'), ('MONDO:0004979', 'MONDO:0005148'))
+        self.assertEqual(index.mondo_ids('EFO:9'), ())
+
+    def test_index_kept_until_json_changes(self):
+        index = MondoIndex.load(self.mondo_file)
+        self.assertEqual(index.xref_map, MondoIndex.from_json(MONDO).xref_map)
+        # the kept index is read (and not the json) while the json is the same
+        with gzip.open(self.mondo_file + '.xrefs.tsv.gz', 'at') as writer:
+            writer.write('EFO:kept\tMONDO:0000001\n')
+        self.assertIn('EFO:kept', MondoIndex.load(self.mondo_file))
+
+        MONDO['graphs'][0]['nodes'][2]['meta']['xrefs'] = [{'val': 'EFO:9'}]
+        try:
+            with open(self.mondo_file, 'w') as writer:
+                json.dump(MONDO, writer)
+        finally:
+            del MONDO['graphs'][0]['nodes'][2]['meta']['xrefs']
+        index = MondoIndex.load(self.mondo_file)
+        self.assertIn('EFO:9', index)
+        self.assertNotIn('EFO:kept', index)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+
+import unittest
+import logging
+from dipper.graph.NodeCache import NodeCache
+from dipper.graph.RDFGraph import RDFGraph
+from dipper.graph.StreamedGraph import StreamedGraph
+
+logging.basicConfig(level=logging.WARNING)
+LOG = logging.getLogger(__name__)
+
+
+class NodeCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.made = []
+        self.cache = NodeCache(maxsize=2, resident=['rdf:type'])
+
+    def tearDown(self):
+        self.cache = None
+
+    def make_node(self, curie):
+        self.made.append(curie)
+        if curie == 'bogus':
+            return None
+        return curie.upper()
+
+    def test_least_recently_used_evicted(self):
+        for curie in ('a:1', 'a:2', 'a:1', 'a:3', 'a:1', 'a:2'):
+            self.assertEqual(self.cache.get(curie, self.make_node), curie.upper())
+        self.assertEqual(self.made, ['a:1', 'a:2', 'a:3', 'a:2'])
+        self.assertEqual((self.cache.hits, self.cache.misses), (2, 4))
+
+    def test_resident_not_evicted(self):
+        for curie in ('rdf:type', 'a:1', 'a:2', 'a:3', 'rdf:type'):
+            self.cache.get(curie, self.make_node)
+        self.assertEqual(self.made.count('rdf:type'), 1)
+        self.assertEqual(len(self.cache), 3)
+
+    def test_failures_not_cached(self):
+        self.assertIsNone(self.cache.get('bogus', self.make_node))
+        self.assertIsNone(self.cache.get('bogus', self.make_node))
+        self.assertEqual(self.made, ['bogus', 'bogus'])
+        self.assertEqual(len(self.cache), 0)
+
+    def test_graphs_cache_nodes(self):
+        graph = RDFGraph()
+        for _ in range(3):
+            graph.addTriple('foaf:John', 'rdf:type', 'foaf:Person')
+        self.assertEqual(len(graph), 1)
+        self.assertEqual(graph.prefixes, {'foaf', 'rdf'})
+        self.assertEqual(graph.node_cache.misses, 3)
+        self.assertEqual(graph.node_cache.hits, 6)
+        self.assertIn('rdf:type', graph.node_cache.resident)
+
+        streamed = StreamedGraph(file_handle=[])
+        self.assertEqual(
+            streamed._getnode('foaf:John'), 'http://xmlns.com/foaf/0.1/John')
+        self.assertEqual(
+            streamed._getnode('foaf:John'), 'http://xmlns.com/foaf/0.1/John')
+        self.assertEqual(streamed.node_cache.hit_rate(), 0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+
+import os
+import gzip
+import shutil
+import tempfile
+import unittest
+import logging
+from dipper.graph import OutputSink as output_sink
+from dipper.graph.OutputSink import OutputSink
+from dipper.graph.StreamedGraph import StreamedGraph
+
+logging.basicConfig(level=logging.WARNING)
+LOG = logging.getLogger(__name__)
+
+
+class OutputSinkTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'test.nt')
+        self.lines = ['<x:s> <x:p> "{} ☃" .\n'.format(i) for i in range(1000)]
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_appears_only_when_closed(self):
+        sink = OutputSink(self.path, buffer_size=100)
+        for line in self.lines:
+            sink.write(line)
+        self.assertFalse(os.path.exists(self.path))
+        self.assertTrue(os.path.exists(sink.temp_path))
+        sink.close()
+        self.assertFalse(os.path.exists(sink.temp_path))
+        with open(self.path, encoding='utf-8') as result:
+            self.assertEqual(result.read(), ''.join(self.lines))
+        self.assertEqual(os.listdir(self.directory), ['test.nt'])
+        self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o666 & ~output_sink.UMASK)
+
+    def test_gzip(self):
+        with OutputSink(self.path + '.gz', 'gzip', buffer_size=100) as sink:
+            for line in self.lines:
+                sink.write(line)
+        with gzip.open(self.path + '.gz', 'rt', encoding='utf-8') as result:
+            self.assertEqual(result.read(), ''.join(self.lines))
+
+    def test_abort_removes_temp_file(self):
+        sink = OutputSink(self.path, 'gzip')
+        sink.write(self.lines[0])
+        sink.abort()
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_failed_ingest_leaves_nothing(self):
+        with self.assertRaises(RuntimeError):
+            with OutputSink(self.path) as sink:
+                sink.write(self.lines[0])
+                raise RuntimeError('parse failed')
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_unknown_compression(self):
+        with self.assertRaises(ValueError):
+            OutputSink(self.path, 'rar')
+
+    @unittest.skipIf(output_sink.zstandard is not None, 'zstandard is installed')
+    def test_zstd_without_zstandard(self):
+        with self.assertRaises(ImportError):
+            OutputSink(self.path + '.zst', 'zstd')
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_streamed_graph(self):
+        graph = StreamedGraph(True, file_handle=OutputSink(self.path + '.gz', 'gzip'))
+        graph.addTriple('foaf:John', 'foaf:knows', 'foaf:Joseph')
+        graph.addTriple('foaf:John', 'rdfs:label', 'John')
+        graph.close()
+        with gzip.open(self.path + '.gz', 'rt') as result:
+            self.assertEqual(len(result.read().splitlines()), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
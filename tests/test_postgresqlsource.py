@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+
+import os
+import re
+import gzip
+import time
+import shutil
+import tempfile
+import threading
+import unittest
+import logging
+
+from dipper.sources.PostgreSQLSource import PostgreSQLSource
+
+logging.basicConfig(level=logging.WARNING)
+LOG = logging.getLogger(__name__)
+
+CXN = {
+    'host': 'localhost', 'database': 'test', 'port': 5432,
+    'user': 'test', 'password': 'test'}
+
+
+class StandInCursor:
+    """
+    Answers 'COPY (SELECT * FROM <table> ...) TO STDOUT' from the pool's tables
+    """
+
+    def __init__(self, pool):
+        self.pool = pool
+        self.rowcount = -1
+        self.result = None
+
+    def copy_expert(self, sql, output):
+        table = re.search(r'FROM (\w+)', sql).group(1)
+        rows = self.pool.tables[table]
+        with self.pool.lock:
+            self.pool.active += 1
+            self.pool.most = max(self.pool.most, self.pool.active)
+        try:
+            time.sleep(0.05)
+            output.write('id\tname\n')
+            for row in rows[:len(rows) - self.pool.short]:
+                output.write(row)
+        finally:
+            with self.pool.lock:
+                self.pool.active -= 1
+        if self.pool.report_rowcount:
+            self.rowcount = len(rows)
+        with self.pool.lock:
+            self.pool.copied.append(table)
+
+    def execute(self, sql):
+        rows = self.pool.tables[re.search(r'FROM (\w+)', sql).group(1)]
+        if 'MD5' in sql:
+            self.result = (len(rows), sum(hash(row) % 2**60 for row in rows))
+        else:
+            self.pool.count_queries.append(sql)
+            self.result = (len(rows),)
+
+    def fetchone(self):
+        return self.result
+
+
+class StandInConnection:
+
+    def __init__(self, pool):
+        self.pool = pool
+
+    def cursor(self):
+        return StandInCursor(self.pool)
+
+
+class StandInPool:
+
+    def __init__(self, tables, report_rowcount=True, short=0):
+        self.tables = tables
+        self.report_rowcount = report_rowcount
+        self.short = short
+        self.lock = threading.Lock()
+        self.active = 0
+        self.most = 0
+        self.count_queries = []
+        self.copied = []
+        self.closed = False
+
+    def getconn(self):
+        return StandInConnection(self)
+
+    def putconn(self, con):
+        pass
+
+    def closeall(self):
+        self.closed = True
+
+
+class PGIngest(PostgreSQLSource):
+
+    def __init__(self, pool):
+        super().__init__(
+            'rdf_graph', False, name='someid',
+            ingest_url='http://sourceofdata.com', ingest_logo='logo.png')
+        self.pool = pool
+
+    def _connection_pool(self, cxn, size):
+        self.pool.size = size
+        return self.pool
+
+
+class PostgreSQLSourceTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tables = {
+            'tab%d' % i: ['%d\tname %d\n' % (j, j) for j in range(i * 10)]
+            for i in range(6)}
+        self.rawdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.rawdir)
+
+    def ingest(self, pool):
+        source = PGIngest(pool)
+        source.rawdir = self.rawdir
+        return source
+
+    def test_tables_fetched_at_once(self):
+        pool = StandInPool(self.tables)
+        source = self.ingest(pool)
+        source.fetch_from_pgdb(sorted(self.tables), CXN)
+        self.assertEqual(pool.size, PostgreSQLSource.PG_WORKERS)
+        self.assertEqual(pool.most, PostgreSQLSource.PG_WORKERS)
+        self.assertTrue(pool.closed)
+        self.assertEqual(pool.count_queries, [])  # the COPY's own count sufficed
+        for table, rows in self.tables.items():
+            with open(os.path.join(self.rawdir, table)) as fh:
+                self.assertEqual(fh.read(), 'id\tname\n' + ''.join(rows))
+        self.assertEqual(
+            [name for name in os.listdir(self.rawdir) if name.endswith('.part')], [])
+
+    def test_compressed_and_counted(self):
+        pool = StandInPool(self.tables, report_rowcount=False)
+        source = self.ingest(pool)
+        fetched = source.fetch_queries_from_pgdb(
+            {'five': 'SELECT * FROM tab5'}, CXN, compress=True)
+        self.assertEqual(fetched, {'five': 50})
+        self.assertEqual(len(pool.count_queries), 1)
+        with gzip.open(os.path.join(self.rawdir, 'five.gz'), 'rt') as fh:
+            self.assertEqual(len(fh.readlines()), 1 + 50)
+
+    def test_short_download_fails(self):
+        pool = StandInPool(self.tables, short=1)
+        source = self.ingest(pool)
+        with self.assertRaises(Exception):
+            source.fetch_queries_from_pgdb({'three': 'SELECT * FROM tab3'}, CXN)
+        self.assertFalse(os.path.exists(os.path.join(self.rawdir, 'three')))
+        self.assertFalse(os.path.exists(os.path.join(self.rawdir, 'three.part')))
+
+    def test_unchanged_results_not_fetched_again(self):
+        pool = StandInPool(self.tables)
+        source = self.ingest(pool)
+        queries = {table: 'SELECT * FROM ' + table for table in self.tables}
+        source.fetch_queries_from_pgdb(queries, CXN)
+        self.assertEqual(sorted(pool.copied), sorted(self.tables))
+
+        pool.copied.clear()
+        self.tables['tab2'].append('20\tname 20\n')
+        fetched = source.fetch_queries_from_pgdb(queries, CXN)
+        self.assertEqual(pool.copied, ['tab2'])
+        self.assertEqual(fetched['tab2'], 21)
+        self.assertEqual(fetched['tab4'], 40)
+
+        pool.copied.clear()
+        source.fetch_queries_from_pgdb(queries, CXN, is_dl_forced=True)
+        self.assertEqual(sorted(pool.copied), sorted(self.tables))
+
+    def test_tables_forced(self):
+        pool = StandInPool(self.tables)
+        source = self.ingest(pool)
+        source.fetch_from_pgdb(['tab1', 'tab2'], CXN)
+        source.fetch_from_pgdb(['tab1', 'tab2'], CXN)
+        self.assertEqual(sorted(pool.copied), ['tab1', 'tab2'])
+        source.fetch_from_pgdb(['tab1', 'tab2'], CXN, is_dl_forced=True)
+        self.assertEqual(sorted(pool.copied), ['tab1', 'tab1', 'tab2', 'tab2'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+
+import unittest
+
+from dipper.sources.Source import Source
+from dipper.utils.RowSchema import RowSchema
+
+COLUMNS = ['tax_id', 'GeneID', 'Symbol', 'GeneID (EntrezGene)', '_object_key', 'class']
+
+
+class RowSchemaTestCase(unittest.TestCase):
+
+    def test_still_the_list(self):
+        col = RowSchema(COLUMNS)
+        self.assertEqual(col, COLUMNS)
+        self.assertEqual(len(col), len(COLUMNS))
+        self.assertTrue(Source.check_fileheader(col, COLUMNS))
+        for name in COLUMNS:
+            self.assertEqual(col.index(name), COLUMNS.index(name))
+        with self.assertRaises(ValueError):
+            col.index('Synonyms')
+
+    def test_positions_from_header(self):
+        header = ['Symbol', 'extra', 'GeneID', 'tax_id', 'class',
+                  '_object_key', 'GeneID (EntrezGene)']
+        row = ['BRCA1', 'x', '672', '9606', 'c', 'k', '672']
+        col = RowSchema(COLUMNS, header)
+        self.assertEqual(col.index('tax_id'), 3)
+        self.assertEqual(col.getter('tax_id', 'Symbol')(row), ('9606', 'BRCA1'))
+        self.assertEqual(col.getter('GeneID')(row), ('672',))
+        rec = col.record(row)
+        self.assertEqual(
+            (rec.tax_id, rec.GeneID, rec.Symbol, rec.GeneID_EntrezGene,
+             rec.object_key, rec.c_class),
+            ('9606', '672', 'BRCA1', '672', 'k', 'c'))
+        self.assertEqual(list(col.records([row, row])), [rec, rec])
+
+    def test_missing_column(self):
+        with self.assertRaises(ValueError):
+            RowSchema(COLUMNS, COLUMNS[1:])
+
+
+if __name__ == '__main__':
+    unittest.main()
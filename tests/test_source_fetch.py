@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+
+import os
+import json
+import time
+import hashlib
+import shutil
+import tempfile
+import threading
+import unittest
+import logging
+from functools import partial
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+from rdflib import URIRef, XSD
+
+from dipper import curie_map as curiemap
+from dipper.sources.Source import Source
+from dipper.utils.BlobStore import BlobStore
+from dipper.utils.FileManifest import FileManifest, MANIFEST
+from dipper.utils.DipperCache import DirectoryCache
+
+logging.basicConfig(level=logging.WARNING)
+LOG = logging.getLogger(__name__)
+
+
+class SlowHandler(SimpleHTTPRequestHandler):
+    """
+    Serves a directory, slowly, keeping track of concurrent requests per host
+    and the status of each response. Files under /etag/ are served with an ETag,
+    files under /flaky/ accept byte ranges but drop the first connection halfway.
+    """
+    lock = threading.Lock()
+    active = {}
+    most = {}
+    starts = []
+    statuses = []
+    dropped = set()
+
+    def do_GET(self):
+        host = self.headers['Host'].split(':')[0]
+        with self.lock:
+            self.active[host] = self.active.get(host, 0) + 1
+            self.most[host] = max(self.most.get(host, 0), self.active[host])
+            self.starts.append((host, time.monotonic()))
+        try:
+            time.sleep(0.05)
+            self.etag = None
+            path = self.translate_path(self.path)
+            if self.path.startswith('/flaky/'):
+                self.send_flaky(path)
+                return
+            if self.path.startswith('/etag/') and os.path.isfile(path):
+                with open(path, 'rb') as served:
+                    self.etag = '"{}"'.format(hashlib.md5(served.read()).hexdigest())
+                if self.headers['If-None-Match'] == self.etag:
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                del self.headers['If-Modified-Since']
+            super().do_GET()
+        finally:
+            with self.lock:
+                self.active[host] -= 1
+
+    def send_flaky(self, path):
+        with open(path, 'rb') as served:
+            body = served.read()
+        etag = '"{}"'.format(hashlib.md5(body).hexdigest())
+        start = 0
+        if self.headers['Range'] is not None and self.headers['If-Range'] == etag:
+            start = int(self.headers['Range'][len('bytes='):-1])
+            self.send_response(206)
+            self.send_header(
+                'Content-Range', 'bytes %d-%d/%d' % (start, len(body) - 1, len(body)))
+        else:
+            self.send_response(200)
+        self.send_header('ETag', etag)
+        self.send_header('Accept-Ranges', 'bytes')
+        self.send_header('Content-Length', str(len(body) - start))
+        self.end_headers()
+        payload = body[start:]
+        with self.lock:
+            if self.path not in self.dropped:
+                self.dropped.add(self.path)
+                payload = payload[:len(payload) // 2]
+        self.wfile.write(payload)
+        self.close_connection = True
+
+    def send_response(self, code, message=None):
+        with self.lock:
+            self.statuses.append(code)
+        super().send_response(code, message)
+
+    def end_headers(self):
+        if self.etag is not None:
+            self.send_header('ETag', self.etag)
+        super().end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class FetchIngest(Source):
+
+    def __init__(self, files):
+        super().__init__(
+            'rdf_graph', False, name='someid',
+            ingest_url='http://sourceofdata.com', ingest_logo='logo.png')
+        self.files = files
+
+    def fetch(self, is_dl_forced=False):
+        self.get_files(is_dl_forced)
+
+    def parse(self, limit=None):
+        pass
+
+
+class SourceFetchTestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.served = tempfile.mkdtemp()
+        os.makedirs(os.path.join(cls.served, 'origin'))
+        os.makedirs(os.path.join(cls.served, 'etag'))
+        os.makedirs(os.path.join(cls.served, 'flaky'))
+        os.makedirs(os.path.join(cls.served, 'cache', 'someid'))
+        for i in range(6):
+            with open(os.path.join(cls.served, 'origin', 'f%d.txt' % i), 'w') as fh:
+                fh.write('origin %d\n' % i)
+        with open(os.path.join(cls.served, 'cache', 'someid', 'f0.txt'), 'w') as fh:
+            fh.write('cached 0\n')
+        cls.server = ThreadingHTTPServer(
+            ('127.0.0.1', 0), partial(SlowHandler, directory=cls.served))
+        cls.port = cls.server.server_address[1]
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.retrieved_on = URIRef(curiemap.get()['pav'] + 'retrievedOn')
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        shutil.rmtree(cls.served)
+
+    def setUp(self):
+        SlowHandler.active.clear()
+        SlowHandler.most.clear()
+        SlowHandler.starts.clear()
+        SlowHandler.statuses.clear()
+        SlowHandler.dropped.clear()
+        self.files = {
+            'f%d' % i: {
+                'file': 'f%d.txt' % i,
+                'url': 'http://127.0.0.1:%d/origin/f%d.txt' % (self.port, i)}
+            for i in range(6)}
+        self.source = FetchIngest(self.files)
+        self.source.CACHE = 'http://localhost:%d/cache' % self.port
+        self.source.rawdir = tempfile.mkdtemp()
+        self.blobs = tempfile.mkdtemp()
+        self.source.BLOB_STORE = self.blobs
+
+    def tearDown(self):
+        shutil.rmtree(self.source.rawdir)
+        shutil.rmtree(self.blobs)
+        self.source = None
+
+    def test_fetch_concurrently(self):
+        self.source.fetch()
+        for i in range(6):
+            with open(os.path.join(self.source.rawdir, 'f%d.txt' % i)) as fh:
+                expected = 'cached 0\n' if i == 0 else 'origin %d\n' % i
+                self.assertEqual(fh.read(), expected)
+        self.assertEqual(SlowHandler.most['127.0.0.1'], Source.FETCH_PER_HOST)
+        self.assertLessEqual(SlowHandler.most['localhost'], Source.FETCH_PER_HOST)
+
+        # one retrieved_on per file: a date when fetched from the origin,
+        # the Last-Modified dateTime of the copy in the cache
+        graph = self.source.dataset.graph
+        dates = {
+            subj: date.datatype
+            for subj, _, date in graph.triples((None, self.retrieved_on, None))}
+        self.assertEqual(len(dates), 6)
+        self.assertEqual(dates.pop(URIRef(self.files['f0']['url'])), XSD.dateTime)
+        self.assertEqual(set(dates.values()), {XSD.date})
+
+    def test_delay_per_host(self):
+        self.source.get_files(False, delay=0.2)
+        starts = {'127.0.0.1': [], 'localhost': []}
+        for host, start in SlowHandler.starts:
+            starts[host].append(start)
+        origin = starts['127.0.0.1']
+        cache = starts['localhost']
+        # five files fetched from the origin, their first requests 0.2s apart
+        self.assertGreaterEqual(origin[-1] - origin[0], 0.2 * 4 - 0.01)  # (as received)
+        # while asking the cache (another host) is not held up by that delay
+        self.assertLess(cache[-1] - cache[0], 0.2 * 4)
+
+    def test_refresh_is_conditional(self):
+        self.source.fetch()
+        with open(os.path.join(self.source.rawdir, MANIFEST)) as fh:
+            manifest = json.load(fh)
+        self.assertEqual(len(manifest), 6)
+        self.assertEqual(manifest['f1.txt']['url'], self.files['f1']['url'])
+        self.assertEqual(manifest['f1.txt']['size'], len('origin 1\n'))
+        self.assertEqual(
+            manifest['f1.txt']['sha256'], hashlib.sha256(b'origin 1\n').hexdigest())
+        self.assertIsNotNone(manifest['f1.txt']['last_modified'])
+
+        # nothing changed: one '304 Not Modified' per file, from wherever it came
+        SlowHandler.statuses.clear()
+        self.source.fetch()
+        self.assertEqual(SlowHandler.statuses.count(304), 6)
+        self.assertEqual(SlowHandler.statuses.count(200), 0)
+
+        # unless forced
+        SlowHandler.statuses.clear()
+        self.source.fetch(is_dl_forced=True)
+        self.assertEqual(SlowHandler.statuses.count(200), 6)
+
+    def test_refresh_by_etag(self):
+        served = os.path.join(self.served, 'etag', 'e.txt')
+        url = 'http://127.0.0.1:%d/etag/e.txt' % self.port
+        local = os.path.join(self.source.rawdir, 'e.txt')
+        with open(served, 'w') as fh:
+            fh.write('version 1\n')
+        self.assertTrue(self.source.fetch_from_url(url, local))
+        self.assertTrue(self.source.fetch_from_url(url, local))
+        self.assertEqual(SlowHandler.statuses, [200, 304])
+
+        # same size and modification time, different content
+        stat = os.stat(served)
+        with open(served, 'w') as fh:
+            fh.write('version 2\n')
+        os.utime(served, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        self.assertTrue(self.source.fetch_from_url(url, local))
+        self.assertEqual(SlowHandler.statuses, [200, 304, 200])
+        with open(local) as fh:
+            self.assertEqual(fh.read(), 'version 2\n')
+        self.assertFalse(os.path.exists(local + '.part'))
+
+    def fetch_flaky(self):
+        body = os.urandom(300000)
+        with open(os.path.join(self.served, 'flaky', 'big.bin'), 'wb') as fh:
+            fh.write(body)
+        url = 'http://127.0.0.1:%d/flaky/big.bin' % self.port
+        local = os.path.join(self.source.rawdir, 'big.bin')
+        self.source.FETCH_BACKOFF = 0
+        return body, url, local
+
+    def test_resume_dropped_download(self):
+        body, url, local = self.fetch_flaky()
+        self.assertTrue(self.source.fetch_from_url(url, local))
+        self.assertEqual(SlowHandler.statuses, [200, 206])
+        with open(local, 'rb') as fh:
+            self.assertEqual(fh.read(), body)
+        self.assertFalse(os.path.exists(local + '.part'))
+        with open(os.path.join(self.source.rawdir, MANIFEST)) as fh:
+            manifest = json.load(fh)
+        self.assertEqual(list(manifest), ['big.bin'])
+        self.assertEqual(manifest['big.bin']['sha256'], hashlib.sha256(body).hexdigest())
+        self.assertEqual(manifest['big.bin']['md5'], hashlib.md5(body).hexdigest())
+
+    def test_resume_partial_download_of_earlier_run(self):
+        body, url, local = self.fetch_flaky()
+        self.source.FETCH_RETRIES = 0
+        with self.assertRaises(Exception):
+            self.source.fetch_from_url(url, local)
+        self.assertEqual(os.path.getsize(local + '.part'), len(body) // 2)
+        self.assertFalse(os.path.exists(local))
+
+        self.assertTrue(self.source.fetch_from_url(url, local))
+        # the second run asked for the file, then only for what was missing
+        self.assertEqual(SlowHandler.statuses, [200, 200, 206])
+        with open(local, 'rb') as fh:
+            self.assertEqual(fh.read(), body)
+
+    def test_shared_between_sources(self):
+        url = self.files['f1']['url']
+        local = os.path.join(self.source.rawdir, 'f1.txt')
+        self.assertTrue(self.source.fetch_from_url(url, local))
+
+        other = FetchIngest(self.files)
+        other.BLOB_STORE = self.blobs
+        other.rawdir = tempfile.mkdtemp()
+        try:
+            other_local = os.path.join(other.rawdir, 'genes.txt')
+            self.assertTrue(other.fetch_from_url(url, other_local))
+            # asked once, then only if it changed
+            self.assertEqual(SlowHandler.statuses, [200, 304])
+            self.assertTrue(os.path.samefile(local, other_local))
+            self.assertFalse(os.stat(other_local).st_mode & 0o222)  # read only
+            with open(os.path.join(other.rawdir, MANIFEST)) as fh:
+                manifest = json.load(fh)
+            self.assertEqual(
+                manifest['genes.txt']['sha256'],
+                hashlib.sha256(b'origin 1\n').hexdigest())
+        finally:
+            shutil.rmtree(other.rawdir)
+
+    def test_old_releases_removed(self):
+        served = os.path.join(self.served, 'etag', 'r.txt')
+        url = 'http://127.0.0.1:%d/etag/r.txt' % self.port
+        other = FetchIngest(self.files)
+        other.BLOB_STORE = self.blobs
+        other.rawdir = tempfile.mkdtemp()
+        store = BlobStore(self.blobs)
+        try:
+            with open(served, 'w') as fh:
+                fh.write('release 1\n')
+            for source in (self.source, other):
+                self.assertTrue(source.fetch_from_url(
+                    url, os.path.join(source.rawdir, 'r.txt')))
+            release_1 = store.path(hashlib.sha256(b'release 1\n').hexdigest())
+            with open(served, 'w') as fh:
+                fh.write('release 2\n')
+            self.assertTrue(self.source.fetch_from_url(
+                url, os.path.join(self.source.rawdir, 'r.txt')))
+            # still the other source's raw file
+            self.assertTrue(os.path.exists(release_1))
+            self.assertTrue(other.fetch_from_url(
+                url, os.path.join(other.rawdir, 'r.txt')))
+            self.assertFalse(os.path.exists(release_1))
+            self.assertTrue(os.path.exists(
+                store.path(hashlib.sha256(b'release 2\n').hexdigest())))
+        finally:
+            shutil.rmtree(other.rawdir)
+
+    def test_concurrent_fetches_of_one_url(self):
+        url = self.files['f2']['url']
+        rawdirs = [tempfile.mkdtemp() for _ in range(3)]
+        try:
+            threads = [
+                threading.Thread(
+                    target=self.source.fetch_from_url,
+                    args=(url, os.path.join(rawdir, 'f2.txt')))
+                for rawdir in rawdirs]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.assertEqual(sorted(SlowHandler.statuses), [200, 304, 304])
+            for rawdir in rawdirs:
+                with open(os.path.join(rawdir, 'f2.txt')) as fh:
+                    self.assertEqual(fh.read(), 'origin 2\n')
+        finally:
+            for rawdir in rawdirs:
+                shutil.rmtree(rawdir)
+
+    def test_known_misses_not_asked_again(self):
+        self.source.fetch()
+        SlowHandler.starts.clear()
+        self.source.fetch()
+        # only f0 is asked of the cache, where it was found
+        self.assertEqual(
+            [host for host, _ in SlowHandler.starts].count('localhost'), 1)
+
+    def test_directory_cache(self):
+        mirror = os.path.join(self.served, 'cache')
+        self.source.CACHE = 'file://' + mirror
+        self.source.fetch()
+        local = os.path.join(self.source.rawdir, 'f0.txt')
+        self.assertTrue(
+            os.path.samefile(local, os.path.join(mirror, 'someid', 'f0.txt')))
+        # the others from their origin, the mirror costs no requests
+        self.assertEqual({host for host, _ in SlowHandler.starts}, {'127.0.0.1'})
+        self.assertEqual(len(SlowHandler.starts), 5)
+
+        # and where it can not be linked, a copy
+        copy = os.path.join(self.source.rawdir, 'copy.txt')
+        DirectoryCache.copy(local, copy)
+        with open(copy) as fh:
+            self.assertEqual(fh.read(), 'cached 0\n')
+
+    def test_no_cache(self):
+        self.source.CACHE = 'none'
+        self.source.fetch()
+        self.assertEqual({host for host, _ in SlowHandler.starts}, {'127.0.0.1'})
+        with open(os.path.join(self.source.rawdir, 'f0.txt')) as fh:
+            self.assertEqual(fh.read(), 'origin 0\n')
+
+    def test_md5_from_manifest(self):
+        self.source.fetch()
+        self.assertEqual(
+            Source.get_file_md5(self.source.rawdir, 'f3.txt'),
+            hashlib.md5(b'origin 3\n').hexdigest())
+        # taken from the manifest, not by reading the file again
+        manifest = FileManifest(self.source.rawdir)
+        entry = manifest.get('f3.txt')
+        entry['md5'] = 'recorded'
+        manifest.update('f3.txt', entry)
+        self.assertEqual(Source.get_file_md5(self.source.rawdir, 'f3.txt'), 'recorded')
+
+if __name__ == '__main__':
+    unittest.main()
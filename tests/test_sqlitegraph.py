@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+
+import io
+import os
+import tempfile
+import unittest
+import logging
+from rdflib import URIRef, RDF, OWL
+from dipper import curie_map
+from dipper.graph import SQLiteGraph as sqlite_graph_module
+from dipper.graph.SQLiteGraph import SQLiteGraph
+from dipper.graph.RDFGraph import RDFGraph
+from dipper.utils.CurieUtil import CurieUtil
+from dipper.utils.GraphUtils import GraphUtils
+
+logging.basicConfig(level=logging.WARNING)
+LOG = logging.getLogger(__name__)
+
+
+class SQLiteGraphTestCase(unittest.TestCase):
+
+    def setUp(self):
+        # make the write buffer spill more than once
+        self.write_batch = sqlite_graph_module.WRITE_BATCH
+        sqlite_graph_module.WRITE_BATCH = 3
+
+        self.graph = SQLiteGraph(True, ':MONARCH_test')
+        self.rdf_graph = RDFGraph(True, ':MONARCH_test')
+
+        cutil = CurieUtil(curie_map.get())
+        self.john = URIRef(cutil.get_uri('foaf:John'))
+        self.knows = URIRef(cutil.get_uri('foaf:knows'))
+        self.joseph = URIRef(cutil.get_uri('foaf:Joseph'))
+
+        for graph in (self.graph, self.rdf_graph):
+            graph.addTriple(
+                'foaf:John', 'foaf:knows', 'foaf:Joseph',
+                subject_category='biolink:Gene')
+            graph.addTriple('foaf:John', 'rdfs:label', 'John "Jack"\nSmith\\')
+            graph.addTriple('foaf:John', 'rdfs:comment', 'Jöhn ☃')
+            graph.addTriple(
+                'foaf:John', 'foaf:age', 12,
+                object_is_literal=True, literal_type='xsd:integer')
+            graph.addTriple('_:b0', 'foaf:knows', 'foaf:John')
+            graph.addTriple('foaf:John', 'foaf:knows', 'foaf:Joseph')  # dup
+
+    def tearDown(self):
+        sqlite_graph_module.WRITE_BATCH = self.write_batch
+        self.graph.close()
+        self.graph = None
+        self.rdf_graph = None
+
+    def test_same_triples_as_rdfgraph(self):
+        self.assertEqual(len(self.graph), len(self.rdf_graph))
+        self.assertEqual(set(self.graph), set(self.rdf_graph))
+
+    def test_triple_patterns(self):
+        self.assertEqual(set(self.graph.objects(self.john, self.knows)), {self.joseph})
+        self.assertEqual(
+            set(self.graph.predicates()), set(self.rdf_graph.predicates()))
+        self.assertEqual(len(list(self.graph.subjects(self.knows, None))), 2)
+        self.assertIn((self.john, self.knows, self.joseph), self.graph)
+        self.assertNotIn((self.joseph, self.knows, self.john), self.graph)
+
+    def test_add_remove(self):
+        self.graph.add((self.knows, RDF.type, OWL.ObjectProperty))
+        self.graph.add((self.knows, RDF.type, OWL.ObjectProperty))
+        self.assertEqual(len(self.graph), len(self.rdf_graph) + 1)
+
+        self.graph.remove((None, self.knows, None))
+        self.assertEqual(len(self.graph), len(self.rdf_graph) - 1)
+        self.assertEqual(len(list(self.graph)), len(self.graph))
+        self.assertNotIn((self.john, self.knows, self.joseph), self.graph)
+
+    def test_object_pattern_indexed(self):
+        self.assertEqual(
+            list(self.graph.subjects(None, self.joseph)), [self.john])
+        where, params = self.graph._where((None, None, self.joseph))
+        plan = self.graph.conn.execute(
+            'EXPLAIN QUERY PLAN SELECT s FROM triple' + where, params).fetchall()
+        self.assertIn('triple_o', str(plan))
+
+    def test_remove_from_snapshot(self):
+        for triple in list(self.graph.triples((None, self.knows, None))):
+            self.graph.remove(triple)
+        self.assertEqual(list(self.graph.triples((None, self.knows, None))), [])
+        self.assertEqual(len(self.graph), len(self.rdf_graph) - 2)
+
+    def test_serialize_ntriples(self):
+        for fmt in ('nt', 'nquads'):
+            stream = io.BytesIO()
+            count = GraphUtils.write_ntriples(self.graph, stream, fmt)
+            self.assertEqual(count, len(self.rdf_graph))
+            self.assertEqual(
+                sorted(stream.getvalue().splitlines()),
+                sorted(self.rdf_graph.serialize(format=fmt).splitlines()))
+
+    def test_temporary_database_removed_on_close(self):
+        dbfile = self.graph.dbfile
+        self.assertTrue(os.path.exists(dbfile))
+        self.graph.close()
+        self.assertFalse(os.path.exists(dbfile))
+        self.graph = SQLiteGraph()
+
+    def test_named_database_persists(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            dbfile = os.path.join(tmpdir, 'graph.sqlite')
+            graph = SQLiteGraph(True, ':MONARCH_test', dbfile=dbfile)
+            graph.addTriple('foaf:John', 'foaf:knows', 'foaf:Joseph')
+            graph.close()
+
+            graph = SQLiteGraph(True, ':MONARCH_test', dbfile=dbfile)
+            self.assertEqual(list(graph), [(self.john, self.knows, self.joseph)])
+            graph.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
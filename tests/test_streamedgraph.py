@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+
+import io
+import unittest
+import logging
+from rdflib import URIRef, BNode, Literal, XSD, RDF, RDFS, OWL
+from dipper.graph.StreamedGraph import StreamedGraph
+from dipper.graph.TripleFilter import TripleFilter
+
+logging.basicConfig(level=logging.WARNING)
+LOG = logging.getLogger(__name__)
+
+
+class StreamedGraphTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.stream = io.StringIO()
+        self.graph = StreamedGraph(True, file_handle=self.stream)
+
+    def tearDown(self):
+        self.graph = None
+
+    def add_repeats(self):
+        for _ in range(3):
+            self.graph.addTriple(
+                'foaf:John', 'foaf:knows', 'foaf:Joseph',
+                subject_category='biolink:Gene', object_category='biolink:Gene')
+            self.graph.addTriple('foaf:John', 'rdfs:label', 'John')
+
+    def test_add_triple_writes_ntriples(self):
+        self.graph.addTriple(
+            'foaf:John', 'foaf:knows', 'foaf:Joseph', subject_category='biolink:Gene')
+        self.graph.addTriple('foaf:John', 'rdfs:label', 'John "Jack"')
+        self.assertEqual(self.stream.getvalue().splitlines(), [
+            '<http://xmlns.com/foaf/0.1/John> <http://xmlns.com/foaf/0.1/knows> '
+            '<http://xmlns.com/foaf/0.1/Joseph> .',
+            '<http://xmlns.com/foaf/0.1/John> <https://w3id.org/biolink/vocab/category> '
+            '<https://w3id.org/biolink/vocab/Gene> .',
+            '<http://xmlns.com/foaf/0.1/John> '
+            '<http://www.w3.org/2000/01/rdf-schema#label> "John \\"Jack\\"" .'])
+
+    def test_repeats_written_without_dedup(self):
+        self.add_repeats()
+        self.assertEqual(len(self.stream.getvalue().splitlines()), 12)
+
+    def test_exact_dedup(self):
+        self.graph.dedup = TripleFilter()
+        self.add_repeats()
+        lines = self.stream.getvalue().splitlines()
+        self.assertEqual(len(lines), 4)
+        self.assertEqual(len(set(lines)), 4)
+        self.assertEqual(self.graph.dedup.lines, 12)
+        self.assertAlmostEqual(self.graph.dedup.hit_rate(), 8 / 12)
+
+    def test_bloom_dedup_past_exact_budget(self):
+        self.graph.dedup = TripleFilter(exact_budget=1, bloom_bits=2**16)
+        self.add_repeats()
+        self.assertEqual(len(self.stream.getvalue().splitlines()), 4)
+        self.assertEqual(len(self.graph.dedup.exact), 1)
+        self.assertEqual(self.graph.dedup.bloom_count, 3)
+
+    def test_no_dedup_past_exact_budget_without_bloom(self):
+        self.graph.dedup = TripleFilter(exact_budget=1, bloom_bits=0)
+        self.add_repeats()
+        lines = self.stream.getvalue().splitlines()
+        self.assertEqual(len(lines), 10)
+        self.assertEqual(len(set(lines)), 4)
+
+
+    def test_predicate_counts(self):
+        self.graph.dedup = TripleFilter()
+        self.add_repeats()
+        self.graph.add((
+            URIRef('http://xmlns.com/foaf/0.1/knows'), RDF.type, OWL.ObjectProperty))
+        self.assertEqual(self.graph.predicate_counts, {
+            URIRef('http://xmlns.com/foaf/0.1/knows'): 1,
+            URIRef('https://w3id.org/biolink/vocab/category'): 2,
+            RDFS.label: 1,
+            RDF.type: 1})
+        self.assertEqual(
+            self.stream.getvalue().splitlines()[-1],
+            '<http://xmlns.com/foaf/0.1/knows> '
+            '<http://www.w3.org/1999/02/22-rdf-syntax-ns#type> '
+            '<http://www.w3.org/2002/07/owl#ObjectProperty> .')
+
+    def test_add_keeps_literals_and_bnodes(self):
+        self.graph.add((BNode('b0'), RDFS.label, Literal('Jean', lang='fr')))
+        self.graph.add((BNode('b0'), RDFS.comment, Literal('1', datatype=XSD.integer)))
+        self.assertEqual(self.stream.getvalue().splitlines(), [
+            '_:b0 <http://www.w3.org/2000/01/rdf-schema#label> "Jean"@fr .',
+            '_:b0 <http://www.w3.org/2000/01/rdf-schema#comment> '
+            '"1"^^<http://www.w3.org/2001/XMLSchema#integer> .'])
+        with self.assertRaises(TypeError):
+            self.graph.add((BNode('b0'), RDFS.label, 'not a term'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+
+import time
+import threading
+import unittest
+
+from dipper.utils.TokenBucket import TokenBucket
+
+
+class TokenBucketTestCase(unittest.TestCase):
+
+    def test_burst_then_rate(self):
+        bucket = TokenBucket(rate=20, burst=3)
+        start = time.monotonic()
+        for _ in range(3):
+            bucket.take()
+        self.assertLess(time.monotonic() - start, 0.04)
+        for _ in range(4):
+            bucket.take()
+        # four more at 20 per second
+        self.assertGreaterEqual(time.monotonic() - start, 4 / 20 - 0.01)
+
+    def test_shared_between_threads(self):
+        bucket = TokenBucket(rate=50, burst=1)
+        stamps = []
+        lock = threading.Lock()
+
+        def take():
+            for _ in range(5):
+                bucket.take()
+                with lock:
+                    stamps.append(time.monotonic())
+
+        threads = [threading.Thread(target=take) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        stamps.sort()
+        # twenty takes, the first free, then 50 per second between them all
+        self.assertGreaterEqual(stamps[-1] - stamps[0], 19 / 50 - 0.02)
+
+
+if __name__ == '__main__':
+    unittest.main()